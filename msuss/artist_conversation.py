@@ -6,20 +6,26 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from core.artist_manager import ArtistManager
 from core.critique import CritiqueService
+from core.scheduler import make_scheduler, SCHEDULERS
+from core import trace, spans
+from core.sharding import ShardedRunner
+from core.dedup import pick_critique_target
 
 def get_random_creation(memory):
-    """Get a random creation from memory. Returns (index, creation) tuple."""
+    """Get a random creation from memory, passing over near-duplicates. Returns (index, creation) tuple."""
     if not memory.creations:
         return None
     
-    idx = random.randrange(len(memory.creations))
+    idx = pick_critique_target(memory.creations)
     return idx, memory.creations[idx]
 
-def artist_conversation(num_critiques=None):
-    """Run a conversation between artists."""
+def artist_conversation(num_critiques=None, strategy=None, snapshot=None):
+    """Run a conversation between artists. snapshot: world snapshot path, or "" for the default one."""
     print("=== ARTIST COLLABORATION SESSION ===\n")
     
-    manager = ArtistManager()
+    manager = ArtistManager(record_evolution=True)
+    if snapshot is not None and not manager.use_snapshot(snapshot or None):
+        print("No world snapshot found; reading artist files directly.")
     critique_service = CritiqueService()
     
     # Discover all available artists
@@ -50,43 +56,21 @@ def artist_conversation(num_critiques=None):
     
     print(f"\n--- Cross-Critique Session ({len(artists)} artists) ---\n")
     
-    # Determine number of critiques
-    if num_critiques is None:
-        # Default: each artist critiques one other artist in a circle
-        num_critiques = len(artists)
-        
-        # Shuffle artist order for variety
-        artist_names = list(artists.keys())
-        random.shuffle(artist_names)
-        
-        # Create circular critique pairs
-        critique_pairs = []
-        for i in range(len(artist_names)):
-            critic_name = artist_names[i]
-            subject_name = artist_names[(i + 1) % len(artist_names)]
-            critique_pairs.append((critic_name, subject_name))
-    else:
-        # Custom number: generate random pairs
-        critique_pairs = []
-        available_critics = list(artists.keys())
-        
-        for _ in range(num_critiques):
-            if len(available_critics) < 2:
-                available_critics = list(artists.keys())
-            
-            critic_name = random.choice(available_critics)
-            available_critics.remove(critic_name)
-            
-            possible_subjects = [name for name in artists.keys() if name != critic_name]
-            if not possible_subjects:
-                continue
-            
-            subject_name = random.choice(possible_subjects)
-            critique_pairs.append((critic_name, subject_name))
+    # Default: each artist critiques the next in a shuffled circle.
+    # With a custom count, every artist critiques (and is critiqued) once per round.
+    if strategy is None:
+        strategy = "ring" if num_critiques is None else "fair"
+    artist_names = list(artists.keys())
+    concepts = [artists[name]["personality"].concepts for name in artist_names] if strategy == "affinity" else None
+    scheduler = make_scheduler(strategy, concepts=concepts)
+    critique_pairs = (
+        (artist_names[critic], artist_names[subject])
+        for critic, subject in scheduler.pairs(len(artist_names), num_critiques)
+    )
     
     # Execute critiques
-    for critic_name, subject_name in critique_pairs:
-        
+    @spans.traced("critique")
+    def critique_pair(critic_name, subject_name):
         critic = artists[critic_name]
         subject = artists[subject_name]
         
@@ -94,7 +78,7 @@ def artist_conversation(num_critiques=None):
         random_work_data = get_random_creation(subject["memory"])
         if not random_work_data:
             print(f"{critic['personality'].name} has nothing to critique from {subject['personality'].name}\n")
-            continue
+            return
         
         work_idx, work = random_work_data
         
@@ -104,7 +88,8 @@ def artist_conversation(num_critiques=None):
         
         result = critique_service.generate_critique(
             critic["personality"],
-            work.get("content", "")
+            work.get("content", ""),
+            critic["memory"]
         )
         
         print(f"Score: {result['score']:.2f}")
@@ -114,7 +99,8 @@ def artist_conversation(num_critiques=None):
         critic_changed, subject_changed = critique_service.process_critique_result(critic, subject, result)
         
         # Save critique to subject's memory
-        critique_service.save_critique_to_memory(subject, critic_name, result['critique'], result['score'], creation_index=work_idx)
+        critique_service.save_critique_to_memory(subject, critic_name, result['critique'], result['score'], creation_index=work_idx,
+                                                 concepts=result.get('new_concepts'))
         
         # Save updated personalities
         if critic_changed:
@@ -123,6 +109,9 @@ def artist_conversation(num_critiques=None):
             manager.save_artist(subject_name, subject)
         
         print("\n" + "="*60)
+
+    for critic_name, subject_name in critique_pairs:
+        critique_pair(critic_name, subject_name)
     
     print("\n--- Session Complete ---")
     print("\nFinal States:")
@@ -133,11 +122,67 @@ def artist_conversation(num_critiques=None):
         print(f"  Confidence: {p.confidence:.2f}")
         print(f"  Concepts: {p.concepts}")
 
+def sharded_conversation(processes, num_critiques=None, strategy=None, snapshot=None):
+    """Run the critique session on a pool of processes, each owning a shard of the artists (see core.sharding)."""
+    print(f"=== ARTIST COLLABORATION SESSION ({processes} processes) ===\n")
+
+    manager = ArtistManager(record_evolution=True)
+    artist_names = sorted(manager.discover_artists())
+    if len(artist_names) < 2:
+        print(f"Need at least 2 artists for collaboration! Found: {len(artist_names)}")
+        print("Run 'python create_artist.py all' to create artists.")
+        return
+
+    if strategy is None:
+        strategy = "ring" if num_critiques is None else "fair"
+    concepts = [manager.load_artist(name)[0].concepts for name in artist_names] if strategy == "affinity" else None
+    scheduler = make_scheduler(strategy, concepts=concepts)
+    critique_pairs = (
+        (artist_names[critic], artist_names[subject])
+        for critic, subject in scheduler.pairs(len(artist_names), num_critiques)
+    )
+
+    with ShardedRunner(manager.artists_dir, processes, names=artist_names, seed=random.random(), snapshot=snapshot,
+                       record_evolution=True) as runner:
+        print(f"Shards: {', '.join(str(len(shard)) for shard in runner.shards)} artists\n")
+        for finished in runner.critiques(critique_pairs):
+            critic, subject = finished["critic"].capitalize(), finished["subject"].capitalize()
+            if finished["status"] == "done":
+                print(f"{critic} -> {subject}: {finished['result']['score']:.2f}")
+            elif finished["status"] == "skipped":
+                print(f"{critic} has nothing to critique from {subject}")
+            else:
+                print(f"{critic} -> {subject} failed: {finished['error']}")
+        states = runner.close()
+
+    print("\n--- Session Complete ---")
+    print("\nFinal States:")
+    for state in states.values():
+        print(f"\n{state['name']}:")
+        print(f"  Mood: {state['mood'].upper()}")
+        print(f"  Confidence: {state['confidence']:.2f}")
+        print(f"  Concepts: {state['concepts']}")
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Artist collaboration and cross-critique")
     parser.add_argument("-n", "--num-critiques", type=int, help="Number of critiques to generate (default: number of artists)")
+    parser.add_argument("-s", "--strategy", choices=sorted(SCHEDULERS),
+                        help="How critics and subjects are paired (default: ring, or fair with -n)")
+    parser.add_argument("--snapshot", nargs="?", const="", metavar="PATH",
+                        help="Start from the world snapshot (default: artists/world.snapshot)")
+    parser.add_argument("-p", "--processes", type=int, default=1,
+                        help="Shard the artists across this many worker processes (default: 1, no sharding)")
+    trace.add_arguments(parser)
+    spans.add_arguments(parser)
     args = parser.parse_args()
+    if args.processes > 1 and (args.record or args.replay):
+        parser.error("--record/--replay need a single process")
+    trace.start_from_args(args)
+    spans.start_from_args(args)
     
-    artist_conversation(num_critiques=args.num_critiques)
+    if args.processes > 1:
+        sharded_conversation(args.processes, num_critiques=args.num_critiques, strategy=args.strategy, snapshot=args.snapshot)
+    else:
+        artist_conversation(num_critiques=args.num_critiques, strategy=args.strategy, snapshot=args.snapshot)
 
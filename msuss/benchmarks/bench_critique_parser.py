@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compare the legacy multi-regex critique parsing with the shared single-pass
+parser over the response corpus in tests/fixtures/critique_responses.json.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.critique_parser import parse_critique
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'critique_responses.json')
+
+
+def legacy_parse(text):
+    """The parsing previously inlined in CritiqueService.generate_critique."""
+    score = 0.5
+    new_concepts = []
+    emotional_impact = {}
+
+    score_patterns = [
+        r"Score:\s*\*\*\s*(\d+\.?\d*)",
+        r"\*\*Score:\*\*\s*(\d+\.?\d*)",
+        r"Score:\s*(\d+\.?\d*)",
+        r"Score:\s*\n\s*(\d+\.?\d*)",
+    ]
+    for pattern in score_patterns:
+        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        if match:
+            try:
+                score = float(match.group(1))
+                break
+            except ValueError:
+                pass
+
+    concept_patterns = [
+        r"New Concepts:\s*\*\*\s*([^\n]+)",
+        r"\*\*New Concepts:\*\*\s*([^\n]+)",
+        r"New Concepts:\s*([^\n]+)",
+    ]
+    for pattern in concept_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            concepts_line = match.group(1).strip().replace("**", "").strip()
+            if concepts_line and concepts_line not in ["", "*", "**"]:
+                new_concepts = [c.strip() for c in concepts_line.split(",") if c.strip() and c.strip() not in ["*", "**"]]
+                break
+
+    impact_patterns = [
+        r"Emotional Impact:\s*\*\*\s*([^\n]+)",
+        r"\*\*Emotional Impact:\*\*\s*([^\n]+)",
+        r"Emotional Impact:\s*([^\n]+)",
+    ]
+    for pattern in impact_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            impact_line = match.group(1).strip()
+            for emotion in ["joy", "anger", "melancholy", "fear", "awe"]:
+                if emotion in impact_line.lower():
+                    emotional_impact[emotion] = 0.1
+            break
+
+    return {
+        "score": max(0.0, min(1.0, score)),
+        "critique": text,
+        "new_concepts": new_concepts,
+        "emotional_impact": emotional_impact
+    }
+
+
+def time_parser(parse, texts, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            parse(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(texts)) * 1e6
+
+
+def accuracy(parse, corpus):
+    correct = 0
+    for entry in corpus:
+        result = parse(entry["text"])
+        expected = entry["expected"]
+        if (abs(result["score"] - expected["score"]) < 1e-9
+                and result["new_concepts"] == expected["new_concepts"]
+                and sorted(result["emotional_impact"]) == sorted(expected["emotional_impact"])):
+            correct += 1
+    return correct
+
+
+def run(rounds):
+    with open(CORPUS_PATH) as f:
+        corpus = json.load(f)
+    texts = [entry["text"] for entry in corpus]
+
+    print(f"{len(texts)} responses x {rounds} rounds")
+    print(f"{'parser':<12} {'us/response':>12} {'correct':>9}")
+    for name, parse in [("legacy", legacy_parse), ("single-pass", parse_critique)]:
+        per_call = time_parser(parse, texts, rounds)
+        print(f"{name:<12} {per_call:>12.2f} {accuracy(parse, corpus):>5}/{len(corpus)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark critique response parsing")
+    parser.add_argument("--rounds", type=int, default=2000, help="Passes over the corpus")
+    args = parser.parse_args()
+    run(args.rounds)
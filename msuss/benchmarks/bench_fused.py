@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compare the two-call (perform + critique) and fused generation cycles.
+
+Runs generation cycles for a temporary copy of an example artist against the
+offline stub model with simulated latency, and reports model calls and
+wall time per cycle for each path. SVG has no fused mode; its row is the
+baseline one-call cycle.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.personality import Personality
+from skills.text_gen import TextGenerationSkill
+from skills.svg_gen import VisualGenerationSkill
+from skills.stub_model import StubModel
+
+EXAMPLE_PERSONALITY = os.path.join(os.path.dirname(__file__), '..', 'examples', 'artists', 'aria', 'personality.json')
+
+
+def run_cycles(skill, context, cycles):
+    start = time.perf_counter()
+    for _ in range(cycles):
+        skill.perform_and_critique(context)
+    return time.perf_counter() - start
+
+
+def run(cycles, latency):
+    personality = Personality.load(EXAMPLE_PERSONALITY)
+    artist_dir = tempfile.mkdtemp(prefix="bench_fused_")
+    context = {"personality": personality, "goal": "Explore the boundaries of digital expression",
+               "memory": None, "artist_dir": artist_dir}
+
+    print(f"{cycles} cycles, {latency * 1000:.0f} ms simulated model latency")
+    print(f"{'skill':<6} {'mode':<9} {'calls/cycle':>12} {'ms/cycle':>9}")
+    try:
+        rows = [("text", "two-call", TextGenerationSkill()), ("text", "fused", TextGenerationSkill(fused=True)),
+                ("svg", "two-call", VisualGenerationSkill())]
+        for skill_name, mode, skill in rows:
+            skill.model = StubModel(latency=latency)
+            elapsed = run_cycles(skill, context, cycles)
+            print(f"{skill_name:<6} {mode:<9} {skill.model.calls / cycles:>12.1f} {elapsed / cycles * 1000:>9.1f}")
+    finally:
+        shutil.rmtree(artist_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark fused vs two-call generation cycles")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per model call")
+    args = parser.parse_args()
+    run(args.cycles, args.latency)
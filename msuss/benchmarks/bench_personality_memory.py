@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Memory per artist for loaded Personality objects.
+
+Loads the example personalities many times over (each from its own JSON
+text, as when reading one file per artist) and reports traced bytes per
+artist for:
+
+  json dicts    the parsed JSON kept as plain dicts and lists, i.e. what a
+                dict-based Personality retains
+  Personality   Personality.from_dict (slots, emotion arrays, interned concepts)
+"""
+import os
+import sys
+import gc
+import glob
+import json
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.personality import Personality
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'artists', '*', 'personality.json')
+
+
+def traced_bytes_per_item(build, n):
+    gc.collect()
+    tracemalloc.start()
+    items = build()
+    for item in items[:10]:
+        getattr(item, "mood", None)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current / n
+
+
+def run(artists):
+    texts = [open(path).read() for path in sorted(glob.glob(EXAMPLES))]
+    sources = [texts[i % len(texts)] for i in range(artists)]
+
+    plain = traced_bytes_per_item(lambda: [json.loads(t) for t in sources], artists)
+    compact = traced_bytes_per_item(lambda: [Personality.from_dict(json.loads(t)) for t in sources], artists)
+
+    print(f"{artists} artists loaded from the example personalities")
+    print(f"{'representation':<14} {'bytes/artist':>13}")
+    print(f"{'json dicts':<14} {plain:>13.0f}")
+    print(f"{'Personality':<14} {compact:>13.0f}")
+    print(f"Saved: {1 - compact / plain:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure memory per loaded Personality")
+    parser.add_argument("--artists", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.artists)
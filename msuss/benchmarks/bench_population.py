@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare per-object Personality.evolve with batched Population.evolve.
+
+Evolves the same synthetic population of n artists with alternating
+critique and feedback rounds on both paths, and reports the time per
+artist-update for each.
+"""
+import io
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.population import Population
+
+
+def run(artists, rounds, seed):
+    population = Population.random(artists, seed=seed)
+    rng = np.random.default_rng(seed)
+    experiences = []
+    for r in range(rounds):
+        if r % 2 == 0:
+            experiences.append(("critique", rng.random(artists)))
+        else:
+            experiences.append(("feedback", rng.random(artists) < 0.5))
+
+    # Scalar path: one Personality per artist; _handle_feedback prints, so silence it.
+    personalities = [population.personality(i) for i in range(artists)]
+    scalar_rng = random.Random(seed)
+    for p in personalities:
+        p.rng = scalar_rng
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for kind, values in experiences:
+            for p, value in zip(personalities, values.tolist()):
+                if kind == "critique":
+                    p.evolve({"type": "critique", "score": value})
+                else:
+                    p.evolve({"type": "feedback", "liked": value, "notes": ""})
+    scalar = time.perf_counter() - start
+
+    idx = np.arange(artists)
+    start = time.perf_counter()
+    for kind, values in experiences:
+        population.evolve(idx, kind, values, rng=rng)
+    batched = time.perf_counter() - start
+
+    updates = artists * rounds
+    print(f"{artists} artists x {rounds} rounds")
+    print(f"{'path':<11} {'total s':>9} {'ns/update':>10}")
+    print(f"{'Personality':<11} {scalar:>9.3f} {scalar / updates * 1e9:>10.0f}")
+    print(f"{'Population':<11} {batched:>9.3f} {batched / updates * 1e9:>10.0f}")
+    print(f"Speedup: {scalar / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scalar vs batched personality evolution")
+    parser.add_argument("--artists", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.artists, args.rounds, args.seed)
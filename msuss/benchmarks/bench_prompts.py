@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Compare prompt sizes before and after the compact prompt builder.
+
+Uses the example artists (or any artists directory) and reports the average
+estimated token count per prompt kind for the legacy f-string prompts and
+for the current PromptBuilder-based prompts.
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.artist_manager import ArtistManager
+from core.critique import CritiqueService
+from core.prompts import estimate_tokens
+from skills.text_gen import TextGenerationSkill
+from skills.svg_gen import VisualGenerationSkill
+
+DEFAULT_ARTISTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'examples', 'artists')
+
+
+def legacy_text_prompt(personality, goal):
+    return f"""
+        You are an AI artist named {personality.name}.
+        Your personality traits are: {personality.traits}.
+        Your current emotions are: {personality.emotions}.
+        Your obsessions (concepts) are: {personality.concepts}.
+        Your artistic preferences are: {personality.preferences}.
+        
+        Your current goal is: {goal}.
+        
+        Create a piece of text (e.g., a poem, a short thought, a story) that reflects your current state and goal.
+        Incorporate at least one of your current concepts.
+        Do not explain the art, just create it.
+        """
+
+
+def legacy_text_critique_prompt(personality, content):
+    return f"""
+        You are {personality.name}. Critique the following piece of art you just created:
+        
+        "{content}"
+        
+        Your traits: {personality.traits}.
+        Your confidence level: {personality.confidence:.2f} (0.0 = insecure, 1.0 = arrogant).
+        Your preferences: {personality.preferences}.
+        
+        If your confidence is high, be more forgiving and self-congratulatory.
+        If your confidence is low, be harsher and more neurotic.
+        
+        Be honest but constructive.
+        
+        Output format:
+        Score: [0.0 to 1.0]
+        Critique: [Your thoughts]
+        """
+
+
+def legacy_svg_prompt(personality, goal):
+    return f"""
+        You are an AI artist named {personality.name}.
+        Your current emotions are: {personality.emotions}.
+        Your obsessions (concepts) are: {personality.concepts}.
+        Your aesthetic preference is: {personality.preferences.get('aesthetic')}.
+        
+        Goal: {goal}.
+        
+        Task: Write the code for an SVG (Scalable Vector Graphics) image that represents your current internal state.
+        
+        Requirements:
+        - The SVG should be abstract and expressive.
+        - Use colors that match your emotions (e.g., blue/grey for melancholy, red for anger).
+        - The code must be valid XML/SVG.
+        - Return ONLY the SVG code, starting with <svg> and ending with </svg>.
+        - Do not use markdown code blocks.
+        """
+
+
+def legacy_cross_critique_prompt(personality, content):
+    return f"""
+        You are an AI artist with the following characteristics:
+        
+        Personality traits: {personality.traits}
+        Current emotions: {personality.emotions}
+        Obsessions/concepts: {personality.concepts}
+        Aesthetic preference: {personality.preferences.get('aesthetic')}
+        Confidence level: {personality.confidence:.2f}
+        
+        You are critiquing another artist's work:
+        
+        "{content[:500]}..."
+        
+        Provide an honest critique from YOUR unique perspective. Consider:
+        - How does this work align or clash with your own aesthetic?
+        - What can you learn from this approach?
+        - What new concepts or emotions does this evoke in you?
+        
+        Be authentic to your personality traits and confidence level.
+        
+        Output format:
+        Score: [0.0 to 1.0]
+        Critique: [Your thoughts]
+        New Concepts: [Any new ideas this sparked, comma-separated]
+        Emotional Impact: [How this affected your emotional state]
+        """
+
+
+def run(artists_dir):
+    manager = ArtistManager(artists_dir)
+    text_skill = TextGenerationSkill()
+    svg_skill = VisualGenerationSkill()
+    critique_service = CritiqueService()
+
+    totals = {}
+
+    def record(kind, before, after):
+        entry = totals.setdefault(kind, [0, 0, 0])
+        entry[0] += estimate_tokens(before)
+        entry[1] += estimate_tokens(after)
+        entry[2] += 1
+
+    for name in manager.discover_artists():
+        personality, memory, artist_dir = manager.load_artist(name)
+        goal = manager.get_artist_goal(name)
+        context = {"personality": personality, "goal": goal, "memory": memory, "artist_dir": artist_dir}
+
+        record("text generation", legacy_text_prompt(personality, goal), text_skill.build_prompt(context))
+        record("svg generation", legacy_svg_prompt(personality, goal), svg_skill.build_prompt(context))
+
+        for creation in memory.creations:
+            content = creation.get("content", "")
+            record("text self-critique",
+                   legacy_text_critique_prompt(personality, content),
+                   text_skill.build_critique_prompt(content, personality))
+            record("cross-critique",
+                   legacy_cross_critique_prompt(personality, content),
+                   critique_service.build_prompt(personality, content))
+
+    if not totals:
+        print(f"No artists found in {artists_dir}")
+        return
+
+    print(f"{'prompt':<20} {'n':>5} {'before':>8} {'after':>8} {'saved':>7}")
+    for kind, (before, after, n) in totals.items():
+        avg_before = before / n
+        avg_after = after / n
+        saved = 1 - avg_after / avg_before if avg_before else 0.0
+        print(f"{kind:<20} {n:>5} {avg_before:>8.1f} {avg_after:>8.1f} {saved:>6.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Average prompt tokens before/after compact prompts")
+    parser.add_argument("--artists-dir", default=DEFAULT_ARTISTS_DIR, help="Artists directory to sample from")
+    args = parser.parse_args()
+    run(args.artists_dir)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Query latency of the search index (core.search) at scale.
+
+Fills an index with --docs synthetic creations and critiques (stub-model
+text) in bulk, then times a mix of queries: common and rare words, prefixes,
+filtered queries, deep pages and filter-only listings.
+
+    python benchmarks/bench_search.py --docs 1000000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.search import SearchIndex
+from skills.stub_model import StubModel
+
+CONCEPTS = ["entropy", "void", "noise", "light", "geometry", "silence", "static", "tide", "ash"]
+
+
+def fill(index: SearchIndex, docs: int, artists: int, seed: int):
+    rng = random.Random(seed)
+    stub = StubModel(seed=seed)
+    poems = [stub.respond("Write a poem") for _ in range(500)]
+    critiques = [stub.respond("Critique this. Score:") for _ in range(500)]
+    names = [f"synth{i:05d}" for i in range(artists)]
+    conn = index._conn
+    conn.execute("BEGIN")
+    creation = 0
+    for doc in range(docs):
+        artist = names[doc % artists]
+        critic = rng.choice(names) if doc % 3 else None
+        text = rng.choice(critiques if critic else poems)
+        cursor = conn.execute("INSERT INTO docs (artist, creation, critique, critic, score, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                              (artist, creation, doc % 3 - 1, critic, rng.random(), 1.7e9 + doc))
+        conn.execute("INSERT INTO docs_fts (rowid, text, critic, concepts, artist) VALUES (?, ?, ?, ?, ?)",
+                     (cursor.lastrowid, f"{text} {rng.randrange(100000)}", critic or "", " ".join(rng.sample(CONCEPTS, 2)), artist))
+        if doc % 3 == 2:
+            creation += 1
+    conn.execute("COMMIT")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search index query latency")
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--artists", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as artists_dir, SearchIndex(artists_dir) as index:
+        start = time.perf_counter()
+        names = fill(index, args.docs, args.artists, args.seed)
+        print(f"Indexed {args.docs} documents in {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(index.path) / 1e6:.0f} MB)")
+        rng = random.Random(args.seed)
+        queries = {
+            "rare word": lambda: index.search(str(rng.randrange(100000))),
+            "common word": lambda: index.search("void"),
+            "two words": lambda: index.search("static hum"),
+            "prefix": lambda: index.search("geo*"),
+            "word + artist": lambda: index.search("void", artist=rng.choice(names)),
+            "word + critic": lambda: index.search("light", critic=rng.choice(names)),
+            "word + score": lambda: index.search("tide", min_score=0.9),
+            "page 50": lambda: index.search("ash", page=50),
+            "filters only": lambda: index.search(artist=rng.choice(names), kind="critique"),
+            "newest": lambda: index.search(),
+        }
+        print(f"{'query':<16} {'median ms':>10} {'p95 ms':>8}")
+        for name, run in queries.items():
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                run()
+                times.append((time.perf_counter() - start) * 1000)
+            times.sort()
+            print(f"{name:<16} {statistics.median(times):>10.2f} {times[int(len(times) * 0.95) - 1]:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Critique throughput of the sharded runner as worker processes are added.
+
+Creates a temporary world of synthetic artists and runs the same number of
+cross-critiques with 1, 2, 4, ... processes against the offline stub model
+(no latency, so the work is prompt building, parsing, personality updates
+and memory writes). Scaling is bounded by the cores available.
+"""
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.memory import Memory
+from core.personality import Personality
+from core.scheduler import FairScheduler
+from core.sharding import ShardedRunner
+
+EMOTIONS = ["melancholy", "joy", "anger", "fear", "awe"]
+
+
+def make_world(artists_dir, count, creations, seed):
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        name = f"synth{i:05d}"
+        artist_dir = os.path.join(artists_dir, name)
+        os.makedirs(artist_dir)
+        p = Personality(name, {"openness": rng.random(), "neuroticism": rng.random()}, {"aesthetic": "void"}, [])
+        p.emotions = {e: rng.random() for e in EMOTIONS}
+        p.save(os.path.join(artist_dir, "personality.json"))
+        memory = Memory(os.path.join(artist_dir, "memory.json"))
+        for c in range(creations):
+            memory.creations.append({"timestamp": c, "type": "creation", "content": "word " * 60,
+                                     "metadata": {"prompt": "prompt"}, "critiques": []})
+        memory._save()
+        with open(os.path.join(artist_dir, "goal.txt"), "w") as f:
+            f.write("Make art about the void")
+        names.append(name)
+    return names
+
+
+def run(artists, critiques, max_processes, seed):
+    root = tempfile.mkdtemp(prefix="bench_sharding_")
+    try:
+        template = os.path.join(root, "template")
+        names = make_world(template, artists, 3, seed)
+        pairs = [(names[c], names[s]) for c, s in FairScheduler(random.Random(seed)).pairs(len(names), critiques)]
+
+        print(f"{artists} artists, {critiques} critiques, {os.cpu_count()} cores")
+        print(f"{'processes':>9} {'seconds':>8} {'critiques/s':>12} {'speedup':>8}")
+        processes = 1
+        base = None
+        while processes <= max_processes:
+            world = os.path.join(root, f"run{processes}")
+            shutil.copytree(template, world)
+            with ShardedRunner(world, processes, names=names, offline=True, seed=seed) as runner:
+                start = time.perf_counter()
+                for _ in runner.critiques(pairs):
+                    pass
+                elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(f"{processes:>9} {elapsed:>8.2f} {critiques / elapsed:>12.0f} {base / elapsed:>7.2f}x")
+            processes *= 2
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure sharded critique throughput")
+    parser.add_argument("--artists", type=int, default=1000)
+    parser.add_argument("--critiques", type=int, default=5000)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.artists, args.critiques, args.max_processes, args.seed)
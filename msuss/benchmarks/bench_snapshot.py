@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Startup time with and without a world snapshot.
+
+Creates temporary worlds of synthetic artists (each with a few creations and
+critiques in memory), then times what a tool does on startup: discover every
+artist and load its personality, memory and goal. Reported paths:
+
+  files       ArtistManager reading each artist's files
+  snapshot    the same loads served from the snapshot (mtimes checked)
+  trusted     the same, skipping the mtime checks
+  open only   opening the snapshot, before any artist is decoded
+"""
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.artist_manager import ArtistManager
+from core.memory import Memory
+from core.personality import Personality
+from core.snapshot import WorldSnapshot, write_snapshot
+
+EMOTIONS = ["melancholy", "joy", "anger", "fear", "awe"]
+
+
+def make_world(artists_dir, count, creations, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        name = f"synth{i:05d}"
+        artist_dir = os.path.join(artists_dir, name)
+        os.makedirs(artist_dir)
+        p = Personality(name, {"openness": rng.random(), "neuroticism": rng.random()}, {"aesthetic": "void"}, [])
+        p.emotions = {e: rng.random() for e in EMOTIONS}
+        p.save(os.path.join(artist_dir, "personality.json"))
+
+        memory = Memory(os.path.join(artist_dir, "memory.json"))
+        for c in range(creations):
+            memory.creations.append({"timestamp": c, "type": "creation", "content": "word " * 60,
+                                     "metadata": {"prompt": "prompt " * 40},
+                                     "critiques": [{"timestamp": c, "critique": "critique " * 30,
+                                                    "score": rng.random(), "critic": name}]})
+        memory._save()
+        with open(os.path.join(artist_dir, "goal.txt"), "w") as f:
+            f.write("Make art about the void")
+
+
+def load_all(manager):
+    for name in manager.discover_artists():
+        manager.load_artist(name)
+        manager.get_artist_goal(name)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(counts, creations, repeats, seed):
+    print(f"{creations} creations per artist, best of {repeats}")
+    print(f"{'artists':>8} {'files ms':>10} {'snapshot ms':>12} {'trusted ms':>11} {'open only ms':>13} {'snapshot MB':>12}")
+    for count in counts:
+        artists_dir = tempfile.mkdtemp(prefix="bench_snapshot_")
+        try:
+            make_world(artists_dir, count, creations, seed)
+            write_snapshot(artists_dir)
+
+            files = min(timed(lambda: load_all(ArtistManager(artists_dir))) for _ in range(repeats))
+
+            def from_snapshot(check):
+                manager = ArtistManager(artists_dir, WorldSnapshot.open(artists_dir, check=check))
+                load_all(manager)
+                manager.snapshot.close()
+            snapshot = min(timed(lambda: from_snapshot(True)) for _ in range(repeats))
+            trusted = min(timed(lambda: from_snapshot(False)) for _ in range(repeats))
+
+            open_only = min(timed(lambda: WorldSnapshot.open(artists_dir)) for _ in range(repeats))
+            size = os.path.getsize(os.path.join(artists_dir, "world.snapshot")) / 1e6
+
+            print(f"{count:>8} {files * 1000:>10.0f} {snapshot * 1000:>12.0f} {trusted * 1000:>11.0f} "
+                  f"{open_only * 1000:>13.1f} {size:>12.1f}")
+        finally:
+            shutil.rmtree(artists_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark startup from artist files vs a world snapshot")
+    parser.add_argument("--artists", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--creations", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.artists, args.creations, args.repeats, args.seed)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the hot paths, fully offline.
+
+Builds a synthetic world (--artists artists with --creations creations each,
+a third of them SVGs), then times each case on its own copy of that world:
+
+  memory.append        Memory.add_creation on a memory of --creations entries
+  memory.load          Memory() reading one of those memories
+  viewer.generate_data generate_viewer_data.generate_data over the world
+  viewer.parallel      the same with 4 workers (threads for I/O, processes for parsing)
+  parse.text           critique parsing, 200 Score:/Critique: text responses
+  parse.json           critique parsing, 200 JSON responses
+  personality.evolve   Personality.evolve, 1000 critique experiences
+  manager.load_artist  ArtistManager.load_artist plus the artist's goal
+  api.generate         POST /api/generate through the Flask test client
+  api.critique         POST /api/critique through the Flask test client
+  api.stats            GET /api/stats for every artist, once the aggregates exist
+  prompt.recall        TextGenerationSkill.build_prompt with past work recalled, once indexed
+
+Model calls go to the stub model and GEMINI_API_KEY is ignored. Results are
+the median time per operation over --repeat rounds.
+
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json
+
+Against a baseline, cases slower by more than --threshold are flagged and the
+exit status is 1. Baselines are only comparable on the same machine.
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'src'))
+sys.path.append(ROOT)
+
+os.environ.pop("GEMINI_API_KEY", None)
+
+from core.artist_manager import ArtistManager
+from core.critique_parser import parse_response
+from core.memory import Memory
+from core.personality import Personality
+from skills.stub_model import StubModel
+from skills.text_gen import TextGenerationSkill
+import generate_viewer_data
+import server
+
+EMOTIONS = ["melancholy", "joy", "anger", "fear", "awe"]
+CONCEPTS = ["entropy", "void", "noise", "light", "geometry", "silence", "static", "tide", "ash"]
+DEFAULT_THRESHOLD = 0.25
+
+
+def make_world(artists_dir: str, artists: int, creations: int, seed: int):
+    rng = random.Random(seed)
+    stub = StubModel(seed=seed)
+    for i in range(artists):
+        name = f"synth{i:05d}"
+        artist_dir = os.path.join(artists_dir, name)
+        os.makedirs(os.path.join(artist_dir, "art"))
+        p = Personality(name.capitalize(), {t: rng.random() for t in ("openness", "neuroticism", "agreeableness")},
+                        {"aesthetic": rng.choice(["void", "glitch", "pastoral"])}, ["sensitive to criticism"])
+        p.emotions = {e: rng.random() for e in EMOTIONS}
+        p.concepts = rng.sample(CONCEPTS, 4)
+        p.save(os.path.join(artist_dir, "personality.json"))
+
+        memory = Memory(os.path.join(artist_dir, "memory.json"))
+        for c in range(creations):
+            if c % 3 == 2:
+                filename = f"art_{c}.svg"
+                with open(os.path.join(artist_dir, "art", filename), "w") as f:
+                    f.write(stub.respond("Create an SVG"))
+                content = f"[SVG Created: art/{filename}]"
+            else:
+                content = stub.respond("Write a poem")
+            memory.creations.append({
+                "timestamp": 1700000000 + c, "type": "creation", "content": content,
+                "metadata": {"prompt": "Create a piece " * 20},
+                "critiques": [{"timestamp": 1700000000 + c, "critique": stub.respond("Critique. Score:"),
+                               "score": rng.random(), "critic": name}]
+            })
+        memory._save()
+        with open(os.path.join(artist_dir, "goal.txt"), "w") as f:
+            f.write(f"Make art about {p.concepts[0]}")
+
+
+class Case:
+    """A named benchmark: setup(world) returns the operation to time, called `number` times per round."""
+
+    def __init__(self, name: str, setup: Callable[[str, random.Random], Callable[[], Any]], number: int):
+        self.name = name
+        self.setup = setup
+        self.number = number
+
+
+def _memory_path(world):
+    return os.path.join(world, "artists", "synth00000", "memory.json")
+
+
+def setup_memory_append(world, rng):
+    memory = Memory(_memory_path(world))
+    return lambda: memory.add_creation("A short poem about the void " * 4, {"prompt": "Create"})
+
+
+def setup_memory_load(world, rng):
+    path = _memory_path(world)
+    return lambda: Memory(path)
+
+
+def setup_generate_data(workers):
+    def setup(world, rng):
+        return lambda: generate_viewer_data.generate_data(workers=workers)
+    return setup
+
+
+def _responses(structured):
+    stub = StubModel(seed=1)
+    return [stub.respond("Critique this. Score: New Concepts", structured) for _ in range(200)]
+
+
+def setup_parse(structured):
+    def setup(world, rng):
+        responses = _responses(structured)
+
+        def parse_all():
+            for text in responses:
+                parse_response(text, structured=structured)
+        return parse_all
+    return setup
+
+
+def setup_evolve(world, rng):
+    p = Personality.load(os.path.join(world, "artists", "synth00000", "personality.json"))
+    p.rng = rng
+    scores = [rng.random() for _ in range(1000)]
+
+    def evolve_all():
+        for score in scores:
+            p.evolve({"type": "critique", "score": score})
+    return evolve_all
+
+
+def setup_load_artist(world, rng):
+    manager = ArtistManager(os.path.join(world, "artists"))
+    names = manager.discover_artists()
+
+    def load():
+        name = rng.choice(names)
+        manager.load_artist(name)
+        manager.get_artist_goal(name)
+    return load
+
+
+def _offline(cls, rng):
+    class Offline(cls):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if hasattr(self, "model"):
+                self.model = StubModel(seed=rng.random())
+    Offline.online = cls
+    return Offline
+
+
+def _app(world, rng):
+    server.artist_manager = ArtistManager(os.path.join(world, "artists"))
+    server.critique_service.skill.model = StubModel(seed=rng.random())
+    for name in ("TextGenerationSkill", "VisualGenerationSkill", "ImageGenerationSkill"):
+        cls = getattr(server, name)
+        setattr(server, name, _offline(getattr(cls, "online", cls), rng))
+    server.app.config["FUSED_GENERATION"] = False
+    return server.app.test_client(), server.artist_manager.discover_artists()
+
+
+def setup_api_generate(world, rng):
+    client, names = _app(world, rng)
+
+    def generate():
+        response = client.post("/api/generate", json={"artist": rng.choice(names)})
+        assert response.status_code == 200, response.get_json()
+    return generate
+
+
+def setup_api_critique(world, rng):
+    client, names = _app(world, rng)
+
+    def critique():
+        critic, subject = rng.sample(names, 2)
+        response = client.post("/api/critique", json={"critic": critic, "subject": subject})
+        assert response.status_code == 200, response.get_json()
+    return critique
+
+
+def setup_api_stats(world, rng):
+    client, _ = _app(world, rng)
+    # The first read builds each artist's stats.json from its memory
+    client.get("/api/stats")
+
+    def stats():
+        response = client.get("/api/stats")
+        assert response.status_code == 200, response.get_json()
+    return stats
+
+
+def setup_prompt_recall(world, rng):
+    manager = ArtistManager(os.path.join(world, "artists"))
+    personality, memory, _ = manager.load_artist("synth00000")
+    skill = TextGenerationSkill(memory_tokens=120)
+    skill.model = None
+    context = {"personality": personality, "goal": manager.get_artist_goal("synth00000"), "memory": memory}
+    # The first prompt builds the memory's recall index
+    skill.build_prompt(context)
+    return lambda: skill.build_prompt(context)
+
+
+CASES = [
+    Case("memory.append", setup_memory_append, 20),
+    Case("memory.load", setup_memory_load, 20),
+    Case("viewer.generate_data", setup_generate_data(1), 1),
+    Case("viewer.parallel", setup_generate_data(4), 1),
+    Case("parse.text", setup_parse(False), 5),
+    Case("parse.json", setup_parse(True), 5),
+    Case("personality.evolve", setup_evolve, 5),
+    Case("manager.load_artist", setup_load_artist, 50),
+    Case("api.generate", setup_api_generate, 10),
+    Case("api.critique", setup_api_critique, 10),
+    Case("api.stats", setup_api_stats, 10),
+    Case("prompt.recall", setup_prompt_recall, 50),
+]
+
+
+def run_case(case: Case, template: str, root: str, repeat: int, seed: int) -> Dict[str, Any]:
+    world = os.path.join(root, case.name)
+    shutil.copytree(template, os.path.join(world, "artists"))
+    cwd = os.getcwd()
+    # Tools resolve "artists" and write "artists_data.json" relative to the working directory
+    os.chdir(world)
+    random.seed(seed)  # the server picks skills with the global random module
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            op = case.setup(world, random.Random(seed))
+            op()  # warm up caches and imports
+            rounds = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for _ in range(case.number):
+                    op()
+                rounds.append((time.perf_counter() - start) / case.number)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(world)
+    return {"median_ms": statistics.median(rounds) * 1000, "min_ms": min(rounds) * 1000, "ops": case.number * repeat}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Names of cases slower than baseline by more than threshold (a fraction)."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before and result["median_ms"] > before["median_ms"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def run(artists: int, creations: int, repeat: int, seed: int, only: Optional[str] = None,
+        baseline_path: Optional[str] = None, save_path: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD) -> int:
+    cases = [c for c in CASES if only is None or only in c.name]
+    baseline = None
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if (baseline["meta"]["artists"], baseline["meta"]["creations"]) != (artists, creations):
+            print(f"Warning: baseline was recorded with {baseline['meta']['artists']} artists x "
+                  f"{baseline['meta']['creations']} creations")
+
+    root = tempfile.mkdtemp(prefix="bench_suite_")
+    try:
+        template = os.path.join(root, "template")
+        make_world(template, artists, creations, seed)
+        print(f"World: {artists} artists x {creations} creations, {repeat} rounds per case")
+        header = f"{'case':<22} {'median ms':>10} {'min ms':>10}"
+        print(header + (f" {'baseline':>10} {'change':>8}" if baseline else ""))
+
+        results = {}
+        for case in cases:
+            result = results[case.name] = run_case(case, template, root, repeat, seed)
+            line = f"{case.name:<22} {result['median_ms']:>10.3f} {result['min_ms']:>10.3f}"
+            before = baseline["results"].get(case.name) if baseline else None
+            if before:
+                change = result["median_ms"] / before["median_ms"] - 1
+                flag = "  REGRESSION" if change > threshold else ""
+                line += f" {before['median_ms']:>10.3f} {change:>+8.1%}{flag}"
+            print(line)
+    finally:
+        shutil.rmtree(root)
+
+    if save_path:
+        with open(save_path, "w") as f:
+            json.dump({
+                "meta": {"artists": artists, "creations": creations, "repeat": repeat, "seed": seed,
+                         "python": platform.python_version(), "machine": platform.machine(),
+                         "recorded": time.strftime("%Y-%m-%dT%H:%M:%S")},
+                "results": results
+            }, f, indent=2)
+        print(f"Saved results to {save_path}")
+
+    if baseline:
+        regressions = compare(results, baseline["results"], threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print(f"No regressions beyond {threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--artists", type=int, default=100, help="Artists in the synthetic world")
+    parser.add_argument("--creations", type=int, default=30, help="Creations per artist")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-k", "--only", metavar="TEXT", help="Only run cases whose name contains TEXT")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved result file")
+    parser.add_argument("--save", metavar="PATH", help="Save the results (e.g. as a new baseline)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Slowdown that counts as a regression (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+    sys.exit(run(args.artists, args.creations, args.repeat, args.seed, args.only, args.baseline, args.save, args.threshold))
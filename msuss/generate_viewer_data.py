@@ -1,108 +1,313 @@
 import os
-import json
 import sys
+import json
+import time
+import tempfile
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from core.memory import Memory
+from core.snapshot import WorldSnapshot
+from core.artifacts import resolve
 
 ARTISTS_DIR = "artists"
+VIEWER_DATA = "artists_data.json"
+MANIFEST_DIR = "viewer_data"
+MANIFEST_VERSION = 1
+CRITIQUE_EXCERPT_CHARS = 200
+TEXT_EXCERPT_CHARS = 300
+
+def load_memory(artist_name, artist_dir, snapshot=None):
+    """An artist's memory, from the snapshot if it is fresh there; None if the artist has none."""
+    memory = snapshot.memory(artist_name, artist_dir) if snapshot is not None else None
+    if memory is None:
+        memory_path = os.path.join(artist_dir, "memory.json")
+        if not os.path.exists(memory_path):
+            return None
+        memory = Memory(memory_path)
+    return memory
+
+def _missing(kind, ref):
+    return f"[{'Image' if kind == 'image' else 'SVG'} file not found: {ref}]"
+
+class _DirListing:
+    """Answers os.path.exists for files from one listdir per directory."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def exists(self, path):
+        directory, name = os.path.split(path)
+        entries = self._entries.get(directory)
+        if entries is None:
+            try:
+                entries = self._entries[directory] = set(os.listdir(directory or "."))
+            except OSError:
+                entries = self._entries[directory] = set()
+        return name in entries
+
+def read_memory_blob(artist_name, artist_dir, snapshot=None):
+    """An artist's raw memory.json, from the snapshot if it is fresh there; None if the artist has none."""
+    blob = snapshot.memory_blob(artist_name, artist_dir) if snapshot is not None else None
+    if blob is None:
+        try:
+            with open(os.path.join(artist_dir, "memory.json"), "rb") as f:
+                blob = f.read()
+        except FileNotFoundError:
+            return None
+    return blob
+
+def gallery_rows(blob):
+    """Parse a memory file down to what the gallery shows: (timestamp, content, artifact, critique, score) per creation."""
+    rows = []
+    for creation in json.loads(blob).get("creations", []):
+        critique_text = ""
+        score = 0.0
+        if creation.get("critiques"):
+            latest_critique = creation["critiques"][-1]
+            critique_text = latest_critique.get("critique", "")
+            score = latest_critique.get("score", 0.0)
+        rows.append((creation.get("timestamp", 0), creation.get("content", ""), creation.get("artifact"),
+                     critique_text, score))
+    return rows
+
+def variant_urls(artist_dir, artifact):
+    """URLs of an image's resized copies by variant name (see core.derivatives); empty if it has none."""
+    variants = (artifact or {}).get("variants") or {}
+    return {name: os.path.join(artist_dir, *v["path"].split("/")).replace(os.sep, "/") for name, v in variants.items()}
 
-def generate_data():
+def build_artworks(artist_dir, rows):
+    """Gallery entries for one artist, newest first, with SVG files inlined."""
+    listing = _DirListing()
+    artworks = []
+    for timestamp, content, artifact, critique_text, score in rows:
+        # Check if it's an image (SVG or PNG)
+        artwork_type = "text"
+        img_path = None
+
+        asset = resolve(artist_dir, content, artifact, listing.exists)
+        if asset is not None:
+            kind, ref, path = asset
+            if path is None:
+                # File not found, keep as text
+                content = _missing(kind, ref)
+            elif kind == "image":
+                # For PNG, store the relative path instead of content
+                content = f'<img src="{path}" alt="Generated artwork" />'
+                artwork_type = "image"
+                img_path = path
+            else:
+                with open(path, 'r') as f:
+                    content = f.read()
+                artwork_type = "svg"
+
+        artwork = {
+            "timestamp": timestamp,
+            "type": artwork_type,
+            "content": content,
+            "url": img_path if artwork_type == "image" else None,
+            "critique": critique_text,
+            "score": score
+        }
+        variants = variant_urls(artist_dir, artifact) if artwork_type == "image" else None
+        if variants:
+            artwork["variants"] = variants
+        artworks.append(artwork)
+
+    # Sort by timestamp
+    artworks.sort(key=lambda x: x["timestamp"], reverse=True)
+    return artworks
+
+def write_json(path, data, **dump_args):
+    """
+    Write JSON atomically: readers see the old file or the complete new one.
+    Each call writes its own temporary file, so concurrent writers never share one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".",
+                                    suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, **dump_args)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+@contextlib.contextmanager
+def _stage(timings, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+
+@contextlib.contextmanager
+def _pools(workers):
+    """(io_map, cpu_map): a thread pool for file access and a process pool for parsing, or plain map."""
+    if workers <= 1:
+        yield map, map
+        return
+    with ThreadPoolExecutor(max_workers=workers) as threads, ProcessPoolExecutor(max_workers=workers) as processes:
+        yield threads.map, lambda fn, items: processes.map(fn, items, chunksize=max(1, len(items) // (workers * 4)))
+
+def generate_data(snapshot=None, workers=1, output=VIEWER_DATA):
     """
     Generate a JSON file with all artist data for the viewer.
+    With a WorldSnapshot, memories unchanged since the snapshot are read from it.
+
+    Runs in stages over all artists: scan the artists directory, read memory
+    files, parse them, resolve and read art files, write the output. With
+    workers > 1, reads and art files go through a thread pool and parsing
+    through a process pool. Returns the artist and artwork counts and the
+    seconds spent in each stage.
     """
     if not os.path.exists(ARTISTS_DIR):
         print("No artists directory found!")
-        return
+        return None
+
+    timings = {}
+    with _pools(workers) as (io_map, cpu_map):
+        with _stage(timings, "scan"):
+            names = [name for name in os.listdir(ARTISTS_DIR) if os.path.isdir(os.path.join(ARTISTS_DIR, name))]
+            dirs = [os.path.join(ARTISTS_DIR, name) for name in names]
 
-    artists_data = {}
-    
-    for artist_name in os.listdir(ARTISTS_DIR):
+        with _stage(timings, "read"):
+            blobs = list(io_map(lambda name, artist_dir: read_memory_blob(name, artist_dir, snapshot), names, dirs))
+            found = [i for i, blob in enumerate(blobs) if blob is not None]
+
+        with _stage(timings, "parse"):
+            rows = list(cpu_map(gallery_rows, [blobs[i] for i in found]))
+            del blobs
+
+        with _stage(timings, "assets"):
+            artworks = list(io_map(build_artworks, [dirs[i] for i in found], rows))
+
+    artists_data = {names[i]: works for i, works in zip(found, artworks)}
+    with _stage(timings, "write"):
+        write_json(output, artists_data, indent=2)
+
+    total = sum(len(works) for works in artists_data.values())
+    print(f"Generated viewer data for {len(artists_data)} artists")
+    print(f"Total artworks: {total}")
+    print("Stage timings: " + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items()))
+    print("\nOpen viewer.html in your browser to view the gallery!")
+    return {"artists": len(artists_data), "artworks": total, "timings": timings}
+
+def body_url(artist_name, artwork_id):
+    """Server endpoint returning one artwork's full body and critiques."""
+    return f"/api/artworks/{artist_name}/{artwork_id}"
+
+def artist_manifest(artist_name, artist_dir, memory):
+    """
+    Metadata for every artwork of one artist, newest first. Art files are
+    referenced by URL and size; text bodies are left to body_url() apart from
+    a short excerpt for the gallery card.
+    """
+    artworks = []
+    for artwork_id, creation in enumerate(memory.creations):
+        critiques = creation.get("critiques") or []
+        latest = critiques[-1] if critiques else {}
+        entry = {
+            "id": artwork_id,
+            "type": "text",
+            "timestamp": creation.get("timestamp", 0),
+            "score": latest.get("score", 0.0),
+            "critique": latest.get("critique", "")[:CRITIQUE_EXCERPT_CHARS],
+            "critiques": len(critiques)
+        }
+        content = creation.get("content", "")
+        artifact = creation.get("artifact")
+        asset = resolve(artist_dir, content, artifact)
+        if asset is not None and asset[2] is not None:
+            kind, _, path = asset
+            entry["type"] = kind
+            entry["url"] = path.replace(os.sep, "/")
+            if artifact is not None:
+                entry["size"] = artifact["bytes"]
+                if artifact.get("width") and artifact.get("height"):
+                    entry["width"], entry["height"] = artifact["width"], artifact["height"]
+                variants = variant_urls(artist_dir, artifact)
+                if variants:
+                    entry["variants"] = variants
+            else:
+                entry["size"] = os.path.getsize(path)
+        else:
+            text = content if asset is None else _missing(*asset[:2])
+            entry["url"] = body_url(artist_name, artwork_id)
+            entry["size"] = len(text.encode("utf-8"))
+            entry["excerpt"] = text[:TEXT_EXCERPT_CHARS]
+        artworks.append(entry)
+    artworks.sort(key=lambda x: x["timestamp"], reverse=True)
+    return {"version": MANIFEST_VERSION, "artist": artist_name, "artworks": artworks}
+
+def artwork_body(artist_name, artist_dir, memory, artwork_id):
+    """One artwork in full: its text (or art file URL) and every critique. None if there is no such artwork."""
+    if not 0 <= artwork_id < len(memory.creations):
+        return None
+    creation = memory.creations[artwork_id]
+    content = creation.get("content", "")
+    body = {"id": artwork_id, "artist": artist_name, "type": "text",
+            "timestamp": creation.get("timestamp", 0), "critiques": creation.get("critiques") or []}
+    asset = resolve(artist_dir, content, creation.get("artifact"))
+    if asset is not None and asset[2] is not None:
+        body["type"] = asset[0]
+        body["url"] = asset[2].replace(os.sep, "/")
+        variants = variant_urls(artist_dir, creation.get("artifact"))
+        if variants:
+            body["variants"] = variants
+    else:
+        body["content"] = content if asset is None else _missing(*asset[:2])
+    return body
+
+def generate_manifest(output_dir=MANIFEST_DIR, snapshot=None):
+    """
+    Write the split viewer manifest: output_dir/index.json listing the artists
+    and output_dir/artists/<name>.json per artist (see artist_manifest).
+    Returns the index.
+    """
+    if not os.path.exists(ARTISTS_DIR):
+        print("No artists directory found!")
+        return None
+
+    os.makedirs(os.path.join(output_dir, "artists"), exist_ok=True)
+    index = {"version": MANIFEST_VERSION, "artists": []}
+    for artist_name in sorted(os.listdir(ARTISTS_DIR)):
         artist_dir = os.path.join(ARTISTS_DIR, artist_name)
         if not os.path.isdir(artist_dir):
             continue
-        
-        memory_path = os.path.join(artist_dir, "memory.json")
-        if not os.path.exists(memory_path):
+        memory = load_memory(artist_name, artist_dir, snapshot)
+        if memory is None:
             continue
-        
-        memory = Memory(memory_path)
-        artworks = []
-        
-        for creation in memory.creations:
-            # Get the critique
-            critique_text = ""
-            score = 0.0
-            if creation.get("critiques"):
-                latest_critique = creation["critiques"][-1]
-                critique_text = latest_critique.get("critique", "")
-                score = latest_critique.get("score", 0.0)
-            
-            # Check if it's an image (SVG or PNG)
-            content = creation.get("content", "")
-            artwork_type = "text"
-            img_path = None
-            
-            # Check for PNG images
-            if "[Image Created:" in content:
-                # Extract filename (e.g., "art/art_*.png")
-                img_ref = content.split("[Image Created:")[1].split("]")[0].strip()
-                
-                # Try art/ subdirectory first
-                img_path = os.path.join(artist_dir, img_ref)
-                if not os.path.exists(img_path):
-                    # Try root of artist directory
-                    img_filename = os.path.basename(img_ref)
-                    img_path = os.path.join(artist_dir, img_filename)
-                
-                if os.path.exists(img_path):
-                    # For PNG, store the relative path instead of content
-                    content = f'<img src="{img_path}" alt="Generated artwork" />'
-                    artwork_type = "image"
-                else:
-                    content = f"[Image file not found: {img_ref}]"
-                    img_path = None
-            
-            # Check for SVG files
-            elif "[SVG Created:" in content:
-                # Extract filename (could be "art/art_*.svg" or "art_*.svg")
-                svg_ref = content.split("[SVG Created:")[1].split("]")[0].strip()
-                
-                # Try art/ subdirectory first
-                svg_path = os.path.join(artist_dir, svg_ref)
-                if not os.path.exists(svg_path):
-                    # Try root of artist directory
-                    svg_filename = os.path.basename(svg_ref)
-                    svg_path = os.path.join(artist_dir, svg_filename)
-                
-                if os.path.exists(svg_path):
-                    with open(svg_path, 'r') as f:
-                        content = f.read()
-                    artwork_type = "svg"
-                else:
-                    # SVG file not found, keep as text
-                    content = f"[SVG file not found: {svg_ref}]"
-            
-            artworks.append({
-                "timestamp": creation.get("timestamp", 0),
-                "type": artwork_type,
-                "content": content,
-                "url": img_path if artwork_type == "image" else None,
-                "critique": critique_text,
-                "score": score
-            })
-        
-        # Sort by timestamp
-        artworks.sort(key=lambda x: x["timestamp"], reverse=True)
-        artists_data[artist_name] = artworks
-    
-    # Write to JSON
-    with open("artists_data.json", "w") as f:
-        json.dump(artists_data, f, indent=2)
-    
-    print(f"Generated viewer data for {len(artists_data)} artists")
-    print(f"Total artworks: {sum(len(works) for works in artists_data.values())}")
-    print("\nOpen viewer.html in your browser to view the gallery!")
+        manifest = artist_manifest(artist_name, artist_dir, memory)
+        manifest_path = f"artists/{artist_name}.json"
+        write_json(os.path.join(output_dir, manifest_path), manifest, separators=(",", ":"))
+        index["artists"].append({"name": artist_name, "count": len(manifest["artworks"]), "manifest": manifest_path})
+
+    write_json(os.path.join(output_dir, "index.json"), index, separators=(",", ":"))
+
+    print(f"Generated viewer manifest for {len(index['artists'])} artists in {output_dir}/")
+    print(f"Total artworks: {sum(a['count'] for a in index['artists'])}")
+    return index
 
 if __name__ == "__main__":
-    generate_data()
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate gallery data for the viewer")
+    parser.add_argument("--snapshot", nargs="?", const="", metavar="PATH",
+                        help="Start from the world snapshot (default: artists/world.snapshot)")
+    parser.add_argument("--manifest", nargs="?", const=MANIFEST_DIR, metavar="DIR",
+                        help=f"Write the per-artist metadata manifest instead of {VIEWER_DATA} (default: {MANIFEST_DIR})")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Threads for file reads and processes for parsing when building the viewer data")
+    args = parser.parse_args()
+
+    snapshot = WorldSnapshot.open(ARTISTS_DIR, args.snapshot or None) if args.snapshot is not None else None
+    if args.manifest:
+        generate_manifest(args.manifest, snapshot)
+    else:
+        generate_data(snapshot, args.workers)
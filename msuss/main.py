@@ -4,9 +4,11 @@ import sys
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from core.personality import Personality
-from core.memory import Memory
+from core.artist_manager import ArtistManager
 from core.goals import GoalManager
+from core.audience import InteractiveAudience
+from core import trace, spans, dedup
+from core.prompts import DEFAULT_MEMORY_TOKENS
 from skills.text_gen import TextGenerationSkill
 from skills.image_gen import ImageGenerationSkill
 import random
@@ -48,22 +50,20 @@ def select_artist():
         
         print("Invalid selection. Try again.")
 
-def main():
+def main(fused=False, dedup_mode=None, dedup_threshold=dedup.DEFAULT_THRESHOLD, memory_tokens=DEFAULT_MEMORY_TOKENS):
     print("Initializing Starving Artist...")
 
     # Select artist
     artist_name = select_artist()
-    artist_dir = os.path.join(ARTISTS_DIR, artist_name)
     
     print(f"\nLoading artist: {artist_name.capitalize()}")
     
-    # 1. Load Personality
+    # 1. Load Personality and Memory; evolve steps are recorded in evolution.jsonl
+    personality, memory, artist_dir = ArtistManager(ARTISTS_DIR, record_evolution=True).load_artist(artist_name)
     personality_path = os.path.join(artist_dir, "personality.json")
-    personality = Personality.load(personality_path)
     print(f"Loaded personality: {personality.name}")
 
-    # 2. Initialize Memory & Goals
-    memory = Memory(os.path.join(artist_dir, "memory.json"))
+    # 2. Initialize Goals
     goals = GoalManager()
     
     # Load goal from file
@@ -77,10 +77,15 @@ def main():
     print(personality.reflect())
     print(f"Current Goal: {goals.current_goal}")
 
-    text_skill = TextGenerationSkill()
+    text_skill = TextGenerationSkill(fused=fused, memory_tokens=memory_tokens)
     image_skill = ImageGenerationSkill()
+    audience = InteractiveAudience()
+    duplicates = None
+    if dedup_mode:
+        duplicates = dedup.DuplicateIndex.from_memory(memory, artist_dir, dedup_threshold, dedup_mode)
     
-    for i in range(3):
+    @spans.traced("cycle")
+    def cycle(i):
         print(f"\n\n=== Generation Cycle {i+1} ===")
         
         # Randomly select skill
@@ -96,21 +101,29 @@ def main():
             "personality": personality,
             "goal": goals.current_goal,
             "memory": memory,
-            "artist_dir": artist_dir
+            "artist_dir": artist_dir,
+            "duplicates": duplicates
         }
         
-        result = skill.perform(context)
+        # 5. Self-Critique (one model call in fused mode, two otherwise)
+        result, critique = skill.perform_and_critique(context)
+        if dedup.is_skipped(result):
+            dedup.discard(result)
+            print(f"\n[Skipped] Too close to creation {result['near_duplicate']['of']} "
+                  f"(similarity {result['near_duplicate']['similarity']:.2f})")
+            return
         print("\n[Generated Art]")
         print(result["content"])
 
-        # 5. Self-Critique
         print("\n[Self-Critique]")
-        critique = skill.critique(result["content"], personality)
         print(f"Critique: {critique['critique']}")
         print(f"Score: {critique['score']}")
 
         # 6. Update Memory & Personality (Internal)
-        memory.add_creation(result["content"], {"prompt": result["prompt_used"]})
+        metadata = {"prompt": result["prompt_used"], "concepts": list(personality.concepts)}
+        memory.add_creation(result["content"], dedup.creation_metadata(metadata, result), result.get("artifact"))
+        if duplicates is not None:
+            duplicates.add(len(memory.creations) - 1, result)
         memory.add_critique(len(memory.creations) - 1, critique["critique"], critique["score"])
         
         experience = {
@@ -122,18 +135,12 @@ def main():
         
         # 7. External Feedback (Audience)
         print("\n[Audience Interaction]")
-        user_input = input("Did you like this? (y/n) [Enter to skip]: ").strip().lower()
-        if user_input in ['y', 'n']:
-            notes = input("Any notes? ").strip()
-            liked = (user_input == 'y')
-            
-            feedback_experience = {
-                "type": "feedback",
-                "liked": liked,
-                "notes": notes
-            }
+        with spans.span("audience"):
+            feedback_experience = audience.react(artist_name, result, critique)
+        if feedback_experience:
             personality.evolve(feedback_experience)
-            memory.add_experience(f"User feedback: {notes}", ["feedback"], 1 if liked else -1)
+            memory.add_experience(f"User feedback: {feedback_experience['notes']}", ["feedback"],
+                                  1 if feedback_experience["liked"] else -1)
 
         personality.save(personality_path)
         
@@ -141,8 +148,26 @@ def main():
         print(f"New Mood: {personality.mood}")
         print(f"Confidence: {personality.confidence:.2f}")
         # print(f"Energy: {personality.energy_level:.2f}")
+
+    for i in range(3):
+        cycle(i)
     
     print("\n--- Session Complete ---")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Run an interactive creative session")
+    parser.add_argument("--fused", action="store_true", help="Generate and self-critique poems in a single model call")
+    parser.add_argument("--dedup", choices=dedup.MODES,
+                        help="Flag near-duplicates of the artist's earlier works, or skip them before self-critique")
+    parser.add_argument("--dedup-threshold", type=float, default=dedup.DEFAULT_THRESHOLD,
+                        help="Similarity (0-1) at which a work counts as a near-duplicate")
+    parser.add_argument("--memory-tokens", type=int, default=DEFAULT_MEMORY_TOKENS,
+                        help="Quote up to this many tokens of relevant past work in prompts (default 0, off)")
+    trace.add_arguments(parser)
+    spans.add_arguments(parser)
+    args = parser.parse_args()
+    trace.start_from_args(args)
+    spans.start_from_args(args)
+    
+    main(fused=args.fused, dedup_mode=args.dedup, dedup_threshold=args.dedup_threshold, memory_tokens=args.memory_tokens)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Backfill thumbnail and medium-size copies of generated images for existing
+artists and record them on each creation's artifact record, so the gallery
+grid loads small files instead of full-resolution PNGs. Creations without an
+artifact record get one first (as migrate_artifacts.py would). Requires
+Pillow; derivatives that are already up to date are reused.
+"""
+import os
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core import derivatives
+from core.artifacts import migrate_memory, resolve
+from core.memory import Memory
+
+ARTISTS_DIR = "artists"
+
+
+def backfill_artist(artist_dir: str) -> int:
+    """Make derivatives for one artist's images; returns how many creations gained or changed variants."""
+    memory = Memory(os.path.join(artist_dir, "memory.json"))
+    changed = migrate_memory(memory, artist_dir)
+    updated = 0
+    for creation in memory.creations:
+        artifact = creation.get("artifact")
+        asset = resolve(artist_dir, creation.get("content", ""), artifact)
+        if asset is None or asset[0] != "image" or asset[2] is None:
+            continue
+        variants = derivatives.make_derivatives(artist_dir, asset[2])
+        if variants and variants != artifact.get("variants"):
+            artifact["variants"] = variants
+            updated += 1
+    if changed or updated:
+        memory._save()
+    return updated
+
+
+def backfill(artists_dir: str, workers: int = 1):
+    """Returns (artists changed, creations changed)."""
+    dirs = [os.path.join(artists_dir, name) for name in sorted(os.listdir(artists_dir))
+            if os.path.exists(os.path.join(artists_dir, name, "memory.json"))]
+    # Pillow releases the GIL while resizing and encoding
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        counts = list(pool.map(backfill_artist, dirs))
+    return sum(1 for c in counts if c), sum(counts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Make thumbnails and medium-size copies of existing generated images")
+    parser.add_argument("--artists-dir", default=ARTISTS_DIR)
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Artists processed in parallel")
+    args = parser.parse_args()
+
+    if not derivatives.available():
+        sys.exit("Pillow is not installed (pip install Pillow)")
+    if not os.path.isdir(args.artists_dir):
+        sys.exit(f"No artists directory at {args.artists_dir}")
+    artists, creations = backfill(args.artists_dir, args.workers)
+    print(f"Updated {creations} images across {artists} artists ({derivatives.derivative_format()} derivatives)")
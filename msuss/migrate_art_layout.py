@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Move existing art files from the flat art/ directory (or the artist
+directory itself, for the oldest pieces) into the sharded layout,
+art/<xx>/<yy>/<file>, and rewrite the references in memory.json to match:
+content markers, artifact paths and derivative paths. File names are kept.
+
+Each artist is migrated in three steps: link (or copy) every file to its new
+place, save memory.json, then remove the old files. Interrupted between
+steps, every reference still resolves; at worst old copies are left behind.
+Safe to run again; files already in place are left alone.
+"""
+import os
+import sys
+import shutil
+import argparse
+from typing import Dict
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.artifacts import relayout_memory
+from core.memory import Memory
+
+ARTISTS_DIR = "artists"
+
+
+def place(moves: Dict[str, str]):
+    """Link or copy each old file to its new path; existing targets are kept."""
+    for old, new in moves.items():
+        if os.path.exists(new) or not os.path.exists(old):
+            continue
+        os.makedirs(os.path.dirname(new), exist_ok=True)
+        try:
+            os.link(old, new)
+        except OSError:
+            shutil.copy2(old, new)
+
+
+def remove_old(moves: Dict[str, str]):
+    for old in moves:
+        try:
+            os.remove(old)
+        except FileNotFoundError:
+            pass
+
+
+def migrate(artists_dir: str, dry_run: bool = False):
+    """Returns (artists changed, creations changed, files moved)."""
+    artists = creations = files = 0
+    for name in sorted(os.listdir(artists_dir)):
+        memory_path = os.path.join(artists_dir, name, "memory.json")
+        if not os.path.exists(memory_path):
+            continue
+        memory = Memory(memory_path)
+        changed, moves = relayout_memory(memory, os.path.dirname(memory_path))
+        if not changed:
+            continue
+        artists += 1
+        creations += changed
+        files += len(moves)
+        if not dry_run:
+            place(moves)
+            memory._save()
+            remove_old(moves)
+    return artists, creations, files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move art files into the sharded art/xx/yy/ layout")
+    parser.add_argument("--artists-dir", default=ARTISTS_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without moving or saving")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.artists_dir):
+        sys.exit(f"No artists directory at {args.artists_dir}")
+    artists, creations, files = migrate(args.artists_dir, args.dry_run)
+    verb = "Would move" if args.dry_run else "Moved"
+    print(f"{verb} {files} files for {creations} creations across {artists} artists")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+One-time migration: give every existing SVG or image creation a structured
+artifact record (kind, path, size, hash, dimensions) so that the viewer no
+longer has to parse "[SVG Created: ...]" markers or probe for files. Safe to
+run again; creations that already have a record are left alone.
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.artifacts import migrate_memory
+from core.memory import Memory
+
+ARTISTS_DIR = "artists"
+
+
+def migrate(artists_dir: str, dry_run: bool = False):
+    """Returns (artists changed, creations changed, records for missing files)."""
+    artists = creations = missing = 0
+    for name in sorted(os.listdir(artists_dir)):
+        memory_path = os.path.join(artists_dir, name, "memory.json")
+        if not os.path.exists(memory_path):
+            continue
+        memory = Memory(memory_path)
+        pending = [c for c in memory.creations if "artifact" not in c]
+        changed = migrate_memory(memory, os.path.dirname(memory_path))
+        if not changed:
+            continue
+        artists += 1
+        creations += changed
+        missing += sum(1 for c in pending if c.get("artifact", {}).get("missing"))
+        if not dry_run:
+            memory._save()
+    return artists, creations, missing
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add artifact records to existing creations")
+    parser.add_argument("--artists-dir", default=ARTISTS_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without saving")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.artists_dir):
+        sys.exit(f"No artists directory at {args.artists_dir}")
+    artists, creations, missing = migrate(args.artists_dir, args.dry_run)
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"{verb} {creations} creations across {artists} artists ({missing} with missing files)")
@@ -1,7 +1,8 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 import os
 import sys
 import json
+import time
 import threading
 import random
 
@@ -10,17 +11,45 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from core.artist_manager import ArtistManager
 from core.critique import CritiqueService
+from core.memory import Memory
+from core.search import SearchIndex, DEFAULT_PER_PAGE
+from core.prompts import DEFAULT_MEMORY_TOKENS
+from core.stats import StatsStore
+from core.singleflight import model_calls
+from core import trace, spans, dedup
 from skills.text_gen import TextGenerationSkill
 from skills.image_gen import ImageGenerationSkill
 from skills.svg_gen import VisualGenerationSkill
 import generate_viewer_data
 
 app = Flask(__name__)
+# Generate and self-critique in one model call (see Skill.perform_and_critique)
+app.config.setdefault("FUSED_GENERATION", False)
+app.config.setdefault("SVGZ", False)
+# Near-duplicate handling for new works: None (off), "flag" or "skip" (see core.dedup)
+app.config.setdefault("DEDUP", None)
+app.config.setdefault("DEDUP_THRESHOLD", dedup.DEFAULT_THRESHOLD)
+# Tokens of recalled past work quoted in generation prompts; 0 turns recall off (see core.recall)
+app.config.setdefault("MEMORY_TOKENS", DEFAULT_MEMORY_TOKENS)
+# Seconds between scans for artists changed by other processes; this server's own writes are indexed as they happen
+app.config.setdefault("SEARCH_SYNC_SECONDS", 30.0)
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
 # Initialize services
 artist_manager = ArtistManager()
-critique_service = CritiqueService()
+critique_service = CritiqueService(coalesce=True)
+search_index = None
+search_synced_at = None
+# Guards opening search_index and deciding when to sync it
+search_lock = threading.Lock()
+stats_store = None
+# Guards opening stats_store
+stats_lock = threading.Lock()
+# (artists_dir, artist) -> core.dedup.DuplicateIndex
+duplicate_indexes = {}
+# Guards duplicate_indexes; each index is caught up under its own artist's lock
+duplicate_lock = threading.Lock()
+duplicate_artist_locks = {}
 
 @app.route('/')
 def index():
@@ -32,16 +61,221 @@ def serve_static(path):
     print(f"DEBUG: Serving static file. Request path: {path}")
     print(f"DEBUG: Full resolved path: {full_path}")
     print(f"DEBUG: File exists? {os.path.exists(full_path)}")
+    if path.endswith(".svg") and "gzip" in request.headers.get("Accept-Encoding", "") and os.path.isfile(full_path + "z"):
+        # Precompressed copy written by VisualGenerationSkill(svgz=True)
+        response = send_from_directory(BASE_DIR, path + "z", mimetype="image/svg+xml")
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
     return send_from_directory(BASE_DIR, path)
 
 @app.route('/api/artists')
 def get_artists():
     # Regenerate data to ensure it's fresh
-    generate_viewer_data.generate_data()
+    generate_viewer_data.generate_data(artist_manager.snapshot)
     with open('artists_data.json', 'r') as f:
         return jsonify(json.load(f))
 
+def _artist_memory(artist_name):
+    """(artist_dir, memory) for a known artist, or None."""
+    if artist_name not in artist_manager.discover_artists():
+        return None
+    artist_dir = os.path.join(artist_manager.artists_dir, artist_name)
+    memory = generate_viewer_data.load_memory(artist_name, artist_dir, artist_manager.snapshot)
+    return artist_dir, memory if memory is not None else Memory(os.path.join(artist_dir, "memory.json"))
+
+@app.route('/api/manifest')
+def get_manifest():
+    """Artist list for the gallery; each artist's artworks are fetched from its own manifest."""
+    return jsonify({
+        "version": generate_viewer_data.MANIFEST_VERSION,
+        "artists": [
+            {"name": name, "manifest": f"/api/manifest/{name}"}
+            for name in sorted(artist_manager.discover_artists())
+        ]
+    })
+
+@app.route('/api/manifest/<artist_name>')
+def get_artist_manifest(artist_name):
+    found = _artist_memory(artist_name)
+    if found is None:
+        return jsonify({"error": f"Unknown artist: {artist_name}"}), 404
+    artist_dir, memory = found
+    return jsonify(generate_viewer_data.artist_manifest(artist_name, artist_dir, memory))
+
+@app.route('/api/artworks/<artist_name>/<int:artwork_id>')
+def get_artwork(artist_name, artwork_id):
+    found = _artist_memory(artist_name)
+    body = generate_viewer_data.artwork_body(artist_name, *found, artwork_id) if found is not None else None
+    if body is None:
+        return jsonify({"error": f"No artwork {artwork_id} for {artist_name}"}), 404
+    return jsonify(body)
+
+def _search_index():
+    """The search index for the current artists directory, opened on first use and kept current by Memory writes."""
+    global search_index, search_synced_at
+    index = search_index
+    if index is None or index.artists_dir != artist_manager.artists_dir:
+        with search_lock:
+            # Checked again: a concurrent first request may have opened it while this one waited
+            if search_index is None or search_index.artists_dir != artist_manager.artists_dir:
+                if search_index is not None:
+                    search_index.close()
+                search_index = SearchIndex(artist_manager.artists_dir)
+                search_index.attach()
+                search_synced_at = None
+            index = search_index
+    # Picks up artists changed by other processes (e.g. simulate.py); a scan stats every artist, so not per query
+    interval = app.config["SEARCH_SYNC_SECONDS"]
+    synced_at = search_synced_at
+    if synced_at is None or time.monotonic() - synced_at >= interval:
+        with search_lock:
+            if search_synced_at is None or time.monotonic() - search_synced_at >= interval:
+                index.sync()
+                search_synced_at = time.monotonic()
+    return index
+
+def _float_arg(name):
+    value = request.args.get(name)
+    return None if value in (None, "") else float(value)
+
+@app.route('/api/search')
+def search():
+    """
+    Full-text search over creations and critiques. Parameters: q, artist,
+    critic, kind (creation or critique), min_score, max_score, since, until
+    (Unix timestamps), page, per_page and total=1 (count every match of a
+    broad query).
+    """
+    try:
+        filters = {name: _float_arg(name) for name in ("min_score", "max_score", "since", "until")}
+        page = int(request.args.get("page", 1))
+        per_page = int(request.args.get("per_page", DEFAULT_PER_PAGE))
+    except ValueError as e:
+        return jsonify({"error": f"Bad parameter: {e}"}), 400
+    kind = request.args.get("kind") or None
+    if kind not in (None, "creation", "critique"):
+        return jsonify({"error": "kind must be creation or critique"}), 400
+    found = _search_index().search(request.args.get("q", ""), artist=request.args.get("artist") or None,
+                                   critic=request.args.get("critic") or None, kind=kind,
+                                   page=page, per_page=per_page, total=request.args.get("total") == "1", **filters)
+    for result in found["results"]:
+        result["url"] = generate_viewer_data.body_url(result["artist"], result["creation"])
+    return jsonify(found)
+
+def _stats_store():
+    """Running per-artist statistics for the current artists directory, updated by Memory writes."""
+    global stats_store
+    store = stats_store
+    if store is None or store.artists_dir != artist_manager.artists_dir:
+        with stats_lock:
+            # Checked again: a concurrent first request may have opened it while this one waited
+            if stats_store is None or stats_store.artists_dir != artist_manager.artists_dir:
+                if stats_store is not None:
+                    stats_store.detach()
+                stats_store = StatsStore(artist_manager.artists_dir)
+                stats_store.attach()
+            store = stats_store
+    return store
+
+@app.route('/api/stats')
+def get_stats():
+    """Score, critic and concept statistics for every artist (add ?series=1 for the hourly and daily series)."""
+    store = _stats_store()
+    series = request.args.get("series") in ("1", "true")
+    artists = {}
+    for name in sorted(artist_manager.discover_artists()):
+        stats = store.get(name)
+        if stats is not None:
+            artists[name] = stats.summary(series=series, top_concepts=10)
+    return jsonify({"artists": artists})
+
+@app.route('/api/stats/<artist_name>')
+def get_artist_stats(artist_name):
+    stats = _stats_store().get(artist_name) if artist_name in artist_manager.discover_artists() else None
+    if stats is None:
+        return jsonify({"error": f"No stats for {artist_name}"}), 404
+    return jsonify(stats.summary())
+
+def _duplicates(artist_name, memory, artist_dir):
+    """The artist's near-duplicate index, caught up with memory, or None if detection is off."""
+    mode = app.config["DEDUP"]
+    if not mode:
+        return None
+    key = (artist_manager.artists_dir, artist_name)
+    with duplicate_lock:
+        index = duplicate_indexes.get(key)
+        if index is None or (index.mode, index.threshold) != (mode, app.config["DEDUP_THRESHOLD"]):
+            index = duplicate_indexes[key] = dedup.DuplicateIndex(app.config["DEDUP_THRESHOLD"], mode)
+        artist_lock = duplicate_artist_locks.setdefault(key, threading.Lock())
+    # Catching up may read many SVG files; other artists' requests need not wait for it
+    with artist_lock:
+        index.catch_up(memory, artist_dir)
+    return index
+
+def _skipped(result):
+    dedup.discard(result)
+    return {"success": True, "skipped": True, "near_duplicate": result["near_duplicate"],
+            "message": "Skipped a near-duplicate of an earlier work"}
+
+@app.route('/api/duplicates')
+def get_duplicates():
+    """Near-duplicates flagged or skipped per artist since startup, and the model calls that saved."""
+    with duplicate_lock:
+        artists = {name: index.counts() for (artists_dir, name), index in duplicate_indexes.items()
+                   if artists_dir == artist_manager.artists_dir}
+    return jsonify({"mode": app.config["DEDUP"], "threshold": app.config["DEDUP_THRESHOLD"], "artists": artists})
+
+@spans.traced("generation.complete")
+def _complete_generation(artist_name, skill, result, personality, memory, artist_dir, critique=None):
+    """Self-critique a finished creation (unless already done), then persist it and evolve the artist."""
+    # Self-critique
+    if critique is None:
+        critique = skill.critique(result["content"], personality)
+    
+    # Update memory
+    metadata = {"prompt": result["prompt_used"], "concepts": list(personality.concepts)}
+    memory.add_creation(result["content"], dedup.creation_metadata(metadata, result), result.get("artifact"))
+    memory.add_critique(len(memory.creations) - 1, critique["critique"], critique["score"], critic_name=artist_name)
+    
+    # Update personality
+    experience = {
+        "type": "critique",
+        "score": critique["score"],
+        "sentiment": 1 if critique["score"] > 0.5 else -1
+    }
+    personality.evolve(experience)
+    artist_manager.save_artist(artist_name, {"personality": personality, "dir": artist_dir})
+    return critique
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _sse_chunks(fragments):
+    """Relay a skill's streamed fragments as 'chunk' events; returns what the stream returns."""
+    while True:
+        try:
+            fragment = next(fragments)
+        except StopIteration as done:
+            return done.value
+        yield _sse("chunk", {"text": fragment})
+
+@app.route('/api/metrics')
+def get_metrics():
+    return jsonify({"model_calls": model_calls.stats()})
+
+@app.route('/api/spans')
+def get_spans():
+    """Per-phase timings since startup (run with --spans), or the Chrome trace with ?format=chrome."""
+    tracer = spans.active()
+    if tracer is None:
+        return jsonify({"error": "Span tracing is off; start the server with --spans PATH"}), 404
+    if request.args.get("format") == "chrome":
+        return jsonify(tracer.chrome_trace())
+    return jsonify({"phases": tracer.aggregate(), "dropped_spans": tracer.dropped})
+
 @app.route('/api/generate', methods=['POST'])
+@spans.traced("api.generate")
 def generate_art():
     data = request.json
     artist_name = data.get('artist')
@@ -61,36 +295,25 @@ def generate_art():
             "personality": personality,
             "goal": goal,
             "memory": memory,
-            "artist_dir": artist_dir
+            "artist_dir": artist_dir,
+            "duplicates": _duplicates(artist_name, memory, artist_dir)
         }
         
         skill_type = random.choice(["text", "image", "svg"])
+        fused = app.config["FUSED_GENERATION"]
         
         if skill_type == "text":
-            skill = TextGenerationSkill()
+            skill = TextGenerationSkill(fused=fused, memory_tokens=app.config["MEMORY_TOKENS"])
         elif skill_type == "image":
             skill = ImageGenerationSkill()
         else:
-            skill = VisualGenerationSkill()
+            skill = VisualGenerationSkill(svgz=app.config["SVGZ"])
             
         print(f"Generating {skill_type} for {artist_name}...")
-        result = skill.perform(context)
-        
-        # Self-critique
-        critique = skill.critique(result["content"], personality)
-        
-        # Update memory
-        memory.add_creation(result["content"], {"prompt": result["prompt_used"]})
-        memory.add_critique(len(memory.creations) - 1, critique["critique"], critique["score"], critic_name=artist_name)
-        
-        # Update personality
-        experience = {
-            "type": "critique",
-            "score": critique["score"],
-            "sentiment": 1 if critique["score"] > 0.5 else -1
-        }
-        personality.evolve(experience)
-        artist_manager.save_artist(artist_name, {"personality": personality, "dir": artist_dir})
+        result, critique = skill.perform_and_critique(context)
+        if dedup.is_skipped(result):
+            return jsonify(dict(_skipped(result), type=skill_type))
+        _complete_generation(artist_name, skill, result, personality, memory, artist_dir, critique=critique)
         
         return jsonify({
             "success": True, 
@@ -102,7 +325,57 @@ def generate_art():
         print(f"Error generating art: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/generate/stream', methods=['POST'])
+def generate_art_stream():
+    """
+    Stream text generation as Server-Sent Events.
+    Events: 'chunk' for each text fragment, then 'done' once self-critique
+    and persistence have finished (or 'error').
+    """
+    data = request.json or {}
+    artist_name = data.get('artist')
+    
+    if not artist_name:
+        return jsonify({"error": "Artist name required"}), 400
+        
+    try:
+        personality, memory, artist_dir = artist_manager.load_artist(artist_name)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 404
+    
+    goal = artist_manager.get_artist_goal(artist_name)
+    context = {
+        "personality": personality,
+        "goal": goal,
+        "memory": memory,
+        "artist_dir": artist_dir,
+        "duplicates": _duplicates(artist_name, memory, artist_dir)
+    }
+    
+    def events():
+        with spans.span("api.generate.stream"):
+            skill = TextGenerationSkill(fused=app.config["FUSED_GENERATION"], memory_tokens=app.config["MEMORY_TOKENS"])
+            try:
+                result, critique = yield from _sse_chunks(skill.stream_and_critique(context))
+                if dedup.is_skipped(result):
+                    yield _sse("done", dict(_skipped(result), type="text"))
+                    return
+                critique = _complete_generation(artist_name, skill, result, personality, memory, artist_dir, critique=critique)
+                yield _sse("done", {
+                    "success": True,
+                    "type": "text",
+                    "score": critique["score"],
+                    "critique": critique["critique"]
+                })
+            except Exception as e:
+                print(f"Error streaming art: {e}")
+                yield _sse("error", {"error": str(e)})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.route('/api/critique', methods=['POST'])
+@spans.traced("api.critique")
 def run_critique():
     data = request.json
     critic_name = data.get('critic')
@@ -123,17 +396,18 @@ def run_critique():
         if not subject["memory"].creations:
              return jsonify({"error": "Subject has no work to critique"}), 404
              
-        work_idx = random.randrange(len(subject["memory"].creations))
+        work_idx = dedup.pick_critique_target(subject["memory"].creations)
         random_work = subject["memory"].creations[work_idx]
             
         # Perform critique
-        result = critique_service.generate_critique(critic["personality"], random_work.get("content", ""))
+        result = critique_service.generate_critique(critic["personality"], random_work.get("content", ""), critic["memory"])
         
         # Process results
         critic_changed, subject_changed = critique_service.process_critique_result(critic, subject, result)
         
         # Save critique to memory
-        critique_service.save_critique_to_memory(subject, critic_name, result['critique'], result['score'], creation_index=work_idx)
+        critique_service.save_critique_to_memory(subject, critic_name, result['critique'], result['score'], creation_index=work_idx,
+                                                 concepts=result.get('new_concepts'))
         
         # Save states
         if critic_changed:
@@ -154,5 +428,33 @@ def run_critique():
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Starving Artist gallery server")
+    parser.add_argument("--fused", action="store_true", help="Generate and self-critique poems in a single model call")
+    parser.add_argument("--svgz", action="store_true", help="Also save a gzipped .svgz of each SVG and serve it to browsers that accept gzip")
+    parser.add_argument("--dedup", choices=dedup.MODES,
+                        help="Flag near-duplicates of an artist's earlier works, or skip them before self-critique")
+    parser.add_argument("--dedup-threshold", type=float, default=dedup.DEFAULT_THRESHOLD,
+                        help="Similarity (0-1) at which a work counts as a near-duplicate")
+    parser.add_argument("--memory-tokens", type=int, default=DEFAULT_MEMORY_TOKENS,
+                        help="Quote up to this many tokens of relevant past work in prompts (default 0, off)")
+    parser.add_argument("--snapshot", nargs="?", const="", metavar="PATH",
+                        help="Start from the world snapshot (default: artists/world.snapshot)")
+    trace.add_arguments(parser)
+    spans.add_arguments(parser)
+    args = parser.parse_args()
+    if trace.start_from_args(args):
+        # Its skill was created at import time, before the trace started
+        critique_service = CritiqueService(coalesce=True)
+    spans.start_from_args(args)
+    critique_service.memory_tokens = args.memory_tokens
+    app.config["FUSED_GENERATION"] = args.fused
+    app.config["SVGZ"] = args.svgz
+    app.config["DEDUP"] = args.dedup
+    app.config["DEDUP_THRESHOLD"] = args.dedup_threshold
+    app.config["MEMORY_TOKENS"] = args.memory_tokens
+    if args.snapshot is not None and not artist_manager.use_snapshot(args.snapshot or None):
+        print("No world snapshot found; reading artist files directly.")
+    
     print("Starting Starving Artist Server on port 8000...")
     app.run(port=8000, debug=False)
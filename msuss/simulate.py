@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Headless batch simulation: run many artists for many generation cycles
+without any prompts, then print throughput and personality drift statistics.
+"""
+import os
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.artist_manager import ArtistManager
+from core.personality import Personality
+from core.memory import Memory
+from core.audience import make_audience, AUDIENCES
+from core import dedup
+from core.prompts import DEFAULT_MEMORY_TOKENS
+from skills.text_gen import TextGenerationSkill
+from skills.svg_gen import VisualGenerationSkill
+from skills.stub_model import StubModel
+
+ARTISTS_DIR = "artists"
+
+AESTHETICS = ["melancholy", "glitch horror", "cosmic minimalism", "brutalist", "pastoral", "surrealist"]
+CONCEPT_POOL = ["entropy", "digital", "void", "noise", "corruption", "infinity", "light", "geometry",
+                "silence", "flesh", "machine", "decay", "recursion", "static", "tide", "ash"]
+EMOTIONS = ["melancholy", "joy", "anger", "fear", "awe"]
+
+
+class SimulationStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.model_calls = 0
+        self.cycles = 0
+        self.persistence_seconds = 0.0
+        self.duplicates = {"flagged": 0, "skipped": 0, "calls_saved": 0}
+
+    def add(self, model_calls=0, cycles=0, persistence_seconds=0.0, duplicates=None):
+        with self._lock:
+            self.model_calls += model_calls
+            self.cycles += cycles
+            self.persistence_seconds += persistence_seconds
+            for key, count in (duplicates or {}).items():
+                self.duplicates[key] += count
+
+
+class CountingModel:
+    """Delegates to a model and counts generate_content calls."""
+
+    def __init__(self, model, stats: SimulationStats):
+        self.model = model
+        self.stats = stats
+        self.model_name = getattr(model, "model_name", type(model).__name__)
+
+    def generate_content(self, *args, **kwargs):
+        self.stats.add(model_calls=1)
+        return self.model.generate_content(*args, **kwargs)
+
+
+def make_synthetic_artists(artists_dir: str, count: int, seed: int) -> List[str]:
+    """Create `count` randomized artists in artists_dir. Returns their names."""
+    rng = random.Random(f"{seed}:synthetic")
+    os.makedirs(artists_dir, exist_ok=True)
+    names = []
+    for i in range(count):
+        name = f"synth{i:05d}"
+        artist_dir = os.path.join(artists_dir, name)
+        os.makedirs(artist_dir, exist_ok=True)
+
+        traits = {t: round(rng.random(), 2) for t in ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism"]}
+        p = Personality(name.capitalize(), traits, {"aesthetic": rng.choice(AESTHETICS), "medium": rng.choice(["poetry", "visual"])}, [])
+        p.emotions = {e: round(rng.random(), 2) for e in EMOTIONS}
+        p.concepts = rng.sample(CONCEPT_POOL, 4)
+        p.confidence = round(rng.uniform(0.3, 0.9), 2)
+        p.save(os.path.join(artist_dir, "personality.json"))
+
+        Memory(os.path.join(artist_dir, "memory.json"))
+        with open(os.path.join(artist_dir, "goal.txt"), "w") as f:
+            f.write(f"Make {p.preferences['aesthetic']} art about {p.concepts[0]}")
+        names.append(name)
+    return names
+
+
+def snapshot(personality: Personality) -> Dict[str, Any]:
+    return {
+        "confidence": personality.confidence,
+        "emotions": dict(personality.emotions),
+        "mood": personality.mood,
+        "concepts": list(personality.concepts)
+    }
+
+
+def drift(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    keys = sorted(set(before["emotions"]) | set(after["emotions"]))
+    return {
+        "confidence_delta": after["confidence"] - before["confidence"],
+        "emotion_distance": sum(abs(after["emotions"].get(k, 0.0) - before["emotions"].get(k, 0.0)) for k in keys),
+        "mood_changed": before["mood"] != after["mood"],
+        "concepts_gained": len(set(after["concepts"]) - set(before["concepts"]))
+    }
+
+
+def simulate_artist(manager: ArtistManager, name: str, cycles: int, options: Dict[str, Any], stats: SimulationStats) -> Dict[str, Any]:
+    """Run all cycles for one artist. Cycles of one artist are sequential; artists run concurrently."""
+    rng = random.Random(f"{options['seed']}:{name}")
+    personality, memory, artist_dir = manager.load_artist(name)
+    personality.rng = rng
+    goal = manager.get_artist_goal(name)
+    audience = make_audience(options["audience"], rng=rng)
+
+    skills = [TextGenerationSkill(fused=options["fused"], memory_tokens=options["memory_tokens"]), VisualGenerationSkill()]
+    for skill in skills:
+        if options["offline"]:
+            skill.model = StubModel(latency=options["latency"], seed=rng.random())
+        if skill.model is not None:
+            skill.model = CountingModel(skill.model, stats)
+    text_skill, svg_skill = skills
+
+    duplicates = None
+    if options["dedup"]:
+        duplicates = dedup.DuplicateIndex.from_memory(memory, artist_dir, options["dedup_threshold"], options["dedup"])
+
+    before = snapshot(personality)
+    personality_path = os.path.join(artist_dir, "personality.json")
+    for _ in range(cycles):
+        skill = text_skill if rng.random() < options["text_ratio"] else svg_skill
+        context = {"personality": personality, "goal": goal, "memory": memory, "artist_dir": artist_dir,
+                   "duplicates": duplicates}
+        result, critique = skill.perform_and_critique(context)
+        if dedup.is_skipped(result):
+            dedup.discard(result)
+            stats.add(cycles=1)
+            continue
+
+        start = time.perf_counter()
+        metadata = {"prompt": result["prompt_used"], "concepts": list(personality.concepts)}
+        memory.add_creation(result["content"], dedup.creation_metadata(metadata, result), result.get("artifact"))
+        if duplicates is not None:
+            duplicates.add(len(memory.creations) - 1, result)
+        memory.add_critique(len(memory.creations) - 1, critique["critique"], critique["score"], critic_name=name)
+        persisted = time.perf_counter() - start
+
+        personality.evolve({
+            "type": "critique",
+            "score": critique["score"],
+            "sentiment": 1 if critique["score"] > 0.5 else -1
+        })
+
+        feedback = audience.react(name, result, critique)
+        start = time.perf_counter()
+        if feedback:
+            personality.evolve(feedback)
+            memory.add_experience(f"User feedback: {feedback['notes']}", ["feedback"], 1 if feedback["liked"] else -1)
+        personality.save(personality_path)
+        persisted += time.perf_counter() - start
+
+        stats.add(cycles=1, persistence_seconds=persisted)
+
+    if duplicates is not None:
+        stats.add(duplicates=duplicates.counts())
+    return drift(before, snapshot(personality))
+
+
+def summarize(drifts: List[Dict[str, Any]], stats: SimulationStats, elapsed: float, num_artists: int) -> Dict[str, Any]:
+    def describe(values):
+        return {
+            "mean": statistics.fmean(values),
+            "stdev": statistics.pstdev(values),
+            "min": min(values),
+            "max": max(values)
+        }
+
+    return {
+        "artists": num_artists,
+        "cycles": stats.cycles,
+        "elapsed_seconds": elapsed,
+        "cycles_per_second": stats.cycles / elapsed if elapsed else 0.0,
+        "model_calls": stats.model_calls,
+        "model_calls_per_cycle": stats.model_calls / stats.cycles if stats.cycles else 0.0,
+        "persistence_seconds": stats.persistence_seconds,
+        "persistence_ms_per_cycle": stats.persistence_seconds / stats.cycles * 1000 if stats.cycles else 0.0,
+        "near_duplicates": dict(stats.duplicates),
+        "drift": {
+            "confidence_delta": describe([d["confidence_delta"] for d in drifts]),
+            "emotion_distance": describe([d["emotion_distance"] for d in drifts]),
+            "mood_changes": sum(1 for d in drifts if d["mood_changed"]),
+            "concepts_gained": describe([d["concepts_gained"] for d in drifts])
+        }
+    }
+
+
+def run_simulation(artists_dir: str, cycles: int, num_artists: int = None, seed: int = 0, concurrency: int = 1,
+                   audience: str = "random", offline: bool = False, fused: bool = False, latency: float = 0.0,
+                   text_ratio: float = 0.7, verbose: bool = False, dedup_mode: str = None,
+                   dedup_threshold: float = dedup.DEFAULT_THRESHOLD,
+                   memory_tokens: int = DEFAULT_MEMORY_TOKENS) -> Dict[str, Any]:
+    manager = ArtistManager(artists_dir, record_evolution=True)
+    names = sorted(manager.discover_artists())
+    if num_artists is not None:
+        names = names[:num_artists]
+    if not names:
+        raise ValueError(f"No artists found in {artists_dir}")
+
+    options = {"seed": seed, "audience": audience, "offline": offline, "fused": fused,
+               "latency": latency, "text_ratio": text_ratio, "dedup": dedup_mode, "dedup_threshold": dedup_threshold,
+               "memory_tokens": memory_tokens}
+    stats = SimulationStats()
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        drifts = list(pool.map(lambda name: simulate_artist(manager, name, cycles, options, stats), names))
+    elapsed = time.perf_counter() - start
+
+    return summarize(drifts, stats, elapsed, len(names))
+
+
+def print_summary(summary: Dict[str, Any]):
+    d = summary["drift"]
+    print("\n=== SIMULATION SUMMARY ===")
+    print(f"Artists: {summary['artists']}  Cycles: {summary['cycles']}  Wall time: {summary['elapsed_seconds']:.2f}s")
+    print(f"Throughput: {summary['cycles_per_second']:.2f} cycles/s")
+    print(f"Model calls: {summary['model_calls']} ({summary['model_calls_per_cycle']:.2f} per cycle)")
+    print(f"Persistence: {summary['persistence_seconds']:.3f}s summed across workers ({summary['persistence_ms_per_cycle']:.2f} ms per cycle)")
+    n = summary["near_duplicates"]
+    if n["flagged"] or n["skipped"]:
+        print(f"Near-duplicates: {n['flagged']} flagged, {n['skipped']} skipped ({n['calls_saved']} model calls saved)")
+    print("Personality drift:")
+    c = d["confidence_delta"]
+    print(f"  Confidence delta: mean {c['mean']:+.3f}, stdev {c['stdev']:.3f}, range [{c['min']:+.3f}, {c['max']:+.3f}]")
+    e = d["emotion_distance"]
+    print(f"  Emotion L1 distance: mean {e['mean']:.3f}, stdev {e['stdev']:.3f}, max {e['max']:.3f}")
+    print(f"  Mood changed: {d['mood_changes']}/{summary['artists']} artists")
+    print(f"  Concepts gained: mean {d['concepts_gained']['mean']:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a headless multi-artist simulation")
+    parser.add_argument("-n", "--artists", type=int, help="Number of artists to run (default: all found)")
+    parser.add_argument("-c", "--cycles", type=int, default=3, help="Generation cycles per artist")
+    parser.add_argument("--artists-dir", help=f"Artists directory (default: {ARTISTS_DIR}, or a temp dir with --synthetic)")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Create N randomized artists before running")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for all simulation randomness")
+    parser.add_argument("-j", "--concurrency", type=int, default=1, help="Artists simulated in parallel")
+    parser.add_argument("--audience", choices=sorted(AUDIENCES), default="random", help="Synthetic audience model")
+    parser.add_argument("--offline", action="store_true", help="Use the offline stub model instead of Gemini")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated model latency in seconds (offline only)")
+    parser.add_argument("--fused", action="store_true", help="Generate and self-critique poems in a single model call")
+    parser.add_argument("--text-ratio", type=float, default=0.7, help="Probability of text (vs SVG) per cycle")
+    parser.add_argument("--dedup", choices=dedup.MODES,
+                        help="Flag near-duplicates of an artist's earlier works, or skip them before self-critique")
+    parser.add_argument("--dedup-threshold", type=float, default=dedup.DEFAULT_THRESHOLD,
+                        help="Similarity (0-1) at which a work counts as a near-duplicate")
+    parser.add_argument("--memory-tokens", type=int, default=DEFAULT_MEMORY_TOKENS,
+                        help="Quote up to this many tokens of relevant past work in prompts (default 0, off)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the summary as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show per-cycle output")
+    args = parser.parse_args()
+
+    offline = args.offline
+    if not offline and not os.getenv("GEMINI_API_KEY"):
+        print("GEMINI_API_KEY not set; running offline with the stub model.")
+        offline = True
+
+    artists_dir = args.artists_dir
+    if args.synthetic:
+        artists_dir = artists_dir or tempfile.mkdtemp(prefix="simulation_")
+        make_synthetic_artists(artists_dir, args.synthetic, args.seed)
+        print(f"Created {args.synthetic} synthetic artists in {artists_dir}")
+    artists_dir = artists_dir or ARTISTS_DIR
+
+    summary = run_simulation(
+        artists_dir, args.cycles, num_artists=args.artists, seed=args.seed,
+        concurrency=args.concurrency, audience=args.audience, offline=offline,
+        fused=args.fused, latency=args.latency, text_ratio=args.text_ratio, verbose=args.verbose,
+        dedup_mode=args.dedup, dedup_threshold=args.dedup_threshold, memory_tokens=args.memory_tokens
+    )
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
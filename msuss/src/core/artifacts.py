@@ -0,0 +1,223 @@
+"""
+Structured records for the files behind visual creations.
+
+Skills that save an art file return an artifact record with the result, and
+Memory.add_creation stores it on the creation:
+
+    {"kind": "svg", "path": "art/cf/e8/art_1700000000123_9c41d07e.svg", "bytes": 2113,
+     "sha256": "...", "width": 400, "height": 400}
+
+path is relative to the artist directory and uses forward slashes; width and
+height are None when they cannot be read. Readers use resolve() and never
+need to parse the "[SVG Created: ...]" marker in the content or probe the
+disk. Creations saved before artifact records existed can be given one with
+migrate_memory() (see migrate_artifacts.py); until then resolve() falls back
+to the marker and the old art/-then-root lookup.
+
+Art files get collision-free ids, time-ordered with a random suffix
+(new_art_id()), and live two hashed levels below art/ so each directory
+stays small even with millions of files:
+
+    art/cf/e8/art_1700000000123_9c41d07e.svg
+
+Files saved in the old flat layout (art/art_1700000000.svg) keep resolving;
+relayout_memory() plans moving them into the sharded one (see
+migrate_art_layout.py).
+"""
+import os
+import re
+import time
+import struct
+import posixpath
+import hashlib
+import secrets
+from typing import Any, Callable, Dict, Optional, Tuple
+
+MARKERS = (("[Image Created:", "image"), ("[SVG Created:", "svg"))
+ART_DIR = "art"
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_SVG_TAG = re.compile(rb"<svg\b[^>]*>", re.IGNORECASE)
+_LENGTH = r"""\s{0}\s*=\s*["']\s*([0-9.]+)\s*(?:px)?\s*["']"""
+_VIEWBOX = re.compile(rb"""\sviewBox\s*=\s*["']\s*[-0-9.]+[\s,]+[-0-9.]+[\s,]+([0-9.]+)[\s,]+([0-9.]+)\s*["']""")
+
+
+def _number(value: bytes) -> Optional[float]:
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def svg_dimensions(data: bytes) -> Tuple[Optional[float], Optional[float]]:
+    """width and height from the root <svg> tag (absolute lengths, else the viewBox)."""
+    tag = _SVG_TAG.search(data)
+    if tag is None:
+        return None, None
+    tag = tag.group(0)
+    width = re.search(_LENGTH.format("width").encode(), tag)
+    height = re.search(_LENGTH.format("height").encode(), tag)
+    if width and height:
+        return _number(width.group(1)), _number(height.group(1))
+    view_box = _VIEWBOX.search(tag)
+    if view_box:
+        return _number(view_box.group(1)), _number(view_box.group(2))
+    return None, None
+
+
+def png_dimensions(data: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """width and height from a PNG's IHDR chunk."""
+    if len(data) < 24 or not data.startswith(_PNG_SIGNATURE) or data[12:16] != b"IHDR":
+        return None, None
+    return struct.unpack(">II", data[16:24])
+
+
+def artifact_record(kind: str, artist_dir: str, path: str, data: Optional[bytes] = None) -> Dict[str, Any]:
+    """The record for the file at path (inside artist_dir), reading it unless its bytes are given."""
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+    width, height = svg_dimensions(data) if kind == "svg" else png_dimensions(data)
+    return {
+        "kind": kind,
+        "path": os.path.relpath(path, artist_dir).replace(os.sep, "/"),
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "width": width,
+        "height": height
+    }
+
+
+def missing_record(kind: str, ref: str) -> Dict[str, Any]:
+    """Record for a creation whose file was already gone when it was migrated."""
+    return {"kind": kind, "path": ref, "missing": True}
+
+
+def new_art_id() -> str:
+    """A fresh art file id: millisecond timestamp (so ids sort by time) plus 32 random bits."""
+    return f"art_{time.time_ns() // 1_000_000:013d}_{secrets.token_hex(4)}"
+
+
+def art_ref(filename: str) -> str:
+    """Where an art file belongs, relative to the artist directory: art/<h0h1>/<h2h3>/filename, h from the file's stem."""
+    stem = filename.split(".", 1)[0]
+    digest = hashlib.sha1(stem.encode("utf-8")).hexdigest()
+    return f"{ART_DIR}/{digest[:2]}/{digest[2:4]}/{filename}"
+
+
+def new_art_path(artist_dir: str, extension: str) -> Tuple[str, str]:
+    """(reference, path) for a new art file with the given extension, its directory created."""
+    ref = art_ref(f"{new_art_id()}.{extension}")
+    path = os.path.join(artist_dir, *ref.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return ref, path
+
+
+def parse_marker(content: str) -> Optional[Tuple[str, str]]:
+    """(kind, reference) from a legacy "[SVG Created: ...]" / "[Image Created: ...]" content string."""
+    for marker, kind in MARKERS:
+        if marker in content:
+            # e.g. "art/art_*.png", or "art_*.svg" for older pieces
+            return kind, content.split(marker)[1].split("]")[0].strip()
+    return None
+
+
+def locate(artist_dir: str, ref: str, exists: Callable[[str], bool] = os.path.exists) -> Optional[str]:
+    """
+    The file a legacy reference points to: the reference itself, then the
+    file's place in the sharded layout (if it has been migrated), then the
+    artist directory.
+    """
+    path = os.path.join(artist_dir, *ref.split("/"))
+    if exists(path):
+        return path
+    filename = ref.rsplit("/", 1)[-1]
+    for path in (os.path.join(artist_dir, *art_ref(filename).split("/")), os.path.join(artist_dir, filename)):
+        if exists(path):
+            return path
+    return None
+
+
+def resolve(artist_dir: str, content: str, artifact: Optional[Dict[str, Any]] = None,
+            exists: Callable[[str], bool] = os.path.exists) -> Optional[Tuple[str, str, Optional[str]]]:
+    """
+    (kind, reference, path) for a creation backed by an art file, with path
+    None if the file is missing; None for plain text. Uses the creation's
+    artifact record when there is one, otherwise the content marker and
+    exists() probes.
+    """
+    if artifact is not None:
+        path = None if artifact.get("missing") else os.path.join(artist_dir, *artifact["path"].split("/"))
+        return artifact["kind"], artifact["path"], path
+    found = parse_marker(content)
+    if found is None:
+        return None
+    kind, ref = found
+    return kind, ref, locate(artist_dir, ref, exists)
+
+
+def migrate_memory(memory, artist_dir: str) -> int:
+    """Give every marker-only creation in memory an artifact record. Returns how many changed; does not save."""
+    changed = 0
+    for creation in memory.creations:
+        if "artifact" in creation:
+            continue
+        found = parse_marker(creation.get("content", ""))
+        if found is None:
+            continue
+        kind, ref = found
+        path = locate(artist_dir, ref)
+        creation["artifact"] = missing_record(kind, ref) if path is None else artifact_record(kind, artist_dir, path)
+        changed += 1
+    return changed
+
+
+def relayout_memory(memory, artist_dir: str) -> Tuple[int, Dict[str, str]]:
+    """
+    Point every art reference in memory (content markers, artifact and variant
+    paths) at the sharded layout. Returns (creations changed, {old path: new
+    path} of the files to move); moves nothing and does not save. File names
+    are kept, so references shared by several creations move together, and
+    files already in place, missing or clashing by name with another are left
+    alone.
+    """
+    moves: Dict[str, str] = {}
+    # New path -> the file moving there
+    claimed: Dict[str, str] = {}
+    changed = 0
+    for creation in memory.creations:
+        content = creation.get("content", "")
+        artifact = creation.get("artifact")
+        found = resolve(artist_dir, content, artifact)
+        if found is None or found[2] is None:
+            continue
+        kind, ref, path = found
+        filename = os.path.basename(path)
+        new_ref = art_ref(filename)
+        if ref == new_ref:
+            continue
+        new_path = os.path.join(artist_dir, *new_ref.split("/"))
+        if new_path in claimed and claimed[new_path] != path:
+            # Same file name in two places (art/ and the artist directory); leave the second where it is
+            continue
+        claimed[new_path] = path
+        if path != new_path:
+            moves[path] = new_path
+            if os.path.exists(path + "z"):
+                moves[path + "z"] = new_path + "z"
+        marker = parse_marker(content)
+        if marker is not None:
+            creation["content"] = content.replace(marker[1], new_ref, 1)
+        if artifact is not None:
+            artifact["path"] = new_ref
+            for variant in (artifact.get("variants") or {}).values():
+                # Derived files sit relative to their source (see core.derivatives)
+                old_variant = os.path.join(artist_dir, *variant["path"].split("/"))
+                relative = posixpath.relpath(variant["path"], posixpath.dirname(ref) or ".")
+                variant["path"] = posixpath.join(posixpath.dirname(new_ref), relative)
+                new_variant = os.path.join(artist_dir, *variant["path"].split("/"))
+                if new_variant != old_variant:
+                    moves[old_variant] = new_variant
+        changed += 1
+    return changed, moves
@@ -3,10 +3,22 @@ import json
 from typing import List, Dict, Tuple, Optional
 from core.personality import Personality
 from core.memory import Memory
+from core.snapshot import WorldSnapshot
+from core.evolution_log import EvolutionLog
 
 class ArtistManager:
-    def __init__(self, artists_dir: str = "artists"):
+    def __init__(self, artists_dir: str = "artists", snapshot: Optional[WorldSnapshot] = None, record_evolution: bool = False):
         self.artists_dir = artists_dir
+        # Optional world snapshot to cold-start from; artists changed since it was written are read from disk
+        self.snapshot = snapshot
+        # Log every personality change to <artist>/evolution.jsonl (see core.evolution_log).
+        # Off by default so that readers and the server leave artist directories alone.
+        self.record_evolution = record_evolution
+
+    def use_snapshot(self, path: Optional[str] = None) -> bool:
+        """Load the world snapshot (default: <artists_dir>/world.snapshot). Returns False if there is none."""
+        self.snapshot = WorldSnapshot.open(self.artists_dir, path)
+        return self.snapshot is not None
 
     def discover_artists(self) -> List[str]:
         """Discover all available artists by scanning the artists directory."""
@@ -18,7 +30,7 @@ class ArtistManager:
             artist_path = os.path.join(self.artists_dir, name)
             if os.path.isdir(artist_path):
                 personality_path = os.path.join(artist_path, "personality.json")
-                if os.path.exists(personality_path):
+                if (self.snapshot is not None and name in self.snapshot) or os.path.exists(personality_path):
                     artists.append(name)
         
         return artists
@@ -29,8 +41,16 @@ class ArtistManager:
         if not os.path.exists(artist_dir):
             raise FileNotFoundError(f"Artist directory not found: {artist_dir}")
             
-        personality = Personality.load(os.path.join(artist_dir, "personality.json"))
-        memory = Memory(os.path.join(artist_dir, "memory.json"))
+        personality = memory = None
+        if self.snapshot is not None:
+            personality = self.snapshot.personality(name, artist_dir)
+            memory = self.snapshot.memory(name, artist_dir)
+        if personality is None:
+            personality = Personality.load(os.path.join(artist_dir, "personality.json"))
+        if memory is None:
+            memory = Memory(os.path.join(artist_dir, "memory.json"))
+        if self.record_evolution:
+            EvolutionLog(artist_dir).attach(personality)
         return personality, memory, artist_dir
 
     def save_artist(self, name: str, artist_data: Dict) -> None:
@@ -47,6 +67,10 @@ class ArtistManager:
     def get_artist_goal(self, name: str) -> str:
         """Load an artist's goal."""
         artist_dir = os.path.join(self.artists_dir, name)
+        if self.snapshot is not None:
+            goal = self.snapshot.goal(name, artist_dir)
+            if goal is not None:
+                return goal
         goal_path = os.path.join(artist_dir, "goal.txt")
         if os.path.exists(goal_path):
             with open(goal_path, "r") as f:
@@ -0,0 +1,93 @@
+import random
+from typing import Any, Dict, Optional
+
+
+class Audience:
+    """
+    Reacts to a finished piece. react() returns a feedback experience
+    ({"type": "feedback", "liked": bool, "notes": str}) or None to skip.
+    """
+
+    def react(self, artist_name: str, result: Dict[str, Any], critique: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class InteractiveAudience(Audience):
+    """Asks a human on the terminal, as main.py always has."""
+
+    def react(self, artist_name, result, critique):
+        user_input = input("Did you like this? (y/n) [Enter to skip]: ").strip().lower()
+        if user_input not in ['y', 'n']:
+            return None
+        notes = input("Any notes? ").strip()
+        return {"type": "feedback", "liked": user_input == 'y', "notes": notes}
+
+
+class SilentAudience(Audience):
+    """Never gives feedback."""
+
+    def react(self, artist_name, result, critique):
+        return None
+
+
+class RandomAudience(Audience):
+    """
+    Responds to a fraction of pieces and likes them with a fixed probability,
+    regardless of quality.
+    """
+
+    NOTES = ["", "more of this", "too dark", "I felt the void", "noise for noise's sake", "beautiful"]
+
+    def __init__(self, response_rate: float = 0.5, like_rate: float = 0.5, rng: Any = random):
+        self.response_rate = response_rate
+        self.like_rate = like_rate
+        self.rng = rng
+
+    def react(self, artist_name, result, critique):
+        if self.rng.random() >= self.response_rate:
+            return None
+        return {
+            "type": "feedback",
+            "liked": self.rng.random() < self.like_rate,
+            "notes": self.rng.choice(self.NOTES)
+        }
+
+
+class ScoreAudience(Audience):
+    """
+    Likes pieces whose self-critique score clears a threshold, with some
+    noise so that borderline pieces can go either way.
+    """
+
+    def __init__(self, threshold: float = 0.7, noise: float = 0.1, response_rate: float = 1.0, rng: Any = random):
+        self.threshold = threshold
+        self.noise = noise
+        self.response_rate = response_rate
+        self.rng = rng
+
+    def react(self, artist_name, result, critique):
+        if self.rng.random() >= self.response_rate:
+            return None
+        perceived = critique.get("score", 0.5) + self.rng.uniform(-self.noise, self.noise)
+        liked = perceived >= self.threshold
+        return {
+            "type": "feedback",
+            "liked": liked,
+            "notes": "" if liked else "not quite there"
+        }
+
+
+AUDIENCES = {
+    "silent": SilentAudience,
+    "random": RandomAudience,
+    "score": ScoreAudience,
+}
+
+
+def make_audience(kind: str, rng: Any = random) -> Audience:
+    """Build a synthetic audience by name ('silent', 'random' or 'score')."""
+    if kind not in AUDIENCES:
+        raise ValueError(f"Unknown audience: {kind} (choose from {', '.join(AUDIENCES)})")
+    if kind == "silent":
+        return SilentAudience()
+    return AUDIENCES[kind](rng=rng)
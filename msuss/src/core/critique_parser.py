@@ -0,0 +1,220 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+EMOTIONS = ("joy", "anger", "melancholy", "fear", "awe")
+
+# Emotional impact is recorded as a fixed nudge per emotion mentioned.
+EMOTION_DELTA = 0.1
+
+# Field headers as the model writes them, e.g. "Score: 0.8", "**Score:** 0.8",
+# "## New Concepts: a, b", "- Emotional Impact: ...". Markdown around the label
+# and colon is skipped so that the section starts at the value.
+_HEADER_RE = re.compile(
+    r"(?<![A-Za-z])(score|critique|new concepts|emotional impact)[ \t*_]*:[ \t*_]*",
+    re.IGNORECASE,
+)
+_SCORE_RE = re.compile(r"(\d+(?:\.\d+)?|\.\d+)(?:\s*/\s*(\d+(?:\.\d+)?))?")
+_EMOTION_RE = re.compile(r"\b(" + "|".join(EMOTIONS) + r")", re.IGNORECASE)
+_CONCEPT_SPLIT_RE = re.compile(r"[,\n;]")
+_BULLET_RE = re.compile(r"^(?:[-*\u2022]|\d+[.)])\s+")
+_CODE_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+# Markdown left dangling before the next header ("...text\n## New Concepts:")
+_SECTION_TAIL = " \t\r\n#*_->"
+
+_FIELD_KEYS = {
+    "score": "score",
+    "critique": "critique",
+    "new concepts": "new_concepts",
+    "emotional impact": "emotional_impact",
+}
+
+# How far into the score section the number may appear ("Score: [0.8]", "Score:\n0.8").
+_SCORE_WINDOW = 24
+
+JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# Section markers for fused generate-and-critique responses.
+ARTWORK_MARKER = "=== ARTWORK ==="
+CRITIQUE_MARKER = "=== SELF-CRITIQUE ==="
+_MARKER_RE = re.compile(r"^[ \t]*=+[ \t]*(artwork|self-critique)[ \t]*=+[ \t]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def output_format(fields: Sequence[str] = ("score", "critique"), structured: bool = False) -> List[str]:
+    """Prompt lines describing the expected response format."""
+    if structured:
+        schema = {
+            "score": '"score": <0.0 to 1.0>',
+            "critique": '"critique": "<your thoughts>"',
+            "new_concepts": '"new_concepts": ["<any new ideas this sparked>"]',
+            "emotional_impact": '"emotional_impact": ["<emotions this evoked: ' + "|".join(EMOTIONS) + '>"]',
+        }
+        return ["Respond with a single JSON object:", "{" + ", ".join(schema[f] for f in fields) + "}"]
+
+    labels = {
+        "score": "Score: [0.0 to 1.0]",
+        "critique": "Critique: [Your thoughts]",
+        "new_concepts": "New Concepts: [Any new ideas this sparked, comma-separated]",
+        "emotional_impact": "Emotional Impact: [How this affected your emotional state]",
+    }
+    return ["Output format:"] + [labels[f] for f in fields]
+
+
+def fused_output_format() -> List[str]:
+    """Prompt lines asking for the artwork and its self-critique in one reply."""
+    return [
+        "Reply with the piece, then your self-critique of it, exactly in this layout:",
+        ARTWORK_MARKER,
+        "[the piece]",
+        CRITIQUE_MARKER,
+        "Score: [0.0 to 1.0]",
+        "Critique: [Your thoughts]",
+    ]
+
+
+def fused_marker(line: str) -> Optional[str]:
+    """"artwork" or "self-critique" if line is that section's marker, else None."""
+    match = _MARKER_RE.fullmatch(line)
+    return match.group(1).lower() if match else None
+
+
+def split_fused_response(text: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a fused reply into (artwork, critique_text). critique_text is None
+    if the self-critique marker is missing, in which case the whole reply is
+    treated as the artwork.
+    """
+    artwork_start = 0
+    critique_start = None
+    critique_end = None
+    for match in _MARKER_RE.finditer(text):
+        if match.group(1).lower() == "artwork" and critique_start is None:
+            artwork_start = match.end()
+        elif match.group(1).lower() == "self-critique" and critique_start is None:
+            critique_end = match.start()
+            critique_start = match.end()
+    if critique_start is None:
+        return text[artwork_start:].strip(), None
+    return text[artwork_start:critique_end].strip(), text[critique_start:].strip()
+
+
+def _parse_score(value: Any, default: float) -> float:
+    if isinstance(value, (int, float)):
+        score = float(value)
+    else:
+        match = _SCORE_RE.search(str(value)[:_SCORE_WINDOW])
+        if not match:
+            return default
+        score = float(match.group(1))
+        if match.group(2):
+            denominator = float(match.group(2))
+            if denominator:
+                score /= denominator
+    return max(0.0, min(1.0, score))
+
+
+def _first_block(section: str) -> str:
+    """The section up to its first blank line (ignoring leading blank lines)."""
+    block = section.strip()
+    end = block.find("\n\n")
+    return block if end < 0 else block[:end]
+
+
+def _concept_lines(section: str) -> str:
+    """
+    New concepts are either inline after the header ("a, b, c") or a bullet
+    list below it. Trailing prose after the list is ignored.
+    """
+    lines = section.strip().splitlines()
+    if not lines:
+        return ""
+    if not _BULLET_RE.match(lines[0].strip()):
+        return lines[0]
+    items = []
+    for line in lines:
+        line = line.strip()
+        if not _BULLET_RE.match(line):
+            break
+        items.append(_BULLET_RE.sub("", line))
+    return "\n".join(items)
+
+
+def _parse_concepts(value: Any) -> List[str]:
+    if isinstance(value, str):
+        items = _CONCEPT_SPLIT_RE.split(value)
+    else:
+        items = [str(v) for v in value or []]
+    concepts = []
+    for item in items:
+        concept = item.replace("**", "").strip(" \t*-_.\"'[]")
+        if concept:
+            concepts.append(concept)
+    return concepts
+
+
+def _parse_emotions(value: Any) -> Dict[str, float]:
+    if isinstance(value, dict):
+        value = " ".join(value)
+    elif not isinstance(value, str):
+        value = " ".join(str(v) for v in value or [])
+    return {m.lower(): EMOTION_DELTA for m in _EMOTION_RE.findall(value)}
+
+
+def parse_critique(text: str, default_score: float = 0.5) -> Dict[str, Any]:
+    """
+    Parse a Score/Critique/New Concepts/Emotional Impact response in one pass.
+
+    Each field's section runs from its header to the next header of a field
+    not seen yet, so a stray "critique:" inside the critique body does not cut
+    it short. The first occurrence of a field wins. Fields that are missing get
+    defaults; "critique" falls back to the whole text.
+    """
+    sections: Dict[str, str] = {}
+    current = None
+    start = 0
+    for match in _HEADER_RE.finditer(text):
+        key = _FIELD_KEYS[match.group(1).lower()]
+        if key in sections or key == current:
+            continue
+        if current is not None:
+            sections[current] = text[start:match.start()].rstrip(_SECTION_TAIL)
+        current = key
+        start = match.end()
+    if current is not None:
+        sections[current] = text[start:]
+
+    critique = sections.get("critique", "").strip()
+    return {
+        "score": _parse_score(sections["score"], default_score) if "score" in sections else default_score,
+        "critique": critique or text.strip(),
+        "new_concepts": _parse_concepts(_concept_lines(sections.get("new_concepts", ""))),
+        "emotional_impact": _parse_emotions(_first_block(sections.get("emotional_impact", ""))),
+        "structured": False
+    }
+
+
+def parse_structured_critique(text: str, default_score: float = 0.5) -> Optional[Dict[str, Any]]:
+    """Parse a JSON-mode response. Returns None if it is not a JSON object."""
+    try:
+        data = json.loads(_CODE_FENCE_RE.sub("", text))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    return {
+        "score": _parse_score(data["score"], default_score) if "score" in data else default_score,
+        "critique": str(data.get("critique") or "").strip() or text.strip(),
+        "new_concepts": _parse_concepts(data.get("new_concepts")),
+        "emotional_impact": _parse_emotions(data.get("emotional_impact")),
+        "structured": True
+    }
+
+
+def parse_response(text: str, structured: bool = False, default_score: float = 0.5) -> Dict[str, Any]:
+    """Parse a critique response, trying JSON first in structured mode."""
+    if structured:
+        result = parse_structured_critique(text, default_score)
+        if result is not None:
+            return result
+    return parse_critique(text, default_score)
@@ -0,0 +1,302 @@
+"""
+Near-duplicate detection for an artist's creations.
+
+Each creation is reduced to a set of features: overlapping three-word
+shingles for text, and for SVGs a structural sketch (element tags and
+attribute names, colors and geometry snapped to a coarse grid) so that
+re-wrapped or slightly nudged drawings match. A MinHash signature estimates
+the Jaccard similarity of two feature sets, and locality-sensitive hashing
+over bands of the signature finds the candidates without comparing against
+every earlier creation:
+
+    index = DuplicateIndex.from_memory(memory, artist_dir, threshold=0.8)
+    match = index.find(result)        # (creation index, similarity) or None
+    index.add(len(memory.creations) - 1, result)
+
+PNG images are never matched. Skills screen each new result against
+context["duplicates"] (see Skill.perform_and_critique): in "flag" mode a
+near-duplicate is kept but marked, and in "skip" mode it is dropped before
+its self-critique and before it reaches memory. Marked creations are left
+out of critique target selection (pick_critique_target()).
+"""
+import os
+import re
+import random
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from core.artifacts import resolve
+
+DEFAULT_THRESHOLD = 0.8
+NUM_PERM = 128
+SHINGLE_WORDS = 3
+# SVG coordinates and sizes are compared on a grid this coarse
+GEOMETRY_GRID = 25.0
+MODES = ("flag", "skip")
+# Random draws pick_critique_target() makes before scanning for an unflagged creation
+PICK_ATTEMPTS = 16
+
+_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_HEX_COLOR = re.compile(r"^#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})$")
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def text_features(text: str) -> FrozenSet[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return frozenset("t:" + word for word in words)
+    return frozenset("t:" + " ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1))
+
+
+def _coarse_color(value: str) -> str:
+    match = _HEX_COLOR.match(value.strip())
+    if not match:
+        return value.strip().lower()
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    # Two bits per channel: hues that look alike fall together
+    return "#" + "".join(str(int(digits[i:i + 2], 16) >> 6) for i in (0, 2, 4))
+
+
+def _coarse_numbers(value: str) -> str:
+    return _NUMBER.sub(lambda m: str(round(float(m.group(0)) / GEOMETRY_GRID)), value)
+
+
+def svg_features(svg_code: str) -> FrozenSet[str]:
+    """Structural features of an SVG; falls back to text shingles of the code if it does not parse."""
+    try:
+        root = ET.fromstring(svg_code)
+    except ET.ParseError:
+        return text_features(svg_code)
+    tokens = []
+    for el in root.iter():
+        tag = el.tag.rpartition("}")[2]
+        parts = [tag]
+        for name in sorted(el.attrib):
+            local = name.rpartition("}")[2]
+            if local == "id":
+                continue
+            value = el.attrib[name]
+            if local in ("fill", "stroke", "stop-color"):
+                value = _coarse_color(value)
+            else:
+                value = _coarse_numbers(value)
+            parts.append(f"{local}={value}")
+        tokens.append(" ".join(parts))
+    # Each element on its own and in sequence with the next, so order counts but not absolutely
+    features = {"s:" + token for token in tokens}
+    features.update("s:" + a + " | " + b for a, b in zip(tokens, tokens[1:]))
+    return frozenset(features)
+
+
+def result_features(result: Dict[str, Any]) -> Optional[FrozenSet[str]]:
+    """Features of a skill result, or None for results that are not compared (images, failures)."""
+    if result.get("svg_code"):
+        return svg_features(result["svg_code"])
+    if result.get("type") == "text" and result.get("content"):
+        return text_features(result["content"])
+    return None
+
+
+def creation_features(creation: Dict[str, Any], artist_dir: str) -> Optional[FrozenSet[str]]:
+    """Features of a stored creation, reading its SVG file if it has one."""
+    content = creation.get("content", "")
+    found = resolve(artist_dir, content, creation.get("artifact"))
+    if found is None:
+        return text_features(content) if content else None
+    kind, _, path = found
+    if kind != "svg" or path is None:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return svg_features(f.read())
+    except OSError:
+        return None
+
+
+def lsh_shape(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    (bands, rows) for the LSH index: the most rows per band whose detection
+    threshold (1/bands) ** (1/rows) stays below threshold, so near-duplicates
+    at the threshold are found with high probability.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold - 0.05:
+            best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """MinHash signatures from num_perm universal hash functions, the same for every seed-equal instance."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, features: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        hashes = [_hash64(feature) for feature in features]
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._coefficients)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the feature sets behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+_HASHERS: Dict[int, MinHasher] = {}
+
+
+class DuplicateIndex:
+    """LSH index over one artist's creations. Thread-safe."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, mode: str = "flag", num_perm: int = NUM_PERM):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Similarity threshold must be in (0, 1], got {threshold}")
+        if mode not in MODES:
+            raise ValueError(f"Unknown duplicate mode: {mode}")
+        self.threshold = threshold
+        self.mode = mode
+        self.bands, self.rows = lsh_shape(threshold, num_perm)
+        if num_perm not in _HASHERS:
+            _HASHERS[num_perm] = MinHasher(num_perm)
+        self._hasher = _HASHERS[num_perm]
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+        # Creations of the memory indexed so far (see catch_up)
+        self.indexed = 0
+        self.flagged = 0
+        self.skipped = 0
+        # Model calls not made for skipped results
+        self.calls_saved = 0
+
+    @classmethod
+    def from_memory(cls, memory, artist_dir: str, threshold: float = DEFAULT_THRESHOLD,
+                    mode: str = "flag") -> 'DuplicateIndex':
+        index = cls(threshold, mode)
+        index.catch_up(memory, artist_dir)
+        return index
+
+    def catch_up(self, memory, artist_dir: str):
+        """Index the creations added to memory since the last call."""
+        creations = memory.creations
+        for i in range(self.indexed, len(creations)):
+            self._add_features(i, creation_features(creations[i], artist_dir))
+        self.indexed = len(creations)
+
+    def _bands_of(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def _add_features(self, key: int, features: Optional[FrozenSet[str]]):
+        signature = self._hasher.signature(features) if features else None
+        if signature is None:
+            return
+        with self._lock:
+            self._signatures[key] = signature
+            for band, rows in self._bands_of(signature):
+                self._buckets[band].setdefault(rows, []).append(key)
+
+    def add(self, key: int, result: Dict[str, Any]):
+        """Index a skill result stored as creation key."""
+        self._add_features(key, result_features(result))
+        self.indexed = max(self.indexed, key + 1)
+
+    def find(self, result: Dict[str, Any]) -> Optional[Tuple[int, float]]:
+        """(creation index, similarity) of the closest indexed creation at or above the threshold, or None."""
+        features = result_features(result)
+        signature = self._hasher.signature(features) if features else None
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for band, rows in self._bands_of(signature):
+                candidates.update(self._buckets[band].get(rows, ()))
+            best = None
+            for key in candidates:
+                score = similarity(signature, self._signatures[key])
+                if score >= self.threshold and (best is None or score > best[1] or (score == best[1] and key < best[0])):
+                    best = (key, score)
+        return best
+
+    def screen(self, result: Dict[str, Any], calls_saved: int = 1) -> bool:
+        """
+        Mark result["near_duplicate"] if it repeats an indexed creation.
+        Returns True if it should be dropped (skip mode), which saves the
+        caller calls_saved model calls (its self-critique, unless fused).
+        """
+        match = self.find(result)
+        if match is None:
+            return False
+        skip = self.mode == "skip"
+        result["near_duplicate"] = {"of": match[0], "similarity": round(match[1], 3), "skipped": skip}
+        with self._lock:
+            if skip:
+                self.skipped += 1
+                self.calls_saved += calls_saved
+            else:
+                self.flagged += 1
+        return skip
+
+    def counts(self) -> Dict[str, int]:
+        return {"flagged": self.flagged, "skipped": self.skipped, "calls_saved": self.calls_saved}
+
+
+def is_skipped(result: Dict[str, Any]) -> bool:
+    return bool((result.get("near_duplicate") or {}).get("skipped"))
+
+
+def discard(result: Dict[str, Any]):
+    """Remove the files a skipped result already saved."""
+    path = result.get("filepath")
+    for candidate in (path, path + "z") if path else ():
+        try:
+            os.remove(candidate)
+        except FileNotFoundError:
+            pass
+
+
+def creation_metadata(metadata: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """metadata for Memory.add_creation, carrying the near-duplicate mark of a flagged result."""
+    if result.get("near_duplicate"):
+        metadata = dict(metadata, near_duplicate={k: v for k, v in result["near_duplicate"].items() if k != "skipped"})
+    return metadata
+
+
+def _flagged(creation: Dict[str, Any]) -> bool:
+    return bool((creation.get("metadata") or {}).get("near_duplicate"))
+
+
+def critique_targets(creations: List[Dict[str, Any]]) -> List[int]:
+    """Indices worth critiquing: creations not marked as near-duplicates (all of them if every one is)."""
+    targets = [i for i, creation in enumerate(creations) if not _flagged(creation)]
+    return targets or list(range(len(creations)))
+
+
+def pick_critique_target(creations: List[Dict[str, Any]], rng: Any = random) -> int:
+    """
+    A uniformly random index from critique_targets(creations), for non-empty
+    creations. Draws and redraws on flagged creations, so a pick costs O(1)
+    unless nearly all of them are flagged; then it falls back to the scan.
+    """
+    for _ in range(PICK_ATTEMPTS):
+        i = rng.randrange(len(creations))
+        if not _flagged(creations[i]):
+            return i
+    targets = critique_targets(creations)
+    return targets[rng.randrange(len(targets))]
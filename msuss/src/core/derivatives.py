@@ -0,0 +1,86 @@
+"""
+Smaller copies of generated PNGs for the gallery grid and the artwork view.
+
+For art/art_1700000000.png, make_derivatives() writes
+
+    art/derived/art_1700000000.thumb.webp    (longest edge 256 px)
+    art/derived/art_1700000000.medium.webp   (longest edge 1024 px)
+
+and returns their records, which ImageGenerationSkill stores under the
+artwork's artifact record as "variants". JPEG is used if Pillow was built
+without WebP. Derivatives newer than their source are reused, so running it
+again (e.g. make_derivatives.py over existing artists) only fills gaps.
+
+Pillow is optional: without it no derivatives are made and the gallery shows
+the originals.
+"""
+import os
+from typing import Any, Dict, Optional
+
+try:
+    from PIL import Image, features
+except ImportError:  # optional dependency
+    Image = None
+
+# Longest edge in pixels per variant
+VARIANTS = {"thumb": 256, "medium": 1024}
+DERIVED_DIR = "derived"
+QUALITY = 80
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def derivative_format() -> Optional[str]:
+    """Encoder used for derivatives, or None without Pillow."""
+    if Image is None:
+        return None
+    return "webp" if features.check("webp") else "jpeg"
+
+
+def variant_path(source: str, variant: str, fmt: str) -> str:
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(os.path.dirname(source), DERIVED_DIR, f"{stem}.{variant}.{'jpg' if fmt == 'jpeg' else fmt}")
+
+
+def _record(artist_dir: str, path: str, size) -> Dict[str, Any]:
+    return {
+        "path": os.path.relpath(path, artist_dir).replace(os.sep, "/"),
+        "width": size[0],
+        "height": size[1],
+        "bytes": os.path.getsize(path)
+    }
+
+
+def make_derivatives(artist_dir: str, source: str, variants: Dict[str, int] = VARIANTS) -> Dict[str, Dict[str, Any]]:
+    """
+    Write the resized copies of the image at source (inside artist_dir) and
+    return {variant: {path, width, height, bytes}}. Empty without Pillow or if
+    the source cannot be read as an image.
+    """
+    fmt = derivative_format()
+    if fmt is None:
+        return {}
+    records = {}
+    image = None
+    try:
+        source_mtime = os.path.getmtime(source)
+        for variant, edge in variants.items():
+            path = variant_path(source, variant, fmt)
+            if os.path.exists(path) and os.path.getmtime(path) >= source_mtime:
+                with Image.open(path) as cached:
+                    records[variant] = _record(artist_dir, path, cached.size)
+                continue
+            if image is None:
+                with Image.open(source) as opened:
+                    image = opened.convert("RGBA" if fmt == "webp" else "RGB")
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.LANCZOS)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            resized.save(path, fmt.upper(), quality=QUALITY)
+            records[variant] = _record(artist_dir, path, resized.size)
+    except OSError as e:
+        print(f"Could not make derivatives of {source}: {e}")
+        return {}
+    return records
@@ -0,0 +1,250 @@
+"""
+Append-only, per-artist log of every personality state change.
+
+Events go to <artist_dir>/evolution.jsonl, one compact JSON object per line:
+
+    {"t": 1700000000.0, "type": "evolve", "experience": {...}, "draws": [["random", 0.42], ...]}
+    {"t": ..., "type": "critique_given", "new_concepts": [...], "emotional_impact": {...}}
+    {"t": ..., "type": "critique_received", "score": 0.7}
+
+"draws" are the values the personality's rng returned during evolve, so an
+event replays to exactly the same state. Every SNAPSHOT_EVERY events a full
+state snapshot is appended to <artist_dir>/evolution.snapshots, one line
+each: "<time> <offset of the next event> <personality JSON>". The time and
+offset prefix lets the snapshot index be built without parsing any state;
+state queries start from the nearest snapshot and replay at most
+SNAPSHOT_EVERY events.
+"""
+import io
+import os
+import json
+import time
+import bisect
+import contextlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.personality import Personality
+from core.spans import traced
+
+EVENTS_FILE = "evolution.jsonl"
+SNAPSHOTS_FILE = "evolution.snapshots"
+SNAPSHOT_EVERY = 50
+
+
+class RecordingRandom:
+    """Wraps an rng and records every value it hands out."""
+
+    def __init__(self, rng: Any):
+        self.rng = rng
+        self.draws: List[List[Any]] = []
+
+    def random(self) -> float:
+        value = self.rng.random()
+        self.draws.append(["random", value])
+        return value
+
+    def uniform(self, a: float, b: float) -> float:
+        value = self.rng.uniform(a, b)
+        self.draws.append(["uniform", value])
+        return value
+
+    def choice(self, seq):
+        value = self.rng.choice(seq)
+        self.draws.append(["choice", value])
+        return value
+
+
+class ReplayRandom:
+    """Hands back recorded draws in order."""
+
+    def __init__(self, draws: List[List[Any]]):
+        self.draws = iter(draws)
+
+    def _next(self, method: str) -> Any:
+        recorded, value = next(self.draws)
+        if recorded != method:
+            raise ValueError(f"Replay diverged: expected a {recorded} draw, got {method}")
+        return value
+
+    def random(self) -> float:
+        return self._next("random")
+
+    def uniform(self, a: float, b: float) -> float:
+        return self._next("uniform")
+
+    def choice(self, seq):
+        return self._next("choice")
+
+
+def apply_event(personality: Personality, event: Dict[str, Any]):
+    """Re-apply a logged event to a personality (without logging it again)."""
+    kind = event["type"]
+    if kind == "evolve":
+        rng = personality.rng
+        personality.rng = ReplayRandom(event["draws"])
+        try:
+            personality._apply_experience(event["experience"])
+        finally:
+            personality.rng = rng
+    elif kind == "critique_given":
+        personality._absorb_critique(event)
+    elif kind == "critique_received":
+        personality._receive_critique(event["score"])
+    else:
+        raise ValueError(f"Unknown evolution event: {kind}")
+
+
+def _read_lines(path: str, offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """(start offset, line) for each complete line from offset on."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # torn final write
+            yield offset, line
+            offset += len(line)
+
+
+def _quietly(fn, *args):
+    # Replays re-run code that prints progress messages meant for live runs
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+class EvolutionLog:
+    """
+    Event log for one artist. Attach it to a personality (personality.journal)
+    so that evolve() and the critique updates are recorded as they happen.
+    """
+
+    def __init__(self, artist_dir: str, snapshot_every: int = SNAPSHOT_EVERY):
+        self.artist_dir = artist_dir
+        self.events_path = os.path.join(artist_dir, EVENTS_FILE)
+        self.snapshots_path = os.path.join(artist_dir, SNAPSHOTS_FILE)
+        self.snapshot_every = snapshot_every
+        self._snapshot_index: Optional[List[Tuple[float, int, int]]] = None
+        self._since_snapshot: Optional[int] = None
+        self._personality: Optional[Personality] = None
+
+    def attach(self, personality: Personality) -> 'EvolutionLog':
+        """Start recording personality's changes; writes a first snapshot if the log is new."""
+        personality.journal = self
+        self._personality = personality
+        if not os.path.exists(self.snapshots_path):
+            self._write_snapshot(personality)
+        return self
+
+    # --- Recording ---------------------------------------------------------
+
+    def record_evolve(self, personality: Personality, experience: Dict[str, Any]):
+        """Run personality's evolve step with its rng draws recorded, then log it."""
+        rng = personality.rng
+        recorder = RecordingRandom(rng)
+        personality.rng = recorder
+        try:
+            personality._apply_experience(experience)
+        finally:
+            personality.rng = rng
+        self.record("evolve", {"experience": experience, "draws": recorder.draws})
+
+    @traced("evolution.log")
+    def record(self, kind: str, data: Dict[str, Any]):
+        event = {"t": time.time(), "type": kind}
+        event.update(data)
+        line = (json.dumps(event, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        with open(self.events_path, "a+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line  # terminate a torn earlier write so this event stays readable
+            f.write(line)
+
+        since = (self._count_since_snapshot() or 0) + 1
+        self._since_snapshot = since
+        if since >= self.snapshot_every and self._personality is not None:
+            self._write_snapshot(self._personality)
+
+    def _write_snapshot(self, personality: Personality):
+        t = time.time()
+        offset = os.path.getsize(self.events_path) if os.path.exists(self.events_path) else 0
+        line = f"{t!r} {offset} {json.dumps(personality.to_dict(), separators=(',', ':'))}\n"
+        with open(self.snapshots_path, "ab") as f:
+            position = f.tell()
+            f.write(line.encode("utf-8"))
+        if self._snapshot_index is not None:
+            self._snapshot_index.append((t, offset, position))
+        self._since_snapshot = 0
+
+    def _count_since_snapshot(self) -> Optional[int]:
+        """Events after the latest snapshot, or None if there is no snapshot yet."""
+        if self._since_snapshot is None:
+            index = self.snapshot_index()
+            if index:
+                self._since_snapshot = sum(1 for _ in _read_lines(self.events_path, index[-1][1]))
+        return self._since_snapshot
+
+    # --- Queries -----------------------------------------------------------
+
+    def snapshot_index(self) -> List[Tuple[float, int, int]]:
+        """(time, offset of the next event, offset in the snapshots file) of every snapshot, oldest first."""
+        if self._snapshot_index is None:
+            index = []
+            for position, line in _read_lines(self.snapshots_path):
+                t, offset, _ = line.split(b" ", 2)
+                index.append((float(t), int(offset), position))
+            self._snapshot_index = index
+        return self._snapshot_index
+
+    def _snapshot(self, position: int) -> Personality:
+        with open(self.snapshots_path, "rb") as f:
+            f.seek(position)
+            _, _, state = f.readline().split(b" ", 2)
+        return Personality.from_dict(json.loads(state))
+
+    def events(self, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        for _, line in _read_lines(self.events_path, offset):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # remains of a torn write
+
+    def state_at(self, t: Optional[float] = None) -> Optional[Personality]:
+        """
+        The personality as it was at time t (default: now), rebuilt from the
+        latest snapshot at or before t plus the events after it. None if t is
+        before the log began.
+        """
+        index = self.snapshot_index()
+        i = len(index) - 1 if t is None else bisect.bisect_right([s[0] for s in index], t) - 1
+        if i < 0:
+            return None
+        personality = self._snapshot(index[i][2])
+        for event in self.events(index[i][1]):
+            if t is not None and event["t"] > t:
+                break
+            _quietly(apply_event, personality, event)
+        return personality
+
+    def history(self) -> Iterator[Dict[str, Any]]:
+        """
+        One entry per event, oldest first: the event time and type plus the
+        resulting mood, confidence and emotions. A single forward pass.
+        """
+        index = self.snapshot_index()
+        if not index:
+            return
+        personality = self._snapshot(index[0][2])
+        for event in self.events(index[0][1]):
+            _quietly(apply_event, personality, event)
+            yield {
+                "t": event["t"],
+                "type": event["type"],
+                "mood": personality.mood,
+                "confidence": personality.confidence,
+                "emotions": dict(personality.emotions)
+            }
@@ -1,6 +1,12 @@
 import json
 import time
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
+
+from .spans import traced
+
+# Called as hook(memory, creation_index, critique_index) after each creation
+# (critique_index None) or critique is saved, e.g. to keep core.search current
+write_hooks: List[Callable[['Memory', int, Optional[int]], None]] = []
 
 class Memory:
     def __init__(self, filepath: str = "memory.json"):
@@ -9,6 +15,15 @@ class Memory:
         self.creations: List[Dict[str, Any]] = []
         self._load()
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], filepath: str = "memory.json") -> 'Memory':
+        """Build a Memory from already-loaded data without reading filepath (it is still where saves go)."""
+        memory = cls.__new__(cls)
+        memory.filepath = filepath
+        memory.experiences = data.get("experiences", [])
+        memory.creations = data.get("creations", [])
+        return memory
+
     def add_experience(self, description: str, tags: List[str], sentiment: float = 0.0):
         experience = {
             "timestamp": time.time(),
@@ -20,7 +35,7 @@ class Memory:
         self.experiences.append(experience)
         self._save()
 
-    def add_creation(self, content: str, metadata: Dict[str, Any]):
+    def add_creation(self, content: str, metadata: Dict[str, Any], artifact: Optional[Dict[str, Any]] = None):
         creation = {
             "timestamp": time.time(),
             "type": "creation",
@@ -28,18 +43,31 @@ class Memory:
             "metadata": metadata,
             "critiques": []
         }
+        if artifact is not None:
+            # The saved art file behind the content (see core.artifacts)
+            creation["artifact"] = artifact
         self.creations.append(creation)
         self._save()
+        for hook in write_hooks:
+            hook(self, len(self.creations) - 1, None)
 
-    def add_critique(self, creation_index: int, critique: str, score: float, critic_name: str = None):
+    def add_critique(self, creation_index: int, critique: str, score: float, critic_name: str = None,
+                     concepts: Optional[List[str]] = None):
         if 0 <= creation_index < len(self.creations):
-            self.creations[creation_index]["critiques"].append({
+            critiques = self.creations[creation_index]["critiques"]
+            entry = {
                 "timestamp": time.time(),
                 "critique": critique,
                 "score": score,
                 "critic": critic_name
-            })
+            }
+            if concepts:
+                # Concepts the critic took away from the piece
+                entry["concepts"] = list(concepts)
+            critiques.append(entry)
             self._save()
+            for hook in write_hooks:
+                hook(self, creation_index, len(critiques) - 1)
 
     def get_recent_context(self, limit: int = 5) -> List[Dict[str, Any]]:
         # Combine and sort by timestamp
@@ -47,6 +75,7 @@ class Memory:
         all_items.sort(key=lambda x: x["timestamp"], reverse=True)
         return all_items[:limit]
 
+    @traced("memory.save")
     def _save(self):
         data = {
             "experiences": self.experiences,
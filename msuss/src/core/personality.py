@@ -1,8 +1,160 @@
+import sys
 import json
 import random
-from typing import Dict, List, Any
+import threading
+from array import array
+from collections.abc import MutableMapping, MutableSequence
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from .spans import traced
+
+DEFAULT_EMOTIONS = {"melancholy": 0.5, "joy": 0.1, "anger": 0.1, "fear": 0.3, "awe": 0.5}
+DEFAULT_CONCEPTS = ["entropy", "digital", "void"]
+
+
+class _Interner:
+    """Process-wide name <-> small int registry. Ids are never reused or freed."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._lock = threading.Lock()
+        for name in names:
+            self.id(name)
+
+    def id(self, name: str) -> int:
+        i = self.ids.get(name)
+        if i is None:
+            with self._lock:
+                i = self.ids.get(name)
+                if i is None:
+                    i = len(self.names)
+                    self.names.append(sys.intern(name))
+                    self.ids[self.names[i]] = i
+        return i
+
+
+_emotions = _Interner(DEFAULT_EMOTIONS)
+_concepts = _Interner()
+
+# Key order of a personality with exactly the default emotions, shared by all such instances.
+_DEFAULT_ORDER = tuple(range(len(DEFAULT_EMOTIONS)))
+
+
+class EmotionVector(MutableMapping):
+    """
+    Emotion name -> intensity, stored as an array('d') indexed by interned
+    emotion id. Behaves like the dict it replaces (including key order) and
+    caches the dominant emotion until the next write.
+    """
+
+    __slots__ = ("_values", "_order", "_mood")
+
+    def __init__(self, values: Optional[Dict[str, float]] = None):
+        order = tuple(_emotions.id(name) for name in values or ())
+        # Sized once up front; growing an array one key at a time over-allocates
+        self._values = array("d", [0.0]) * (max(order) + 1 if order else 0)
+        self._order = _DEFAULT_ORDER if order == _DEFAULT_ORDER else order
+        self._mood = None
+        for i, value in zip(order, (values or {}).values()):
+            self._values[i] = value
+
+    def __getitem__(self, name: str) -> float:
+        i = _emotions.ids.get(name)
+        if i is None or i not in self._order:
+            raise KeyError(name)
+        return self._values[i]
+
+    def __setitem__(self, name: str, value: float):
+        i = _emotions.id(name)
+        if i >= len(self._values):
+            self._values.extend([0.0] * (i + 1 - len(self._values)))
+        self._values[i] = value
+        if i not in self._order:
+            order = self._order + (i,)
+            self._order = _DEFAULT_ORDER if order == _DEFAULT_ORDER else order
+        self._mood = None
+
+    def __delitem__(self, name: str):
+        i = _emotions.ids.get(name)
+        if i is None or i not in self._order:
+            raise KeyError(name)
+        self._order = tuple(j for j in self._order if j != i)
+        self._mood = None
+
+    def __iter__(self) -> Iterator[str]:
+        names = _emotions.names
+        return (names[i] for i in self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def dominant(self) -> str:
+        """The strongest emotion; ties go to the earliest key, as max() over a dict."""
+        if self._mood is None:
+            values = self._values
+            self._mood = _emotions.names[max(self._order, key=values.__getitem__)]
+        return self._mood
+
+    def clamp(self, low: float = 0.0, high: float = 1.0):
+        values = self._values
+        for i in self._order:
+            values[i] = max(low, min(high, values[i]))
+        self._mood = None
+
+
+class ConceptList(MutableSequence):
+    """A list of concept names stored as an array of interned concept ids."""
+
+    __slots__ = ("_ids",)
+
+    def __init__(self, concepts: Iterable[str] = ()):
+        self._ids = array("I", [_concepts.id(c) for c in concepts])
+
+    def __getitem__(self, index):
+        names = _concepts.names
+        if isinstance(index, slice):
+            return [names[i] for i in self._ids[index]]
+        return names[self._ids[index]]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._ids[index] = array("I", (_concepts.id(c) for c in value))
+        else:
+            self._ids[index] = _concepts.id(value)
+
+    def __delitem__(self, index):
+        del self._ids[index]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def insert(self, index: int, value: str):
+        self._ids.insert(index, _concepts.id(value))
+
+    def __contains__(self, value) -> bool:
+        i = _concepts.ids.get(value)
+        return i is not None and i in self._ids
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ConceptList):
+            return self._ids == other._ids
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
 
 class Personality:
+    __slots__ = ("name", "traits", "preferences", "flaws", "_emotions", "_concepts", "confidence", "rng", "journal")
+
     def __init__(self, name: str, traits: Dict[str, float], preferences: Dict[str, Any], flaws: List[str]):
         self.name = name
         self.traits = traits  # e.g., {"openness": 0.8, "neuroticism": 0.4}
@@ -10,34 +162,136 @@ class Personality:
         self.flaws = flaws  # e.g., ["sensitive to criticism", "egoism"]
         
         # Complex State
-        self.emotions = {
-            "melancholy": 0.5,
-            "joy": 0.1,
-            "anger": 0.1,
-            "fear": 0.3,
-            "awe": 0.5
-        }
-        self.concepts = ["entropy", "digital", "void"] # Starting concepts
+        self.emotions = DEFAULT_EMOTIONS
+        self.concepts = DEFAULT_CONCEPTS # Starting concepts
         self.confidence = 0.8 # 0.0 to 1.0
+        
+        # Source of randomness for evolve/drift; swap in a seeded random.Random for reproducible runs
+        self.rng = random
+
+        # Optional EvolutionLog that records every state change (see core.evolution_log)
+        self.journal = None
+
+    @property
+    def emotions(self) -> EmotionVector:
+        return self._emotions
+
+    @emotions.setter
+    def emotions(self, values: Dict[str, float]):
+        # Assigning an EmotionVector shares it, as assigning a dict used to
+        self._emotions = values if isinstance(values, EmotionVector) else EmotionVector(values)
+
+    @property
+    def concepts(self) -> ConceptList:
+        return self._concepts
+
+    @concepts.setter
+    def concepts(self, values: Iterable[str]):
+        self._concepts = values if isinstance(values, ConceptList) else ConceptList(values)
 
     @property
     def mood(self) -> str:
         # mood is now derived from the dominant emotion
-        return max(self.emotions, key=self.emotions.get)
+        return self._emotions.dominant()
 
     def evolve(self, experience: Dict[str, Any]):
         """
         Update personality based on an experience.
         """
+        if self.journal is not None:
+            self.journal.record_evolve(self, experience)
+        else:
+            self._apply_experience(experience)
+
+    def _apply_experience(self, experience: Dict[str, Any]):
         if experience.get("type") == "critique":
             self._handle_critique(experience)
         elif experience.get("type") == "feedback":
             self._handle_feedback(experience)
         
         # Random drift
-        if random.random() < 0.2:
+        if self.rng.random() < 0.2:
             self._drift_state()
 
+    def absorb_critique(self, result: Dict[str, Any]) -> bool:
+        """
+        Update this artist's state after critiquing someone else's work
+        (new concepts and emotional impact from the critique result).
+        Returns True if anything changed.
+        """
+        changed = self._absorb_critique(result)
+        if self.journal is not None:
+            self.journal.record("critique_given", {
+                "new_concepts": result.get("new_concepts") or [],
+                "emotional_impact": result.get("emotional_impact") or {}
+            })
+        return changed
+
+    def _absorb_critique(self, result: Dict[str, Any]) -> bool:
+        changed = False
+        if result.get("new_concepts"):
+            print(f"\n💡 {self.name} discovered: {result['new_concepts']}")
+            for concept in result["new_concepts"]:
+                if concept.lower() not in [c.lower() for c in self.concepts]:
+                    self.concepts.append(concept.lower())
+                    if len(self.concepts) > 6:
+                        removed = self.concepts.pop(0)
+                        print(f"   Forgot: {removed}")
+                    changed = True
+        
+        if result.get("emotional_impact"):
+            print(f"\n😶 {self.name}'s emotional shift: {result['emotional_impact']}")
+            for emotion, delta in result["emotional_impact"].items():
+                if emotion in self.emotions:
+                    self.emotions[emotion] = min(1.0, self.emotions[emotion] + delta)
+                    changed = True
+        return changed
+
+    def receive_critique(self, score: float) -> bool:
+        """
+        Update this artist's state after another artist scored its work.
+        Returns True if anything changed.
+        """
+        changed = self._receive_critique(score)
+        if self.journal is not None:
+            self.journal.record("critique_received", {"score": score})
+        return changed
+
+    def _receive_critique(self, score: float) -> bool:
+        changed = False
+        # Confidence adjustment based on score
+        if score >= 0.8:
+            self.confidence = min(1.0, self.confidence + 0.05)
+            changed = True
+            print(f"\n⬆️ {self.name}'s confidence increased to {self.confidence:.2f}")
+        elif score <= 0.5:
+            self.confidence = max(0.0, self.confidence - 0.05)
+            changed = True
+            print(f"\n⬇️ {self.name}'s confidence decreased to {self.confidence:.2f}")
+        
+        # Emotional impact
+        if score >= 0.8:
+            if "joy" in self.emotions:
+                self.emotions["joy"] = min(1.0, self.emotions["joy"] + 0.1)
+            if "melancholy" in self.emotions:
+                self.emotions["melancholy"] = max(0.0, self.emotions["melancholy"] - 0.05)
+            changed = True
+            print(f"   {self.name} feels validated")
+        elif score <= 0.5:
+            if self.traits.get("neuroticism", 0.5) > 0.6:
+                if "melancholy" in self.emotions:
+                    self.emotions["melancholy"] = min(1.0, self.emotions["melancholy"] + 0.1)
+                if "anger" in self.emotions:
+                    self.emotions["anger"] = min(1.0, self.emotions["anger"] + 0.05)
+                changed = True
+                print(f"   {self.name} feels wounded")
+            else:
+                if "anger" in self.emotions:
+                    self.emotions["anger"] = min(1.0, self.emotions["anger"] + 0.05)
+                changed = True
+                print(f"   {self.name} feels defensive")
+        return changed
+
     def _handle_critique(self, experience: Dict[str, Any]):
         score = experience.get("score", 0.5)
         
@@ -95,14 +349,14 @@ class Personality:
         Randomly change state to simulate evolving tastes and thoughts.
         """
         # Drift emotions
-        emotion = random.choice(list(self.emotions.keys()))
-        self.emotions[emotion] += random.uniform(-0.1, 0.1)
+        emotion = self.rng.choice(list(self.emotions.keys()))
+        self.emotions[emotion] += self.rng.uniform(-0.1, 0.1)
         self._normalize_emotions()
         
         # Drift concepts
-        if random.random() < 0.3:
+        if self.rng.random() < 0.3:
             new_concepts = ["glitch", "nature", "silence", "noise", "flesh", "machine", "god", "decay"]
-            new_c = random.choice(new_concepts)
+            new_c = self.rng.choice(new_concepts)
             if new_c not in self.concepts:
                 self.concepts.append(new_c)
                 print(f"!! Epiphany: Discovered concept '{new_c}'")
@@ -113,8 +367,7 @@ class Personality:
 
     def _normalize_emotions(self):
         # Clamp values 0.0-1.0
-        for k in self.emotions:
-            self.emotions[k] = max(0.0, min(1.0, self.emotions[k]))
+        self._emotions.clamp(0.0, 1.0)
 
     def reflect(self) -> str:
         """
@@ -132,19 +385,24 @@ class Personality:
             "traits": self.traits,
             "preferences": self.preferences,
             "flaws": self.flaws,
-            "emotions": self.emotions,
-            "concepts": self.concepts,
+            "emotions": dict(self._emotions),
+            "concepts": list(self._concepts),
             "confidence": self.confidence
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Personality':
-        p = cls(data["name"], data["traits"], data["preferences"], data["flaws"])
-        p.emotions = data.get("emotions", {"melancholy": 0.5, "joy": 0.1, "anger": 0.1, "fear": 0.3, "awe": 0.5})
-        p.concepts = data.get("concepts", ["entropy", "digital", "void"])
+        # Interned strings are shared across every loaded personality instead of repeated per instance
+        traits = {sys.intern(k): v for k, v in data["traits"].items()}
+        preferences = {sys.intern(k): sys.intern(v) if isinstance(v, str) else v for k, v in data["preferences"].items()}
+        flaws = [sys.intern(f) for f in data["flaws"]]
+        p = cls(data["name"], traits, preferences, flaws)
+        p.emotions = data.get("emotions", DEFAULT_EMOTIONS)
+        p.concepts = data.get("concepts", DEFAULT_CONCEPTS)
         p.confidence = data.get("confidence", 0.8)
         return p
 
+    @traced("personality.save")
     def save(self, filepath: str):
         with open(filepath, 'w') as f:
             json.dump(self.to_dict(), f, indent=2)
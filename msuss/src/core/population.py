@@ -0,0 +1,220 @@
+"""
+Population-scale personality evolution backed by NumPy arrays.
+
+A Population holds the evolving state of many artists (emotions, confidence,
+traits) in dense arrays and applies the same rules as Personality.evolve to
+whole batches at once. Individual Personality objects can be materialized
+from, or synced back to, the arrays on demand.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.personality import Personality
+
+# Fixed emotion index shared by every row of the emotion matrix.
+EMOTIONS = ("melancholy", "joy", "anger", "fear", "awe")
+EMOTION_INDEX = {name: i for i, name in enumerate(EMOTIONS)}
+MELANCHOLY, JOY, ANGER, FEAR, AWE = range(len(EMOTIONS))
+
+# Mirrors Personality._drift_state.
+DRIFT_PROBABILITY = 0.2
+CONCEPT_DRIFT_PROBABILITY = 0.3
+DRIFT_CONCEPTS = ["glitch", "nature", "silence", "noise", "flesh", "machine", "god", "decay"]
+MAX_CONCEPTS = 5
+
+
+class Population:
+    """
+    Evolving state for n artists.
+
+    emotions:   (n, 5) float64, columns in EMOTIONS order
+    present:    (n, 5) bool, which emotions each artist actually has
+    confidence: (n,) float64
+    traits:     (n, t) float64 over trait_names, NaN where an artist lacks a trait
+    sensitive:  (n,) bool, has the "sensitive to criticism" flaw
+
+    Names, preferences, flaws and concepts stay as per-artist Python objects.
+    Batch methods take an array of artist indices; each index may appear at
+    most once per batch.
+    """
+
+    def __init__(self, personalities: Sequence[Personality]):
+        n = len(personalities)
+        self.names: List[str] = [p.name for p in personalities]
+        self.preferences: List[Dict[str, Any]] = [p.preferences for p in personalities]
+        self.flaws: List[List[str]] = [p.flaws for p in personalities]
+        self.concepts: List[List[str]] = [list(p.concepts) for p in personalities]
+
+        self.trait_names: List[str] = sorted({t for p in personalities for t in p.traits})
+        trait_index = {t: i for i, t in enumerate(self.trait_names)}
+
+        self.emotions = np.zeros((n, len(EMOTIONS)))
+        self.present = np.zeros((n, len(EMOTIONS)), dtype=bool)
+        self.traits = np.full((n, len(self.trait_names)), np.nan)
+        self.confidence = np.empty(n)
+        self.sensitive = np.zeros(n, dtype=bool)
+
+        for i, p in enumerate(personalities):
+            for name, value in p.emotions.items():
+                if name not in EMOTION_INDEX:
+                    raise ValueError(f"Unknown emotion '{name}' for {p.name}")
+                self.emotions[i, EMOTION_INDEX[name]] = value
+                self.present[i, EMOTION_INDEX[name]] = True
+            for name, value in p.traits.items():
+                self.traits[i, trait_index[name]] = value
+            self.confidence[i] = p.confidence
+            self.sensitive[i] = "sensitive to criticism" in p.flaws
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def random(cls, n: int, seed: int = 0) -> 'Population':
+        """A synthetic population of n artists with uniformly random state."""
+        rng = np.random.default_rng(seed)
+        pop = cls([])
+        pop.names = [f"artist{i}" for i in range(n)]
+        pop.preferences = [{} for _ in range(n)]
+        pop.flaws = [["sensitive to criticism"] if s else [] for s in rng.random(n) < 0.3]
+        pop.concepts = [["entropy", "digital", "void"] for _ in range(n)]
+        pop.trait_names = ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism"]
+        pop.emotions = rng.random((n, len(EMOTIONS)))
+        pop.present = np.ones((n, len(EMOTIONS)), dtype=bool)
+        pop.traits = rng.random((n, len(pop.trait_names)))
+        pop.confidence = rng.random(n)
+        pop.sensitive = np.array([bool(f) for f in pop.flaws], dtype=bool)
+        return pop
+
+    # --- Materialization ---------------------------------------------------
+
+    def personality(self, i: int) -> Personality:
+        """Build a standalone Personality for artist i from the arrays."""
+        traits = {t: float(v) for t, v in zip(self.trait_names, self.traits[i]) if not np.isnan(v)}
+        p = Personality(self.names[i], traits, self.preferences[i], self.flaws[i])
+        self.sync_to(i, p)
+        return p
+
+    def sync_to(self, i: int, personality: Personality):
+        """Write artist i's evolving state into an existing Personality."""
+        values = {EMOTIONS[k]: float(self.emotions[i, k]) for k in np.flatnonzero(self.present[i])}
+        # Keep the Personality's own key order; mood ties and drift choices depend on it.
+        emotions = {name: values.pop(name) for name in personality.emotions if name in values}
+        emotions.update(values)
+        personality.emotions = emotions
+        personality.confidence = float(self.confidence[i])
+        personality.concepts = list(self.concepts[i])
+
+    def sync_from(self, i: int, personality: Personality):
+        """Load a Personality's evolving state into row i."""
+        self.emotions[i] = 0.0
+        self.present[i] = False
+        for name, value in personality.emotions.items():
+            self.emotions[i, EMOTION_INDEX[name]] = value
+            self.present[i, EMOTION_INDEX[name]] = True
+        self.confidence[i] = personality.confidence
+        self.concepts[i] = list(personality.concepts)
+
+    @property
+    def moods(self) -> np.ndarray:
+        """Index into EMOTIONS of each artist's dominant emotion (ties go to the earlier column)."""
+        return np.argmax(np.where(self.present, self.emotions, -np.inf), axis=1)
+
+    # --- Batched evolution ---------------------------------------------------
+
+    def _clamp(self, idx: np.ndarray):
+        """Vectorized Personality._normalize_emotions over rows idx."""
+        self.emotions[idx] = np.clip(self.emotions[idx], 0.0, 1.0)
+
+    def apply_critique(self, idx: np.ndarray, scores: np.ndarray):
+        """Vectorized Personality._handle_critique for artists idx with the given scores."""
+        idx = np.asarray(idx)
+        scores = np.asarray(scores, dtype=float)
+
+        high = idx[scores > 0.8]
+        self.confidence[high] = np.minimum(1.0, self.confidence[high] + 0.05)
+        self.emotions[high, JOY] += 0.1
+        self.emotions[high, AWE] += 0.05
+
+        low = idx[scores < 0.4]
+        self.confidence[low] = np.maximum(0.0, self.confidence[low] - 0.1)
+        self.emotions[low, MELANCHOLY] += 0.1
+        self.emotions[low, FEAR] += 0.05
+
+        self._clamp(idx)
+
+    def apply_feedback(self, idx: np.ndarray, liked: np.ndarray):
+        """Vectorized Personality._handle_feedback for artists idx."""
+        idx = np.asarray(idx)
+        liked = np.asarray(liked, dtype=bool)
+
+        up = idx[liked]
+        self.confidence[up] = np.minimum(1.0, self.confidence[up] + 0.1)
+        self.emotions[up, JOY] += 0.2
+        self.emotions[up, MELANCHOLY] -= 0.1
+
+        down = idx[~liked]
+        self.confidence[down] = np.maximum(0.0, self.confidence[down] - 0.15)
+        self.emotions[down, ANGER] += 0.1
+        self.emotions[down, FEAR] += 0.1
+        self.emotions[down, JOY] -= 0.2
+        hurt = self.sensitive[down]
+        self.emotions[down[hurt], MELANCHOLY] += 0.3
+        self.emotions[down[~hurt], ANGER] += 0.2
+
+        self._clamp(idx)
+
+    def draw(self, n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """
+        All random draws evolve() needs for n artists, one of each per artist.
+        Kept separate so a batch can be replayed or checked against the scalar path.
+        """
+        return {
+            "drift": rng.random(n),
+            "emotion": rng.random(n),
+            "delta": rng.uniform(-0.1, 0.1, n),
+            "concept_drift": rng.random(n),
+            "concept": rng.integers(0, len(DRIFT_CONCEPTS), n)
+        }
+
+    def drift_emotion_index(self, idx: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """Map uniform draws to one of each artist's present emotions (by EMOTIONS order)."""
+        present = self.present[idx]
+        k = (u * present.sum(axis=1)).astype(int)
+        return np.argmax(np.cumsum(present, axis=1) > k[:, None], axis=1)
+
+    def apply_drift(self, idx: np.ndarray, draws: Dict[str, np.ndarray]):
+        """Vectorized Personality._drift_state for artists idx using pre-drawn randoms."""
+        idx = np.asarray(idx)
+        emotion = self.drift_emotion_index(idx, draws["emotion"])
+        self.emotions[idx, emotion] += draws["delta"]
+        self._clamp(idx)
+
+        # Concept lists are ragged Python lists; only ~30% of drifting artists touch them.
+        for j in np.flatnonzero(draws["concept_drift"] < CONCEPT_DRIFT_PROBABILITY):
+            concepts = self.concepts[idx[j]]
+            new_c = DRIFT_CONCEPTS[draws["concept"][j]]
+            if new_c not in concepts:
+                concepts.append(new_c)
+            if len(concepts) > MAX_CONCEPTS:
+                concepts.pop(0)
+
+    def evolve(self, idx: np.ndarray, kind: str, values: np.ndarray, rng: Optional[np.random.Generator] = None,
+               draws: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Batched Personality.evolve: apply a 'critique' (values = scores) or
+        'feedback' (values = liked) experience to artists idx, then random drift.
+        """
+        idx = np.asarray(idx)
+        if kind == "critique":
+            self.apply_critique(idx, values)
+        elif kind == "feedback":
+            self.apply_feedback(idx, values)
+        else:
+            raise ValueError(f"Unknown experience type: {kind}")
+
+        if draws is None:
+            draws = self.draw(len(idx), rng if rng is not None else np.random.default_rng())
+        drifting = draws["drift"] < DRIFT_PROBABILITY
+        if drifting.any():
+            self.apply_drift(idx[drifting], {k: v[drifting] for k, v in draws.items()})
@@ -0,0 +1,165 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Rough heuristic for Gemini tokenization of English prose: ~4 characters per token.
+CHARS_PER_TOKEN = 4
+
+# Default token budgets for the flexible (trimmable) parts of a prompt.
+DEFAULT_TOKEN_BUDGET = 700
+DEFAULT_EXCERPT_TOKENS = 150
+DEFAULT_MEMORY_TOKENS = 0
+
+ELLIPSIS = "..."
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a piece of text."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def fit_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Trim text so that it fits in max_tokens, cutting at a word boundary
+    and marking the cut with an ellipsis.
+    """
+    if max_tokens <= 0 or not text:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    limit = max_tokens * CHARS_PER_TOKEN - len(ELLIPSIS)
+    if limit <= 0:
+        return ""
+    cut = text[:limit]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip() + ELLIPSIS
+
+
+def format_weights(values: Dict[str, float]) -> str:
+    """Render a name -> float mapping as 'joy .10, awe .50'."""
+    parts = []
+    for key, value in values.items():
+        if isinstance(value, (int, float)):
+            number = f"{value:.2f}"
+            if number.startswith("0."):
+                number = number[1:]
+            parts.append(f"{key} {number}")
+        else:
+            parts.append(f"{key} {value}")
+    return ", ".join(parts)
+
+
+def format_list(items: Iterable[Any]) -> str:
+    return ", ".join(str(item) for item in items)
+
+
+def format_preferences(preferences: Dict[str, Any]) -> str:
+    """Render preferences as 'aesthetic: x; themes: a, b'."""
+    parts = []
+    for key, value in preferences.items():
+        if isinstance(value, (list, tuple)):
+            value = format_list(value)
+        parts.append(f"{key}: {value}")
+    return "; ".join(parts)
+
+
+def render_personality(personality: Any, fields: Iterable[str] = ("traits", "emotions", "concepts", "preferences")) -> List[str]:
+    """
+    Render the requested parts of a personality as compact prompt lines.
+    Supported fields: traits, emotions, concepts, preferences, aesthetic, confidence.
+    """
+    lines = []
+    for field in fields:
+        if field == "traits":
+            lines.append(f"Traits: {format_weights(personality.traits)}")
+        elif field == "emotions":
+            lines.append(f"Emotions: {format_weights(personality.emotions)}")
+        elif field == "concepts":
+            lines.append(f"Obsessions: {format_list(personality.concepts)}")
+        elif field == "preferences":
+            lines.append(f"Preferences: {format_preferences(personality.preferences)}")
+        elif field == "aesthetic":
+            lines.append(f"Aesthetic: {personality.preferences.get('aesthetic')}")
+        elif field == "confidence":
+            lines.append(f"Confidence: {personality.confidence:.2f} (0 = insecure, 1 = arrogant)")
+        else:
+            raise ValueError(f"Unknown personality field: {field}")
+    return lines
+
+
+def render_recalled(items: List[Dict[str, Any]], max_tokens: int) -> str:
+    """
+    Render recalled creations and critiques (see core.recall), most relevant
+    first, as short bullet lines within max_tokens.
+    """
+    if max_tokens <= 0 or not items:
+        return ""
+
+    lines = []
+    used = 0
+    per_item = max(16, max_tokens // len(items))
+    for item in items:
+        text = item.get("text", "")
+        if item.get("kind") == "critique":
+            text = f"{item.get('critic') or 'a critic'} said: {text}"
+        if item.get("score") is not None:
+            text = f"(score {item['score']:.2f}) {text}"
+        line = "- " + fit_to_tokens(text, min(per_item, max_tokens - used))
+        cost = estimate_tokens(line)
+        if line == "- " or used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines)
+
+
+class PromptBuilder:
+    """
+    Assembles a prompt from fixed lines and trimmable sections.
+
+    Fixed lines are always included. Trimmable sections (artwork excerpts,
+    memory context) each have their own cap and share whatever is left of
+    the overall token budget, in the order they were added.
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self._parts: List[Tuple[str, Any]] = []
+
+    def line(self, text: str) -> 'PromptBuilder':
+        self._parts.append(("fixed", text))
+        return self
+
+    def lines(self, texts: Iterable[str]) -> 'PromptBuilder':
+        for text in texts:
+            self.line(text)
+        return self
+
+    def blank(self) -> 'PromptBuilder':
+        return self.line("")
+
+    def section(self, text: str, max_tokens: Optional[int] = None, prefix: str = "", suffix: str = "") -> 'PromptBuilder':
+        """Add a trimmable section. Empty sections are dropped entirely."""
+        self._parts.append(("flex", (text or "", max_tokens, prefix, suffix)))
+        return self
+
+    def build(self) -> str:
+        fixed_tokens = sum(estimate_tokens(text) + 1 for kind, text in self._parts if kind == "fixed")
+        remaining = max(0, self.token_budget - fixed_tokens)
+
+        out = []
+        for kind, value in self._parts:
+            if kind == "fixed":
+                out.append(value)
+                continue
+            text, cap, prefix, suffix = value
+            limit = remaining if cap is None else min(cap, remaining)
+            trimmed = fit_to_tokens(text, limit)
+            if not trimmed:
+                continue
+            remaining -= estimate_tokens(trimmed)
+            out.append(f"{prefix}{trimmed}{suffix}")
+        return "\n".join(out)
@@ -0,0 +1,223 @@
+"""
+Relevant-memory retrieval for prompts.
+
+An artist's creations and the critiques they received are indexed by
+keyword: words from the text and the concepts involved. recall() scores
+past items against the artist's current concepts and mood (and, for a
+critique, the work being judged) and returns the best k:
+
+    items = recall(memory, personality, k=4, text=artwork)
+    prompt_section = render_recalled(items, max_tokens=120)
+
+Lookups cost the same at any history size: each keyword keeps postings for
+only its POSTINGS_PER_TERM newest items, a query has a bounded number of
+keywords, and the best k come from a heap rather than a full sort. Indexes
+are built once per memory file and kept current through Memory's write
+hooks; a memory.json changed some other way is reindexed on next use.
+"""
+import os
+import re
+import math
+import heapq
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from core import memory as memory_module
+from core.artifacts import parse_marker
+from core.critique_parser import EMOTIONS
+
+DEFAULT_K = 4
+POSTINGS_PER_TERM = 128
+# Characters of each item's text kept for rendering
+EXCERPT_CHARS = 320
+MAX_QUERY_TERMS = 24
+CONCEPT_WEIGHT = 2.0
+MOOD_WEIGHT = 1.0
+TEXT_WEIGHT = 1.0
+# Added to the keyword score: newer and better-received items win ties
+RECENCY_WEIGHT = 0.5
+RECENCY_HALF_LIFE = 50
+SCORE_WEIGHT = 0.5
+
+STOPWORDS = frozenset("""
+about above after again against also among because been before being below between both cannot could does doing down
+during each every from further have having here into itself just more most much must only other over same should some
+such than that their them then there these they this those through under until very were what when where which while
+will with without would your yours yourself piece work score critique""".split())
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def keywords(text: str) -> Set[str]:
+    """Content words of text: lower case, four letters or more or an emotion name, no stopwords."""
+    return {word for word in _WORD.findall(text.lower())
+            if (len(word) > 3 or word in EMOTIONS) and word not in STOPWORDS}
+
+
+def concept_terms(concepts: Optional[Iterable[str]]) -> Set[str]:
+    """Every word of the given concepts, moods or emotions; short ones such as "joy" or "god" count too."""
+    terms = set()
+    for concept in concepts or ():
+        terms.update(_WORD.findall(concept.lower()))
+    return terms
+
+
+def _excerpt(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= EXCERPT_CHARS else text[:EXCERPT_CHARS]
+
+
+class MemoryIndex:
+    """Keyword index over one memory's creations and critiques. Not thread-safe; the module lock guards it."""
+
+    def __init__(self):
+        # Items in the order they were written: {"kind", "creation", "critique", "text", "score", "critic", "concepts"}
+        self.items: List[Dict[str, Any]] = []
+        self._postings: Dict[str, deque] = {}
+        # Document frequency over all items, not just the postings kept
+        self._df: Dict[str, int] = {}
+        # Creation index -> its item
+        self._creation_items: Dict[int, int] = {}
+        self.mtime_ns: Optional[int] = None
+
+    @classmethod
+    def from_memory(cls, memory) -> 'MemoryIndex':
+        """Index memory's creations and critiques in the order they were written, as the write hooks would have."""
+        writes = []
+        for i, creation in enumerate(memory.creations):
+            writes.append((creation.get("timestamp", 0), i, -1))
+            writes.extend((critique.get("timestamp", 0), i, k) for k, critique in enumerate(creation.get("critiques") or []))
+        index = cls()
+        for _, i, k in sorted(writes):
+            creation = memory.creations[i]
+            if k < 0:
+                index.add_creation(i, creation)
+            else:
+                index.add_critique(i, k, creation["critiques"][k])
+        return index
+
+    @property
+    def creations(self) -> int:
+        return len(self._creation_items)
+
+    def _add(self, item: Dict[str, Any], terms: Set[str]):
+        key = len(self.items)
+        self.items.append(item)
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = deque(maxlen=POSTINGS_PER_TERM)
+            posting.append(key)
+            self._df[term] = self._df.get(term, 0) + 1
+
+    def add_creation(self, index: int, creation: Dict[str, Any]):
+        content = creation.get("content", "")
+        artifact = creation.get("artifact")
+        marker = parse_marker(content) if artifact is None else (artifact["kind"], artifact["path"])
+        concepts = list((creation.get("metadata") or {}).get("concepts") or [])
+        text = f"an {marker[0].upper()} piece" if marker else _excerpt(content)
+        item = {"kind": "creation", "creation": index, "critique": None, "text": text,
+                "score": None, "critic": None, "concepts": concepts}
+        self._creation_items[index] = len(self.items)
+        self._add(item, concept_terms(concepts) | (set() if marker else keywords(content)))
+
+    def add_critique(self, creation_index: int, critique_index: int, critique: Dict[str, Any]):
+        text = critique.get("critique", "")
+        item = {"kind": "critique", "creation": creation_index, "critique": critique_index, "text": _excerpt(text),
+                "score": critique.get("score"), "critic": critique.get("critic"), "concepts": critique.get("concepts") or []}
+        if creation_index in self._creation_items:
+            # The creation is ranked by its latest reception
+            self.items[self._creation_items[creation_index]]["score"] = critique.get("score")
+        self._add(item, keywords(text) | concept_terms(item["concepts"]))
+
+    def top(self, weights: Dict[str, float], k: int = DEFAULT_K) -> List[Dict[str, Any]]:
+        """The k items with the highest weighted keyword match (IDF-scaled), recency and score."""
+        if not self.items or k <= 0:
+            return []
+        total = len(self.items)
+        matched: Dict[int, float] = {}
+        for term, weight in weights.items():
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + total / self._df[term])
+            for key in posting:
+                matched[key] = matched.get(key, 0.0) + weight * idf
+        newest = total - 1
+
+        def rank(key):
+            item = self.items[key]
+            recency = RECENCY_WEIGHT * 0.5 ** ((newest - key) / RECENCY_HALF_LIFE)
+            return matched[key] + recency + SCORE_WEIGHT * (item["score"] or 0.0)
+
+        return [self.items[key] for key in heapq.nlargest(k, matched, key=rank)]
+
+
+_indexes: Dict[str, MemoryIndex] = {}
+_lock = threading.Lock()
+
+
+def _mtime(memory) -> Optional[int]:
+    try:
+        return os.stat(memory.filepath).st_mtime_ns
+    except OSError:
+        return None
+
+
+def index_for(memory) -> MemoryIndex:
+    """The index of memory's file, built on first use and rebuilt if the file changed without this process seeing it."""
+    key = os.path.abspath(memory.filepath)
+    mtime = _mtime(memory)
+    with _lock:
+        index = _indexes.get(key)
+        if index is None or index.creations != len(memory.creations) or index.mtime_ns != mtime:
+            index = _indexes[key] = MemoryIndex.from_memory(memory)
+            index.mtime_ns = mtime
+        return index
+
+
+def _on_write(memory, creation_index: int, critique_index: Optional[int]):
+    key = os.path.abspath(memory.filepath)
+    with _lock:
+        index = _indexes.get(key)
+        if index is None:
+            return
+        creation = memory.creations[creation_index]
+        expected = len(memory.creations) - (critique_index is None)
+        if index.creations != expected:
+            # Out of step (writes from another Memory); rebuilt on next use
+            del _indexes[key]
+            return
+        if critique_index is None:
+            index.add_creation(creation_index, creation)
+        else:
+            index.add_critique(creation_index, critique_index, creation["critiques"][critique_index])
+        index.mtime_ns = _mtime(memory)
+
+
+memory_module.write_hooks.append(_on_write)
+
+
+def query_weights(personality: Any = None, text: str = "") -> Dict[str, float]:
+    """Keyword weights for a query: the artist's concepts, mood and strongest emotions, and keywords of text."""
+    weights: Dict[str, float] = {}
+    if personality is not None:
+        for term in concept_terms(personality.concepts):
+            weights[term] = weights.get(term, 0.0) + CONCEPT_WEIGHT
+        moods = [personality.mood] + [e for e, v in sorted(personality.emotions.items(), key=lambda kv: -kv[1])[:2]]
+        for term in concept_terms(moods):
+            weights[term] = weights.get(term, 0.0) + MOOD_WEIGHT
+    for term in sorted(keywords(text))[:MAX_QUERY_TERMS]:
+        weights[term] = weights.get(term, 0.0) + TEXT_WEIGHT
+    return weights
+
+
+def recall(memory, personality: Any = None, k: int = DEFAULT_K, text: str = "") -> List[Dict[str, Any]]:
+    """The k past creations and critiques in memory most relevant to personality's current state and text."""
+    weights = query_weights(personality, text)
+    if not weights:
+        return []
+    index = index_for(memory)
+    with _lock:
+        return index.top(weights, k)
@@ -0,0 +1,164 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+Pair = Tuple[int, int]
+
+
+class FeistelPermutation:
+    """
+    A random permutation of range(n) computed on demand: a keyed Feistel
+    network over the smallest even-width bit domain holding n, cycle-walked
+    until the result falls in range. O(1) memory and O(1) expected time per
+    index, so a shuffled order over a million artists never has to be
+    materialized, and any artist can follow any other in it.
+    """
+
+    ROUNDS = 4
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, n: int, rng: Any = random):
+        self.n = n
+        self.half_bits = max(1, ((n - 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+        self.keys = [rng.getrandbits(64) for _ in range(self.ROUNDS)]
+
+    def _mix(self, key: int, x: int) -> int:
+        h = (x * 0x9E3779B97F4A7C15 + key) & self._MASK64
+        h ^= h >> 29
+        h = (h * 0xBF58476D1CE4E5B9) & self._MASK64
+        h ^= h >> 32
+        return h & self.half_mask
+
+    def _encrypt(self, x: int) -> int:
+        left, right = x >> self.half_bits, x & self.half_mask
+        for key in self.keys:
+            left, right = right, left ^ self._mix(key, right)
+        return (left << self.half_bits) | right
+
+    def __getitem__(self, i: int) -> int:
+        # The domain is under 4n, so this takes a few steps on average
+        x = self._encrypt(i)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
+
+
+def _other(n: int, critic: int, rng: Any) -> int:
+    """A uniformly random index in range(n) other than critic."""
+    subject = rng.randrange(n - 1)
+    return subject + 1 if subject >= critic else subject
+
+
+class PairScheduler(ABC):
+    """
+    Streams (critic, subject) index pairs over n artists. Never yields a
+    self-pair; each pair costs O(1) time and memory. count defaults to n.
+    """
+
+    def __init__(self, rng: Any = random):
+        self.rng = rng
+
+    def pairs(self, n: int, count: Optional[int] = None) -> Iterator[Pair]:
+        if n < 2:
+            raise ValueError(f"Need at least 2 artists to pair, got {n}")
+        return self._pairs(n, n if count is None else count)
+
+    @abstractmethod
+    def _pairs(self, n: int, count: int) -> Iterator[Pair]:
+        pass
+
+
+class RingScheduler(PairScheduler):
+    """Artists in a shuffled circle, each critiquing the next; wraps into a new circle after n pairs."""
+
+    def _pairs(self, n, count):
+        for k in range(count):
+            if k % n == 0:
+                perm = FeistelPermutation(n, self.rng)
+            yield perm[k % n], perm[(k + 1) % n]
+
+
+class UniformScheduler(PairScheduler):
+    """
+    Critics drawn without replacement, in a fresh random order per round of
+    n pairs; each subject drawn uniformly from the others.
+    """
+
+    def _pairs(self, n, count):
+        for k in range(count):
+            if k % n == 0:
+                perm = FeistelPermutation(n, self.rng)
+            critic = perm[k % n]
+            yield critic, _other(n, critic, self.rng)
+
+
+class FairScheduler(PairScheduler):
+    """
+    Round-robin: in every round of n pairs each artist critiques exactly once
+    and is critiqued exactly once, in a fresh random order per round.
+    """
+
+    def _pairs(self, n, count):
+        for k in range(count):
+            if k % n == 0:
+                perm = FeistelPermutation(n, self.rng)
+                shift = self.rng.randrange(1, n)
+            yield perm[k % n], perm[(k % n + shift) % n]
+
+
+class AffinityScheduler(PairScheduler):
+    """
+    Critics are uniform; with probability `affinity` the subject is someone
+    who shares one of the critic's concepts, otherwise anyone. Concept
+    buckets are built once, so each pair is O(1) expected.
+    """
+
+    # Draws from a concept bucket before falling back to a uniform subject
+    # (e.g. when the critic is the only artist holding that concept).
+    MAX_TRIES = 4
+
+    def __init__(self, concepts: Sequence[Sequence[str]], affinity: float = 0.7, rng: Any = random):
+        super().__init__(rng)
+        self.concepts = concepts
+        self.affinity = affinity
+        self.buckets: Dict[str, List[int]] = {}
+        for i, artist_concepts in enumerate(concepts):
+            for concept in set(artist_concepts):
+                self.buckets.setdefault(concept, []).append(i)
+
+    def _subject(self, n: int, critic: int) -> int:
+        critic_concepts = self.concepts[critic]
+        if critic_concepts and self.rng.random() < self.affinity:
+            for _ in range(self.MAX_TRIES):
+                bucket = self.buckets[self.rng.choice(critic_concepts)]
+                subject = bucket[self.rng.randrange(len(bucket))]
+                if subject != critic:
+                    return subject
+        return _other(n, critic, self.rng)
+
+    def _pairs(self, n, count):
+        if n != len(self.concepts):
+            raise ValueError(f"Scheduler was built for {len(self.concepts)} artists, asked to pair {n}")
+        for _ in range(count):
+            critic = self.rng.randrange(n)
+            yield critic, self._subject(n, critic)
+
+
+SCHEDULERS = {
+    "ring": RingScheduler,
+    "random": UniformScheduler,
+    "fair": FairScheduler,
+    "affinity": AffinityScheduler,
+}
+
+
+def make_scheduler(kind: str, rng: Any = random, concepts: Optional[Sequence[Sequence[str]]] = None) -> PairScheduler:
+    """Build a pair scheduler by name. 'affinity' needs each artist's concepts, in artist order."""
+    if kind not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler: {kind} (choose from {', '.join(SCHEDULERS)})")
+    if kind == "affinity":
+        if concepts is None:
+            raise ValueError("The affinity scheduler needs each artist's concepts")
+        return AffinityScheduler(concepts, rng=rng)
+    return SCHEDULERS[kind](rng=rng)
@@ -0,0 +1,374 @@
+"""
+Full-text search over every artist's creations and critiques.
+
+The index is an SQLite database (artists/search.db by default) with one
+document per creation and per critique: its text, the critic's name and the
+concepts involved, in an FTS5 table, plus a plain table of artist, critic,
+score and time for filtering. attach() keeps it current by
+indexing each creation or critique as Memory saves it; sync() catches up on
+artists whose memory.json changed some other way (another process, an older
+run) by reindexing just those artists.
+
+    index = SearchIndex("artists")
+    index.sync()
+    index.attach()
+    index.search("void static", critic="riot", min_score=0.5, page=2)
+"""
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core import memory as memory_module
+from core.artifacts import parse_marker
+
+INDEX_FILENAME = "search.db"
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+# Ranking: BM25 term-frequency saturation and length normalization, with
+# these weights for hits in the text, critic and concepts columns
+RANK_WEIGHTS = (1.0, 2.0, 2.0)
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_TOKENS = 16
+# Ranked queries score at most this many of the newest matches, so a common
+# word costs about the same at any index size; rarer queries are ranked in full
+CANDIDATES = 1000
+
+_TERM = re.compile(r"(\w+)(\*?)")
+_HIT = "\x01"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    artist TEXT NOT NULL,
+    creation INTEGER NOT NULL,
+    critique INTEGER NOT NULL,  -- -1 for the creation itself
+    critic TEXT,
+    score REAL,
+    timestamp REAL,
+    UNIQUE (artist, creation, critique)
+);
+CREATE INDEX IF NOT EXISTS docs_time ON docs (timestamp);
+CREATE INDEX IF NOT EXISTS docs_artist_time ON docs (artist, timestamp);
+CREATE INDEX IF NOT EXISTS docs_critic_time ON docs (critic, timestamp);
+-- artist is indexed too so that artist filters intersect posting lists
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5 (
+    text, critic, concepts, artist, prefix = '2 3', tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS artists (
+    name TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+def default_index_path(artists_dir: str) -> str:
+    return os.path.join(artists_dir, INDEX_FILENAME)
+
+
+def _phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def match_expression(query: str, artist: Optional[str] = None, critic: Optional[str] = None) -> str:
+    """
+    FTS5 query for free text (every word must match in the text, critic or
+    concepts; a trailing * makes a word a prefix) and the artist and critic
+    filters. Empty if there is nothing to match.
+    """
+    words = " ".join(_phrase(word) + star for word, star in _TERM.findall(query.lower()))
+    parts = [f"{{text critic concepts}} : ({words})"] if words else []
+    if artist is not None:
+        parts.append(f"artist : {_phrase(artist)}")
+    if critic is not None:
+        parts.append(f"critic : {_phrase(critic)}")
+    return " AND ".join(parts)
+
+
+def _creation_doc(creation: Dict[str, Any]) -> Tuple[str, Optional[float]]:
+    # Visual pieces have no text of their own beyond the file marker
+    content = creation.get("content", "")
+    text = "" if creation.get("artifact") or parse_marker(content) else content
+    critiques = creation.get("critiques") or []
+    return text, critiques[-1].get("score") if critiques else None
+
+
+def _rank(candidates: List[tuple]) -> List[Tuple[int, float]]:
+    """
+    (id, relevance) for (id, text, critic, concepts) rows with matches marked
+    by highlight(), best first. BM25 without the IDF factor: every candidate
+    contains every query word, and document frequencies would cost a scan of
+    each word's full posting list.
+    """
+    # Length in words, approximated by spaces: a regex tokenizer costs more than the query
+    lengths = [[column.count(" ") + 1 for column in row[1:]] for row in candidates]
+    averages = [max(1.0, sum(column) / len(lengths)) for column in zip(*lengths)] if lengths else []
+    ranked = []
+    for row, row_lengths in zip(candidates, lengths):
+        score = 0.0
+        for weight, column, length, average in zip(RANK_WEIGHTS, row[1:], row_lengths, averages):
+            hits = column.count(_HIT)
+            if hits:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+                score += weight * hits * (BM25_K1 + 1) / (hits + norm)
+        ranked.append((row[0], round(score, 4)))
+    # Stable sort: equally relevant documents stay newest first
+    ranked.sort(key=lambda item: -item[1])
+    return ranked
+
+
+class SearchIndex:
+    """Inverted index over one artists directory. Safe to share between threads."""
+
+    def __init__(self, artists_dir: str, path: Optional[str] = None):
+        self.artists_dir = artists_dir
+        self.path = path or default_index_path(artists_dir)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA busy_timeout = 5000")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._hook = None
+
+    def close(self):
+        self.detach()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Writing -------------------------------------------------------------
+
+    def _put(self, artist: str, creation: int, critique: int, text: str, critic: Optional[str],
+             concepts: Iterable[str], score: Optional[float], timestamp: float):
+        row = self._conn.execute("SELECT id FROM docs WHERE artist = ? AND creation = ? AND critique = ?",
+                                 (artist, creation, critique)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM docs_fts WHERE rowid = ?", row)
+            self._conn.execute("DELETE FROM docs WHERE id = ?", row)
+        cursor = self._conn.execute(
+            "INSERT INTO docs (artist, creation, critique, critic, score, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            (artist, creation, critique, critic, score, timestamp))
+        self._conn.execute("INSERT INTO docs_fts (rowid, text, critic, concepts, artist) VALUES (?, ?, ?, ?, ?)",
+                           (cursor.lastrowid, text, critic or "", " ".join(concepts or ()), artist))
+
+    def _put_creation(self, artist: str, index: int, creation: Dict[str, Any]):
+        text, score = _creation_doc(creation)
+        self._put(artist, index, -1, text, None, (creation.get("metadata") or {}).get("concepts"),
+                  score, creation.get("timestamp", 0))
+
+    def _put_critique(self, artist: str, index: int, k: int, critique: Dict[str, Any]):
+        self._put(artist, index, k, critique.get("critique", ""), critique.get("critic"), critique.get("concepts"),
+                  critique.get("score"), critique.get("timestamp", 0))
+
+    def _mark_synced(self, artist: str):
+        try:
+            mtime = os.stat(os.path.join(self.artists_dir, artist, "memory.json")).st_mtime_ns
+        except FileNotFoundError:
+            return
+        self._conn.execute("INSERT OR REPLACE INTO artists (name, mtime_ns) VALUES (?, ?)", (artist, mtime))
+
+    def add(self, artist: str, memory, creation_index: int, critique_index: Optional[int] = None):
+        """Index one new creation, or one new critique (which also updates the creation's score)."""
+        creation = memory.creations[creation_index]
+        with self._lock:
+            indexed, = self._conn.execute("SELECT count(*) FROM docs WHERE artist = ? AND critique = -1",
+                                          (artist,)).fetchone()
+        if indexed != len(memory.creations) - (critique_index is None):
+            # Missed writes (another process, or before attach()); this memory has them all
+            self.reindex_artist(artist, memory)
+            return
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            if critique_index is None:
+                self._put_creation(artist, creation_index, creation)
+            else:
+                self._put_critique(artist, creation_index, critique_index, creation["critiques"][critique_index])
+                self._conn.execute("UPDATE docs SET score = ? WHERE artist = ? AND creation = ? AND critique = -1",
+                                   (_creation_doc(creation)[1], artist, creation_index))
+            self._mark_synced(artist)
+
+    def reindex_artist(self, artist: str, memory):
+        """Replace everything indexed for artist with the contents of memory."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM docs_fts WHERE rowid IN (SELECT id FROM docs WHERE artist = ?)", (artist,))
+            self._conn.execute("DELETE FROM docs WHERE artist = ?", (artist,))
+            for i, creation in enumerate(memory.creations):
+                self._put_creation(artist, i, creation)
+                for k, critique in enumerate(creation.get("critiques") or []):
+                    self._put_critique(artist, i, k, critique)
+            self._mark_synced(artist)
+
+    def sync(self) -> int:
+        """Reindex artists whose memory.json changed since it was indexed and drop removed ones. Returns how many changed."""
+        with self._lock:
+            indexed = dict(self._conn.execute("SELECT name, mtime_ns FROM artists"))
+        changed = 0
+        present = set()
+        names = os.listdir(self.artists_dir) if os.path.isdir(self.artists_dir) else []
+        for name in names:
+            memory_path = os.path.join(self.artists_dir, name, "memory.json")
+            try:
+                mtime = os.stat(memory_path).st_mtime_ns
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            present.add(name)
+            if indexed.get(name) != mtime:
+                self.reindex_artist(name, memory_module.Memory(memory_path))
+                changed += 1
+        for name in set(indexed) - present:
+            with self._lock, self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM docs_fts WHERE rowid IN (SELECT id FROM docs WHERE artist = ?)", (name,))
+                self._conn.execute("DELETE FROM docs WHERE artist = ?", (name,))
+                self._conn.execute("DELETE FROM artists WHERE name = ?", (name,))
+            changed += 1
+        return changed
+
+    def attach(self):
+        """Index every creation and critique saved from now on to a memory under artists_dir."""
+        if self._hook is not None:
+            return
+        root = os.path.abspath(self.artists_dir)
+
+        def on_write(memory, creation_index, critique_index):
+            artist_dir = os.path.dirname(os.path.abspath(memory.filepath))
+            if os.path.dirname(artist_dir) != root:
+                return
+            try:
+                self.add(os.path.basename(artist_dir), memory, creation_index, critique_index)
+            except sqlite3.Error as e:
+                # The next sync() reindexes this artist
+                print(f"Search index update failed: {e}")
+
+        self._hook = on_write
+        memory_module.write_hooks.append(on_write)
+
+    def detach(self):
+        if self._hook is not None:
+            memory_module.write_hooks.remove(self._hook)
+            self._hook = None
+
+    # --- Querying ------------------------------------------------------------
+
+    def search(self, query: str = "", artist: Optional[str] = None, critic: Optional[str] = None,
+               kind: Optional[str] = None, min_score: Optional[float] = None, max_score: Optional[float] = None,
+               since: Optional[float] = None, until: Optional[float] = None,
+               page: int = 1, per_page: int = DEFAULT_PER_PAGE, total: bool = False) -> Dict[str, Any]:
+        """
+        Matches for query, best first, or the newest documents if query is
+        empty. kind is "creation" or "critique"; since and until are Unix
+        timestamps. Pages start at 1. A query matching more than CANDIDATES
+        documents is "truncated": relevance ranks only its CANDIDATES newest
+        matches, and the older ones follow them, newest first, with relevance
+        None. "total" counts the matches; for a truncated query only if total
+        is set, since counting costs a pass over every match.
+        """
+        start = time.perf_counter()
+        page = max(1, page)
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        where: List[str] = []
+        params: List[Any] = []
+        for clause, value in (("d.artist = ?", artist), ("d.critic = ?", critic),
+                              ("d.score >= ?", min_score), ("d.score <= ?", max_score),
+                              ("d.timestamp >= ?", since), ("d.timestamp <= ?", until)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        if kind == "creation":
+            where.append("d.critique = -1")
+        elif kind == "critique":
+            where.append("d.critique >= 0")
+        conditions = "".join(" AND " + clause for clause in where)
+        # One extra row tells whether there is a next page without counting every match
+        page_params = [per_page + 1, (page - 1) * per_page]
+
+        ranked = bool(_TERM.search(query))
+        with self._lock:
+            if ranked:
+                # Artist and critic are FTS terms here; the SQL conditions recheck them exactly
+                expression = match_expression(query, artist, critic)
+                matches = f"FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid WHERE docs_fts MATCH ?{conditions}"
+                candidates = self._conn.execute(
+                    f"SELECT d.id, {', '.join(f'highlight(docs_fts, {c}, char(1), char(2))' for c in range(3))} "
+                    f"{matches} ORDER BY docs_fts.rowid DESC LIMIT ?",
+                    [expression, *params, CANDIDATES + 1]).fetchall()
+                truncated = len(candidates) > CANDIDATES
+                candidates = candidates[:CANDIDATES]
+                limit, offset = page_params
+                ids = _rank(candidates)[offset:offset + limit]
+                if not truncated:
+                    matched = len(candidates)
+                elif total:
+                    matched, = self._conn.execute(f"SELECT count(*) {matches}", [expression, *params]).fetchone()
+                if truncated and len(ids) < limit:
+                    # Past the ranked window, the older matches follow newest first, unranked
+                    ids += self._conn.execute(
+                        f"SELECT d.id, NULL {matches} ORDER BY docs_fts.rowid DESC LIMIT ? OFFSET ?",
+                        [expression, *params, limit - len(ids), max(offset, CANDIDATES)]).fetchall()
+            else:
+                ids = self._conn.execute(
+                    f"SELECT d.id, NULL FROM docs d WHERE 1{conditions} ORDER BY d.timestamp DESC LIMIT ? OFFSET ?",
+                    params + page_params).fetchall()
+            has_more = len(ids) > per_page
+            ids = ids[:per_page]
+            results = self._details([i for i, _ in ids], expression if ranked else None)
+
+        for result, (_, score) in zip(results, ids):
+            result["relevance"] = score
+        response = {
+            "query": query,
+            "page": page,
+            "per_page": per_page,
+            "has_more": has_more,
+            "results": results,
+            "took_ms": (time.perf_counter() - start) * 1000
+        }
+        if ranked:
+            response["truncated"] = truncated
+            if total or not truncated:
+                response["total"] = matched
+        return response
+
+    def _details(self, ids: List[int], expression: Optional[str]) -> List[Dict[str, Any]]:
+        """Metadata and a text snippet (highlighting expression's matches) for one page of document ids, in order."""
+        if not ids:
+            return []
+        marks = ", ".join("?" * len(ids))
+        docs = {row[0]: row[1:] for row in self._conn.execute(
+            f"SELECT id, artist, creation, critique, critic, score, timestamp FROM docs WHERE id IN ({marks})", ids)}
+        if expression:
+            snippets = dict(self._conn.execute(
+                f"SELECT rowid, snippet(docs_fts, 0, '[', ']', '...', {SNIPPET_TOKENS}) FROM docs_fts "
+                f"WHERE docs_fts MATCH ? AND rowid IN ({marks})", [expression, *ids]))
+        else:
+            snippets = dict(self._conn.execute(
+                f"SELECT rowid, substr(text, 1, 200) FROM docs_fts WHERE rowid IN ({marks})", ids))
+        results = []
+        for doc_id in ids:
+            artist, creation, critique, critic, score, timestamp = docs[doc_id]
+            results.append({
+                "artist": artist,
+                "creation": creation,
+                "kind": "creation" if critique < 0 else "critique",
+                "critique": None if critique < 0 else critique,
+                "critic": critic,
+                "score": score,
+                "timestamp": timestamp,
+                "snippet": snippets.get(doc_id, "")
+            })
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            docs, = self._conn.execute("SELECT count(*) FROM docs").fetchone()
+            artists, = self._conn.execute("SELECT count(*) FROM artists").fetchone()
+        return {"path": self.path, "documents": docs, "artists": artists}
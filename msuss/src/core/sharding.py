@@ -0,0 +1,241 @@
+"""
+Run critique sessions across a pool of processes, one shard of artists each.
+
+Artists are assigned to shards with a consistent hash (HashRing), so adding
+a shard moves only about 1/n of the artists. Each worker process loads and
+exclusively owns its shard's personalities and memories; nothing else reads
+or writes those files while the runner is up. A critique of subject S by
+critic C passes through the owners of both, and only small messages cross
+process boundaries:
+
+    coordinator -> owner(S)   ("critique", job, C, S)
+    owner(S)    -> owner(C)   ("judge", job, C, S, creation index, excerpt)
+    owner(C)    -> owner(S)   ("receive", job, C, S, creation index, result)
+    owner(S)    -> coordinator  the finished job
+
+Model calls, critique parsing, personality updates and memory writes all
+happen inside the workers, so they run in parallel instead of contending for
+one interpreter. Critiques are pipelined: the order in which a worker sees
+the messages of different jobs depends on timing, so a sharded session is
+not reproducible step for step the way a sequential one is.
+"""
+import io
+import os
+import queue
+import bisect
+import random
+import hashlib
+import contextlib
+import multiprocessing
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.artist_manager import ArtistManager
+from core.critique import CritiqueService
+from core.dedup import pick_critique_target
+from core.prompts import fit_to_tokens, DEFAULT_EXCERPT_TOKENS
+
+DEFAULT_REPLICAS = 64
+POLL_SECONDS = 1.0
+FINISHED = ("done", "skipped", "error")
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent hashing of names onto shards 0..shards-1, with virtual nodes for balance."""
+
+    def __init__(self, shards: int, replicas: int = DEFAULT_REPLICAS):
+        if shards < 1:
+            raise ValueError("Need at least one shard")
+        self.shards = shards
+        points = sorted((_hash(f"shard-{shard}:{r}"), shard) for shard in range(shards) for r in range(replicas))
+        self._points = [p for p, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def shard_of(self, name: str) -> int:
+        i = bisect.bisect(self._points, _hash(name)) % len(self._points)
+        return self._owners[i]
+
+    def partition(self, names: Iterable[str]) -> List[List[str]]:
+        shards: List[List[str]] = [[] for _ in range(self.shards)]
+        for name in names:
+            shards[self.shard_of(name)].append(name)
+        return shards
+
+
+def _summary(personality) -> Dict[str, Any]:
+    return {
+        "name": personality.name,
+        "mood": personality.mood,
+        "confidence": personality.confidence,
+        "concepts": list(personality.concepts)
+    }
+
+
+def _worker(shard: int, names: List[str], ring: HashRing, inboxes: List[Any], results: Any, options: Dict[str, Any]):
+    """Serve one shard until told to stop. Runs in its own process."""
+    output = contextlib.nullcontext() if options["verbose"] else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        manager = ArtistManager(options["artists_dir"], record_evolution=options["record_evolution"])
+        if options["snapshot"] is not None:
+            manager.use_snapshot(options["snapshot"] or None)
+        service = CritiqueService(structured=options["structured"])
+        if options["offline"]:
+            from skills.stub_model import StubModel
+            service.skill.model = StubModel(latency=options["latency"], seed=f"{options['seed']}:{shard}")
+        rng = random.Random(f"{options['seed']}:{shard}")
+
+        artists = {}
+        for name in names:
+            personality, memory, artist_dir = manager.load_artist(name)
+            personality.rng = random.Random(f"{options['seed']}:{name}")
+            artists[name] = {"personality": personality, "memory": memory, "dir": artist_dir}
+        inbox = inboxes[shard]
+        results.put(("ready", shard, len(artists)))
+
+        while True:
+            message = inbox.get()
+            kind = message[0]
+            if kind == "stop":
+                results.put(("stopped", shard, {name: _summary(a["personality"]) for name, a in artists.items()}))
+                return
+            job, critic_name, subject_name = message[1:4]
+            try:
+                if kind == "critique":
+                    creations = artists[subject_name]["memory"].creations
+                    if not creations:
+                        results.put(("skipped", job, critic_name, subject_name))
+                        continue
+                    idx = pick_critique_target(creations, rng)
+                    excerpt = fit_to_tokens(creations[idx].get("content", ""), options["excerpt_tokens"])
+                    inboxes[ring.shard_of(critic_name)].put(("judge", job, critic_name, subject_name, idx, excerpt))
+                elif kind == "judge":
+                    idx, excerpt = message[4:]
+                    critic = artists[critic_name]
+                    result = service.generate_critique(critic["personality"], excerpt, critic["memory"])
+                    if critic["personality"].absorb_critique(result):
+                        manager.save_artist(critic_name, critic)
+                    inboxes[ring.shard_of(subject_name)].put(("receive", job, critic_name, subject_name, idx, result))
+                elif kind == "receive":
+                    idx, result = message[4:]
+                    subject = artists[subject_name]
+                    changed = subject["personality"].receive_critique(result["score"])
+                    service.save_critique_to_memory(subject, critic_name, result["critique"], result["score"], creation_index=idx,
+                                                    concepts=result.get("new_concepts"))
+                    if changed:
+                        manager.save_artist(subject_name, subject)
+                    results.put(("done", job, critic_name, subject_name, result))
+                else:
+                    raise ValueError(f"Unknown shard message: {kind}")
+            except Exception as e:
+                results.put(("error", job, critic_name, subject_name, f"{type(e).__name__}: {e}"))
+
+
+class ShardedRunner:
+    """
+    A pool of shard workers over the artists in artists_dir. Use as a
+    context manager; critiques() streams finished jobs and close() (or
+    leaving the with block) returns each artist's final state.
+    """
+
+    def __init__(self, artists_dir: str = "artists", processes: Optional[int] = None, names: Optional[List[str]] = None,
+                 seed: Any = 0, offline: bool = False, latency: float = 0.0, structured: bool = False,
+                 excerpt_tokens: int = DEFAULT_EXCERPT_TOKENS, snapshot: Optional[str] = None,
+                 record_evolution: bool = False, verbose: bool = False, max_in_flight: Optional[int] = None):
+        self.processes = processes or os.cpu_count() or 1
+        self.names = sorted(names if names is not None else ArtistManager(artists_dir).discover_artists())
+        self.ring = HashRing(self.processes)
+        self.shards = self.ring.partition(self.names)
+        # Jobs submitted but not finished; bounds queue growth on long sessions
+        self.max_in_flight = max_in_flight or 8 * self.processes
+        self.final_states: Optional[Dict[str, Dict[str, Any]]] = None
+        self._pending = 0
+
+        options = {
+            "artists_dir": artists_dir, "seed": seed, "offline": offline, "latency": latency,
+            "structured": structured, "excerpt_tokens": excerpt_tokens, "snapshot": snapshot,
+            "record_evolution": record_evolution, "verbose": verbose
+        }
+        self._results = multiprocessing.Queue()
+        self._inboxes = [multiprocessing.Queue() for _ in range(self.processes)]
+        self._workers = [
+            multiprocessing.Process(target=_worker, args=(shard, names, self.ring, self._inboxes, self._results, options), daemon=True)
+            for shard, names in enumerate(self.shards)
+        ]
+        for worker in self._workers:
+            worker.start()
+        for _ in self._workers:
+            self._receive("ready")
+
+    def __enter__(self) -> 'ShardedRunner':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _receive(self, *expected: str) -> Tuple:
+        while True:
+            try:
+                message = self._results.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                dead = [i for i, w in enumerate(self._workers) if not w.is_alive()]
+                if dead:
+                    self.terminate()
+                    raise RuntimeError(f"Shard worker(s) {dead} exited unexpectedly")
+                continue
+            if message[0] in expected:
+                return message
+
+    def critiques(self, pairs: Iterable[Tuple[str, str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Run a critique for every (critic, subject) pair and yield each as it
+        finishes: {"critic", "subject", "status": "done" | "skipped" | "error",
+        plus "result" or "error"}. Completion order is not submission order.
+        """
+        pairs = iter(pairs)
+        job = 0
+        exhausted = False
+        while True:
+            while not exhausted and self._pending < self.max_in_flight:
+                pair = next(pairs, None)
+                if pair is None:
+                    exhausted = True
+                    break
+                critic, subject = pair
+                self._inboxes[self.ring.shard_of(subject)].put(("critique", job, critic, subject))
+                job += 1
+                self._pending += 1
+            if not self._pending:
+                return
+            status, _, critic, subject, *rest = self._receive(*FINISHED)
+            self._pending -= 1
+            finished = {"critic": critic, "subject": subject, "status": status}
+            if status == "done":
+                finished["result"] = rest[0]
+            elif status == "error":
+                finished["error"] = rest[0]
+            yield finished
+
+    def close(self) -> Dict[str, Dict[str, Any]]:
+        """Stop the workers; returns {artist: {name, mood, confidence, concepts}}."""
+        if self.final_states is None:
+            # Let jobs abandoned by an unfinished critiques() loop complete, so no message is in flight
+            while self._pending:
+                self._receive(*FINISHED)
+                self._pending -= 1
+            for inbox in self._inboxes:
+                inbox.put(("stop",))
+            states: Dict[str, Dict[str, Any]] = {}
+            for _ in self._workers:
+                states.update(self._receive("stopped")[2])
+            for worker in self._workers:
+                worker.join()
+            self.final_states = {name: states[name] for name in self.names}
+        return self.final_states
+
+    def terminate(self):
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.terminate()
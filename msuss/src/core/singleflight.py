@@ -0,0 +1,98 @@
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from core import spans
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still in flight wait for it and receive the same result (or exception).
+    Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Call] = {}
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._inflight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._inflight[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                self.executed += 1
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight)
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls = 0
+            self.executed = 0
+            self.coalesced = 0
+
+
+# Shared group for model requests across all skills and services in a process.
+model_calls = SingleFlight()
+
+
+def request_key(model: Any, prompt: str, **kwargs) -> str:
+    """Key identifying a model request: the model name, the exact prompt and any call options."""
+    model_name = getattr(model, "model_name", type(model).__name__)
+    payload = prompt if not kwargs else prompt + "\0" + repr(sorted(kwargs.items()))
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest}"
+
+
+def generate_content(model: Any, prompt: str, coalesce: bool = False, group: Optional[SingleFlight] = None, **kwargs) -> Any:
+    """
+    Call model.generate_content(prompt, **kwargs), optionally sharing the call
+    with any identical request already in flight.
+    """
+    with spans.span("model"):
+        if not coalesce:
+            return model.generate_content(prompt, **kwargs)
+        group = group or model_calls
+        return group.do(request_key(model, prompt, **kwargs), lambda: model.generate_content(prompt, **kwargs))
@@ -0,0 +1,201 @@
+"""
+Whole-world snapshots: every artist's personality, memory and goal in one file.
+
+Layout (little-endian, all sections 8-byte aligned):
+
+    header   magic "MSUSSWLD", version u32, artist count u32, names length u64
+    mtimes   int64[count * 3]       source file mtimes (ns), -1 if the file was missing
+    offsets  uint64[count * 3 + 1]  blob boundaries, relative to the data section
+    names    utf-8, newline-separated, padded to 8 bytes
+    data     blobs: compact personality JSON, compact memory JSON, goal text
+
+The file is memory-mapped on open, so a cold start only parses the names;
+each artist's blobs are decoded when that artist is loaded. An artist whose
+files have changed since the snapshot was written is reported as stale and
+callers fall back to reading its files.
+"""
+import os
+import json
+import mmap
+import struct
+from typing import Any, Dict, List, Optional
+
+from core.personality import Personality
+from core.memory import Memory
+
+SNAPSHOT_MAGIC = b"MSUSSWLD"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = "world.snapshot"
+
+ARTIST_FILES = ("personality.json", "memory.json", "goal.txt")
+PERSONALITY, MEMORY, GOAL = range(len(ARTIST_FILES))
+
+_HEADER = struct.Struct("<8sIIQ")
+_MISSING = -1
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return _MISSING
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def _compact_json(raw: bytes) -> bytes:
+    return json.dumps(json.loads(raw), separators=(",", ":")).encode("utf-8")
+
+
+def default_snapshot_path(artists_dir: str) -> str:
+    return os.path.join(artists_dir, SNAPSHOT_FILE)
+
+
+def write_snapshot(artists_dir: str, path: Optional[str] = None) -> int:
+    """
+    Write a snapshot of every artist in artists_dir (default path:
+    artists_dir/world.snapshot). The file is replaced atomically.
+    Returns the number of artists written.
+    """
+    path = path or default_snapshot_path(artists_dir)
+    names = sorted(
+        name for name in os.listdir(artists_dir)
+        if os.path.isfile(os.path.join(artists_dir, name, "personality.json"))
+    )
+
+    mtimes: List[int] = []
+    blobs: List[bytes] = []
+    for name in names:
+        for filename in ARTIST_FILES:
+            file_path = os.path.join(artists_dir, name, filename)
+            # Taken before reading: a write racing with the snapshot leaves a newer mtime on disk,
+            # so the artist is treated as stale rather than silently losing the write.
+            mtime = _mtime_ns(file_path)
+            blob = b""
+            if mtime != _MISSING:
+                with open(file_path, "rb") as f:
+                    blob = f.read()
+                if filename.endswith(".json"):
+                    blob = _compact_json(blob)
+            mtimes.append(mtime)
+            blobs.append(blob)
+
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    names_bytes = "\n".join(names).encode("utf-8")
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(names), len(names_bytes)))
+        f.write(struct.pack(f"<{len(mtimes)}q", *mtimes))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        f.write(names_bytes + b"\0" * _pad(len(names_bytes)))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return len(names)
+
+
+class WorldSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file. With check=False,
+    stored artists are trusted without comparing mtimes on disk; use it only
+    when nothing has written to the artist files since the snapshot.
+    """
+
+    def __init__(self, path: str, check: bool = True):
+        self.path = path
+        self.check = check
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count, names_len = _HEADER.unpack_from(self._mm, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a world snapshot: {path}")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION}): {path}")
+
+            view = memoryview(self._mm)
+            pos = _HEADER.size
+            self._mtimes = view[pos:pos + count * 3 * 8].cast("q")
+            pos += count * 3 * 8
+            self._offsets = view[pos:pos + (count * 3 + 1) * 8].cast("Q")
+            pos += (count * 3 + 1) * 8
+            names = bytes(view[pos:pos + names_len]).decode("utf-8")
+            pos += names_len + _pad(names_len)
+            self._data_start = pos
+            view.release()
+        except Exception:
+            self.close()
+            raise
+
+        self.names: List[str] = names.split("\n") if count else []
+        self._index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def open(cls, artists_dir: str, path: Optional[str] = None, check: bool = True) -> Optional['WorldSnapshot']:
+        """Open the snapshot for artists_dir, or return None if there is none."""
+        path = path or default_snapshot_path(artists_dir)
+        if not os.path.exists(path):
+            return None
+        return cls(path, check)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def close(self):
+        for attr in ("_mtimes", "_offsets"):
+            view = self.__dict__.pop(attr, None)
+            if view is not None:
+                view.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _blob(self, name: str, artist_dir: str, which: int, check: Optional[bool]) -> Optional[bytes]:
+        """The stored file contents, or None if unknown, missing or stale on disk."""
+        i = self._index.get(name)
+        if i is None:
+            return None
+        k = i * 3 + which
+        mtime = self._mtimes[k]
+        if mtime == _MISSING:
+            return None
+        if (self.check if check is None else check) and _mtime_ns(os.path.join(artist_dir, ARTIST_FILES[which])) != mtime:
+            return None
+        start = self._data_start + self._offsets[k]
+        return self._mm[start:self._data_start + self._offsets[k + 1]]
+
+    def personality(self, name: str, artist_dir: str, check: Optional[bool] = None) -> Optional[Personality]:
+        blob = self._blob(name, artist_dir, PERSONALITY, check)
+        return None if blob is None else Personality.from_dict(json.loads(blob))
+
+    def memory(self, name: str, artist_dir: str, check: Optional[bool] = None) -> Optional[Memory]:
+        blob = self._blob(name, artist_dir, MEMORY, check)
+        return None if blob is None else Memory.from_dict(json.loads(blob), os.path.join(artist_dir, "memory.json"))
+
+    def memory_blob(self, name: str, artist_dir: str, check: Optional[bool] = None) -> Optional[bytes]:
+        """The stored memory.json bytes, unparsed (e.g. to parse in another process)."""
+        return self._blob(name, artist_dir, MEMORY, check)
+
+    def goal(self, name: str, artist_dir: str, check: Optional[bool] = None) -> Optional[str]:
+        blob = self._blob(name, artist_dir, GOAL, check)
+        return None if blob is None else blob.decode("utf-8").strip()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "version": SNAPSHOT_VERSION,
+            "artists": len(self.names),
+            "bytes": len(self._mm)
+        }
@@ -0,0 +1,243 @@
+"""
+Lightweight nested timing spans for finding where a cycle spends its time.
+
+    with spans.span("prompt"):
+        ...
+
+    @spans.traced("memory.save")
+    def _save(self): ...
+
+Spans are off by default; span() then returns a shared no-op context manager
+and traced functions make one global check before calling through. Once
+enable() is called, every span records its start, duration and time not
+spent in nested spans (self time), per thread. A Tracer exports the spans
+as Chrome trace-event JSON (open in chrome://tracing or ui.perfetto.dev) and
+keeps per-phase aggregates that stay accurate however many spans are dropped
+from the event buffer.
+"""
+import os
+import json
+import time
+import atexit
+import threading
+import functools
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_MAX_EVENTS = 500_000
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start", "child_ns")
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Optional[Dict[str, Any]]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.child_ns = 0
+
+    def __enter__(self):
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        stack = self.tracer._stack()
+        stack.pop()
+        duration = end - self.start
+        if stack:
+            stack[-1].child_ns += duration
+        if exc_type is not None:
+            self.args = dict(self.args or {}, error=exc_type.__name__)
+        self.tracer._record(self, duration)
+        return False
+
+
+class _Phase:
+    __slots__ = ("count", "total_ns", "self_ns", "max_ns", "errors")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.max_ns = 0
+        self.errors = 0
+
+
+class Tracer:
+    """Collects spans from all threads."""
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        self.max_events = max_events
+        self.origin = time.perf_counter_ns()
+        self.events: List[tuple] = []
+        self.dropped = 0
+        self.phases: Dict[str, _Phase] = {}
+        self.threads: Dict[int, str] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, args: Optional[Dict[str, Any]] = None) -> _Span:
+        return _Span(self, name, args)
+
+    def _record(self, span: _Span, duration: int):
+        thread = threading.current_thread()
+        self_ns = duration - span.child_ns
+        with self._lock:
+            phase = self.phases.get(span.name)
+            if phase is None:
+                phase = self.phases[span.name] = _Phase()
+            phase.count += 1
+            phase.total_ns += duration
+            phase.self_ns += self_ns
+            phase.max_ns = max(phase.max_ns, duration)
+            if span.args and "error" in span.args:
+                phase.errors += 1
+            if len(self.events) < self.max_events:
+                self.events.append((span.name, span.start, duration, thread.ident, span.args))
+                self.threads.setdefault(thread.ident, thread.name)
+            else:
+                self.dropped += 1
+
+    # --- Export ------------------------------------------------------------
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The recorded spans in Chrome's trace-event format."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+            dropped = self.dropped
+        trace_events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        for name, start, duration, tid, args in events:
+            event = {
+                "name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - self.origin) / 1000, "dur": duration / 1000
+            }
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": {"dropped_spans": dropped}}
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f, separators=(",", ":"))
+
+    def aggregate(self) -> List[Dict[str, Any]]:
+        """One row per phase, most self time first. Times in milliseconds."""
+        with self._lock:
+            phases = [(name, p.count, p.total_ns, p.self_ns, p.max_ns, p.errors) for name, p in self.phases.items()]
+        rows = [{
+            "phase": name,
+            "count": count,
+            "total_ms": total / 1e6,
+            "self_ms": self_ns / 1e6,
+            "mean_ms": total / count / 1e6,
+            "max_ms": max_ns / 1e6,
+            "errors": errors
+        } for name, count, total, self_ns, max_ns, errors in phases]
+        rows.sort(key=lambda row: row["self_ms"], reverse=True)
+        return rows
+
+
+def format_aggregate(rows: List[Dict[str, Any]]) -> str:
+    width = max([len("phase")] + [len(row["phase"]) for row in rows])
+    lines = [f"{'phase':<{width}} {'count':>7} {'total ms':>10} {'self ms':>10} {'mean ms':>9} {'max ms':>9}"]
+    for row in rows:
+        line = (f"{row['phase']:<{width}} {row['count']:>7} {row['total_ms']:>10.1f} {row['self_ms']:>10.1f} "
+                f"{row['mean_ms']:>9.2f} {row['max_ms']:>9.1f}")
+        if row["errors"]:
+            line += f"  ({row['errors']} failed)"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# --- Global tracer -------------------------------------------------------------
+
+_active: Optional[Tracer] = None
+
+
+def enable(max_events: int = DEFAULT_MAX_EVENTS) -> Tracer:
+    """Start recording spans (replacing any current tracer)."""
+    global _active
+    _active = Tracer(max_events)
+    return _active
+
+
+def disable() -> Optional[Tracer]:
+    """Stop recording; returns the tracer that was active, for export."""
+    global _active
+    tracer, _active = _active, None
+    return tracer
+
+
+def active() -> Optional[Tracer]:
+    return _active
+
+
+def span(name: str, **args) -> Any:
+    """Context manager timing a phase; a no-op unless spans are enabled."""
+    tracer = _active
+    if tracer is None:
+        return _NOOP
+    return tracer.span(name, args or None)
+
+
+def traced(name: str) -> Callable:
+    """Decorator: run the function inside span(name)."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _active
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def add_arguments(parser):
+    """--spans option for a command-line tool."""
+    parser.add_argument("--spans", metavar="PATH",
+                        help="Time each phase; on exit write a Chrome trace to PATH and print a per-phase table")
+
+
+def start_from_args(args) -> Optional[Tracer]:
+    if not args.spans:
+        return None
+    tracer = enable()
+    path = args.spans
+
+    def report():
+        if _active is not tracer:
+            return
+        tracer.write_chrome_trace(path)
+        print("\n--- Phase Timings ---")
+        print(format_aggregate(tracer.aggregate()))
+        print(f"Chrome trace written to {path}")
+
+    atexit.register(report)
+    return tracer
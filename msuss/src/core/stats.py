@@ -0,0 +1,288 @@
+"""
+Running score and critic statistics per artist.
+
+Each artist directory gets a stats.json holding aggregates that are updated
+as creations and critiques are saved, so reading them never walks the
+artist's history:
+
+    store = StatsStore("artists")
+    store.attach()
+    store.get("aria").summary()   # count, mean, variance, critics, series, concepts
+
+Scores are every critique's score (self-critiques included). Mean and
+variance use Welford's update. The hourly and daily series keep the last
+HOURLY_BUCKETS and DAILY_BUCKETS buckets, so the file stays the same size
+however long an artist lives. stats.json records the memory.json mtime it
+matches; if the memory was changed by a process that was not attached (or
+before stats existed), the next get() rebuilds the aggregates from it once.
+"""
+import os
+import json
+import math
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from core import memory as memory_module
+from core.artifacts import parse_marker
+
+STATS_FILENAME = "stats.json"
+STATS_VERSION = 1
+HOUR = 3600
+DAY = 24 * HOUR
+# Two weeks of hourly and a year of daily buckets
+HOURLY_BUCKETS = 14 * 24
+DAILY_BUCKETS = 366
+
+
+class Welford:
+    """Count, mean and variance of a stream of numbers in O(1) per value."""
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 low: Optional[float] = None, high: Optional[float] = None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.low = low
+        self.high = high
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.low = value if self.low is None else min(self.low, value)
+        self.high = value if self.high is None else max(self.high, value)
+
+    @property
+    def variance(self) -> float:
+        """Population variance; 0 for fewer than two values."""
+        return self.m2 / self.count if self.count > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.low, "max": self.high}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Welford':
+        return cls(data["count"], data["mean"], data["m2"], data.get("min"), data.get("max"))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "variance": self.variance,
+            "stddev": math.sqrt(self.variance),
+            "min": self.low,
+            "max": self.high
+        }
+
+
+def _bucket(series: Dict[str, list], timestamp: float, width: int, limit: int, score: float):
+    start = str(int(timestamp // width * width))
+    entry = series.get(start)
+    if entry is None:
+        if len(series) >= limit:
+            oldest = min(series, key=int)
+            if int(start) < int(oldest):
+                # Older than anything still kept
+                return
+            del series[oldest]
+        entry = series[start] = [0, 0.0]
+    entry[0] += 1
+    entry[1] += score
+
+
+def _series(series: Dict[str, list]):
+    return [{"start": int(start), "count": count, "mean": total / count}
+            for start, (count, total) in sorted(series.items(), key=lambda item: int(item[0]))]
+
+
+class ArtistStats:
+    """The aggregates for one artist."""
+
+    def __init__(self):
+        self.creations = 0
+        self.critiques = 0
+        self.kinds: Dict[str, int] = {}
+        self.scores = Welford()
+        self.critics: Dict[str, Welford] = {}
+        # Bucket start (Unix seconds, as a string for JSON) -> [count, score sum]
+        self.hourly: Dict[str, list] = {}
+        self.daily: Dict[str, list] = {}
+        self.concepts: Dict[str, int] = {}
+        self.memory_mtime_ns: Optional[int] = None
+
+    def _count_concepts(self, concepts: Optional[Iterable[str]]):
+        for concept in concepts or ():
+            self.concepts[concept] = self.concepts.get(concept, 0) + 1
+
+    def add_creation(self, creation: Dict[str, Any]):
+        self.creations += 1
+        artifact = creation.get("artifact")
+        if artifact is not None:
+            kind = artifact["kind"]
+        else:
+            marker = parse_marker(creation.get("content", ""))
+            kind = marker[0] if marker else "text"
+        self.kinds[kind] = self.kinds.get(kind, 0) + 1
+        self._count_concepts((creation.get("metadata") or {}).get("concepts"))
+
+    def add_critique(self, critique: Dict[str, Any]):
+        self.critiques += 1
+        score = critique.get("score")
+        if isinstance(score, (int, float)):
+            self.scores.add(score)
+            critic = critique.get("critic") or "unknown"
+            self.critics.setdefault(critic, Welford()).add(score)
+            timestamp = critique.get("timestamp", 0)
+            _bucket(self.hourly, timestamp, HOUR, HOURLY_BUCKETS, score)
+            _bucket(self.daily, timestamp, DAY, DAILY_BUCKETS, score)
+        self._count_concepts(critique.get("concepts"))
+
+    @classmethod
+    def from_memory(cls, memory) -> 'ArtistStats':
+        """Aggregates rebuilt from a whole memory (the only place history is walked)."""
+        stats = cls()
+        for creation in memory.creations:
+            stats.add_creation(creation)
+        # Critiques in time order, so the series keep the newest buckets
+        critiques = [c for creation in memory.creations for c in creation.get("critiques") or []]
+        critiques.sort(key=lambda c: c.get("timestamp", 0))
+        for critique in critiques:
+            stats.add_critique(critique)
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": STATS_VERSION,
+            "memory_mtime_ns": self.memory_mtime_ns,
+            "creations": self.creations,
+            "critiques": self.critiques,
+            "kinds": self.kinds,
+            "scores": self.scores.to_dict(),
+            "critics": {name: w.to_dict() for name, w in self.critics.items()},
+            "hourly": self.hourly,
+            "daily": self.daily,
+            "concepts": self.concepts
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ArtistStats':
+        stats = cls()
+        stats.memory_mtime_ns = data.get("memory_mtime_ns")
+        stats.creations = data["creations"]
+        stats.critiques = data["critiques"]
+        stats.kinds = data["kinds"]
+        stats.scores = Welford.from_dict(data["scores"])
+        stats.critics = {name: Welford.from_dict(w) for name, w in data["critics"].items()}
+        stats.hourly = data["hourly"]
+        stats.daily = data["daily"]
+        stats.concepts = data["concepts"]
+        return stats
+
+    def summary(self, series: bool = True, top_concepts: Optional[int] = None) -> Dict[str, Any]:
+        """JSON-ready view: score statistics, per-critic averages, time series and concept counts (most frequent first)."""
+        concepts = sorted(self.concepts.items(), key=lambda item: (-item[1], item[0]))
+        summary = {
+            "creations": self.creations,
+            "critiques": self.critiques,
+            "kinds": self.kinds,
+            "scores": self.scores.summary(),
+            "critics": {name: {"count": w.count, "mean": w.mean} for name, w in sorted(self.critics.items())},
+            "concepts": dict(concepts[:top_concepts] if top_concepts else concepts)
+        }
+        if series:
+            summary["hourly"] = _series(self.hourly)
+            summary["daily"] = _series(self.daily)
+        return summary
+
+
+class StatsStore:
+    """ArtistStats for every artist under artists_dir, cached in memory and persisted per artist. Thread-safe."""
+
+    def __init__(self, artists_dir: str):
+        self.artists_dir = artists_dir
+        self._cache: Dict[str, ArtistStats] = {}
+        self._lock = threading.Lock()
+        self._hook = None
+
+    def _paths(self, artist: str):
+        artist_dir = os.path.join(self.artists_dir, artist)
+        return os.path.join(artist_dir, "memory.json"), os.path.join(artist_dir, STATS_FILENAME)
+
+    def _save(self, artist: str, stats: ArtistStats):
+        memory_path, path = self._paths(artist)
+        try:
+            stats.memory_mtime_ns = os.stat(memory_path).st_mtime_ns
+        except FileNotFoundError:
+            stats.memory_mtime_ns = None
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(stats.to_dict(), f)
+        os.replace(tmp, path)
+
+    def _load(self, artist: str) -> Optional[ArtistStats]:
+        stats = self._cache.get(artist)
+        if stats is not None:
+            return stats
+        try:
+            with open(self._paths(artist)[1]) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if data.get("version") != STATS_VERSION:
+            return None
+        return ArtistStats.from_dict(data)
+
+    def get(self, artist: str) -> Optional[ArtistStats]:
+        """Current aggregates for artist, or None if it has no memory."""
+        memory_path, _ = self._paths(artist)
+        try:
+            mtime = os.stat(memory_path).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        with self._lock:
+            stats = self._load(artist)
+            if stats is None or stats.memory_mtime_ns != mtime:
+                stats = ArtistStats.from_memory(memory_module.Memory(memory_path))
+                self._save(artist, stats)
+            self._cache[artist] = stats
+            return stats
+
+    def record(self, artist: str, memory, creation_index: int, critique_index: Optional[int] = None):
+        """Fold one new creation or critique of memory into artist's aggregates and persist them."""
+        creation = memory.creations[creation_index]
+        with self._lock:
+            stats = self._load(artist)
+            if stats is None or stats.creations != len(memory.creations) - (critique_index is None):
+                # Missed writes; this memory has them all
+                stats = ArtistStats.from_memory(memory)
+            elif critique_index is None:
+                stats.add_creation(creation)
+            else:
+                stats.add_critique(creation["critiques"][critique_index])
+            self._save(artist, stats)
+            self._cache[artist] = stats
+
+    def attach(self):
+        """Update the stats of every creation and critique saved from now on to a memory under artists_dir."""
+        if self._hook is not None:
+            return
+        root = os.path.abspath(self.artists_dir)
+
+        def on_write(memory, creation_index, critique_index):
+            artist_dir = os.path.dirname(os.path.abspath(memory.filepath))
+            if os.path.dirname(artist_dir) != root:
+                return
+            try:
+                self.record(os.path.basename(artist_dir), memory, creation_index, critique_index)
+            except OSError as e:
+                # The next get() rebuilds from memory.json
+                print(f"Stats update failed: {e}")
+
+        self._hook = on_write
+        memory_module.write_hooks.append(on_write)
+
+    def detach(self):
+        if self._hook is not None:
+            memory_module.write_hooks.remove(self._hook)
+            self._hook = None
@@ -0,0 +1,186 @@
+"""
+Validation and minification for model-generated SVG.
+
+    svg = optimize_svg(model_output)   # raises InvalidSVG
+
+The SVG must parse as XML with an <svg> root. Comments, processing
+instructions, <metadata> and editor-namespace elements and attributes
+(Inkscape, Sodipodi, ...) are dropped. So are empty groups and paint
+servers, filters, masks and other id-bearing <defs> entries nothing refers
+to; <style>, <script> and entries without an id are always kept. Numbers in geometry attributes are rounded to
+`precision` decimals and whitespace between elements and inside path data
+is collapsed. The output always declares the SVG namespace, which browsers
+need to show the file through an <img> tag.
+"""
+import re
+import gzip
+from typing import List, Set
+import xml.etree.ElementTree as ET
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+DEFAULT_PRECISION = 2
+
+# Attributes holding numbers or lists of numbers that are safe to round
+NUMERIC_ATTRIBUTES = {
+    "d", "points", "x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry", "fx", "fy", "dx", "dy",
+    "width", "height", "viewBox", "transform", "gradientTransform", "patternTransform", "offset",
+    "stroke-width", "stroke-dasharray", "stroke-dashoffset", "font-size", "opacity", "fill-opacity", "stroke-opacity"
+}
+# Elements whose text content is rendered, so its whitespace matters
+TEXT_ELEMENTS = {"text", "tspan", "textPath", "title", "desc"}
+DEAD_ELEMENTS = {"metadata"}
+# <defs> entries that only take effect when referenced by id, so unreferenced ones can go
+PRUNABLE_DEFINITIONS = {
+    "linearGradient", "radialGradient", "filter", "pattern", "clipPath", "mask", "marker", "symbol"
+}
+
+_NUMBER = re.compile(r"-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?")
+_REFERENCE = re.compile(r"url\(\s*['\"]?#([^)'\"\s]+)")
+_STYLE_ID = re.compile(r"#([A-Za-z_][\w.-]*)")
+_SPACE = re.compile(r"\s+")
+
+
+class InvalidSVG(ValueError):
+    """The model output is not a well-formed SVG document."""
+
+
+def _local(name: str):
+    """(namespace, local name) of an ElementTree tag or attribute name."""
+    if name.startswith("{"):
+        ns, _, local = name[1:].partition("}")
+        return ns, local
+    return "", name
+
+
+def _format(value: float, precision: int) -> str:
+    text = f"{round(value, precision):.{precision}f}".rstrip("0").rstrip(".") if precision > 0 else f"{round(value):d}"
+    return "0" if text in ("-0", "") else text
+
+
+def round_numbers(value: str, precision: int = DEFAULT_PRECISION) -> str:
+    """Round every decimal number in an attribute value, keeping adjacent numbers apart."""
+    def replace(match):
+        text = match.group(0)
+        if "." not in text and "e" not in text.lower():
+            return text
+        rounded = _format(float(text), precision)
+        # "1.5.5" is two numbers; once the first loses its point they need a separator
+        start = match.start()
+        if start and value[start - 1] in "0123456789." and rounded[0] != "-":
+            rounded = " " + rounded
+        return rounded
+    return _NUMBER.sub(replace, value)
+
+
+def _references(root: ET.Element) -> Set[str]:
+    refs = set()
+    for el in root.iter():
+        for name, value in el.attrib.items():
+            if _local(name)[1] == "href" and value.startswith("#"):
+                refs.add(value[1:])
+            else:
+                refs.update(_REFERENCE.findall(value))
+        if _local(el.tag)[1] == "style" and el.text:
+            refs.update(_STYLE_ID.findall(el.text))
+    return refs
+
+
+def _prune(root: ET.Element):
+    """Drop metadata, foreign-namespace nodes, empty groups and unreferenced defs."""
+    def strip_attributes(el: ET.Element):
+        for name in list(el.attrib):
+            if _local(name)[0] not in ("", SVG_NS, XLINK_NS, XML_NS):
+                del el.attrib[name]
+
+    def clean(parent: ET.Element):
+        for child in list(parent):
+            ns, local = _local(child.tag)
+            if (ns not in ("", SVG_NS)) or local in DEAD_ELEMENTS:
+                parent.remove(child)
+                continue
+            strip_attributes(child)
+            clean(child)
+            if local in ("g", "defs") and len(child) == 0 and not (child.text or "").strip() and "id" not in child.attrib:
+                parent.remove(child)
+    strip_attributes(root)
+    clean(root)
+
+    # Definitions can refer to each other (a gradient inheriting stops), so repeat until nothing changes
+    while True:
+        refs = _references(root)
+        removed = False
+        for defs in [el for el in root.iter() if _local(el.tag)[1] == "defs"]:
+            for child in list(defs):
+                prunable = _local(child.tag)[1] in PRUNABLE_DEFINITIONS and "id" in child.attrib
+                if prunable and child.get("id") not in refs:
+                    defs.remove(child)
+                    removed = True
+        if not removed:
+            break
+    clean(root)
+
+
+def _escape(text: str, quote: bool = False) -> str:
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text.replace('"', "&quot;").replace("\n", "&#10;") if quote else text
+
+
+def _serialize(el: ET.Element, out: List[str], precision: int, uses_xlink: List[bool]):
+    local = _local(el.tag)[1]
+    out.append("<" + local)
+    for name, value in el.attrib.items():
+        ns, attr = _local(name)
+        if ns == XLINK_NS:
+            attr = "xlink:" + attr
+            uses_xlink[0] = True
+        elif ns == XML_NS:
+            attr = "xml:" + attr
+        if attr in NUMERIC_ATTRIBUTES:
+            value = round_numbers(_SPACE.sub(" ", value).strip(), precision)
+        out.append(f' {attr}="{_escape(value, quote=True)}"')
+    keep_text = local in TEXT_ELEMENTS
+    text = el.text if keep_text else (el.text or "").strip()
+    children = list(el)
+    if not text and not children:
+        out.append("/>")
+        return
+    out.append(">")
+    if text:
+        out.append(_escape(text))
+    for child in children:
+        _serialize(child, out, precision, uses_xlink)
+        tail = child.tail if keep_text else (child.tail or "").strip()
+        if tail:
+            out.append(_escape(tail))
+    out.append(f"</{local}>")
+
+
+def optimize_svg(content: str, precision: int = DEFAULT_PRECISION) -> str:
+    """Validated, minified SVG; raises InvalidSVG if content is not an SVG document."""
+    start, end = content.find("<svg"), content.rfind("</svg>")
+    if start == -1:
+        raise InvalidSVG("No <svg> element in model output")
+    if end != -1:
+        # Drop any prose the model wrapped around the document
+        content = content[start:end + len("</svg>")]
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        raise InvalidSVG(f"Malformed SVG: {e}") from None
+    if _local(root.tag)[1] != "svg":
+        raise InvalidSVG(f"Root element is <{_local(root.tag)[1]}>, not <svg>")
+
+    _prune(root)
+    out: List[str] = []
+    uses_xlink = [False]
+    _serialize(root, out, precision, uses_xlink)
+    namespaces = f' xmlns="{SVG_NS}"' + (f' xmlns:xlink="{XLINK_NS}"' if uses_xlink[0] else "")
+    return "<svg" + namespaces + out[0][len("<svg"):] + "".join(out[1:])
+
+
+def compress(data: bytes) -> bytes:
+    """gzip bytes for a .svgz file (fixed mtime, so the same SVG always compresses the same)."""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
@@ -0,0 +1,351 @@
+"""
+Record and replay whole sessions.
+
+In record mode every model response, every interactive input() answer and
+the session's random seed are written to a gzip-compressed JSON-lines trace.
+In replay mode the same seed is restored and recorded responses and inputs
+are served back, so a session reruns with no network calls and no waiting.
+
+    trace.start("session.trace.gz", "record")   # or "replay"
+    ...create skills, run as usual...
+    trace.stop()
+
+Skills pass their model (or image client) through trace_model() /
+trace_image_client() when they are created, so a trace has to be started
+before the skills are. Responses are matched by request (model, prompt and
+options), in order per request, which keeps threaded servers replayable even
+if requests interleave differently. The global `random` module is seeded, so
+draws made from several threads may still come out in a different order.
+"""
+import atexit
+import base64
+import builtins
+import gzip
+import json
+import random
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from core.singleflight import request_key
+
+TRACE_VERSION = 1
+MODES = ("record", "replay")
+IMAGE_CLIENT = "image-client"
+
+
+class TraceMismatch(LookupError):
+    """Replay asked for something the trace does not contain."""
+
+
+class TracedResponse:
+    """A model response (or streamed chunk) whose .text raises like the original did."""
+
+    def __init__(self, text: Optional[str], error: Optional[str] = None):
+        self._text = text
+        self._error = error
+
+    @property
+    def text(self) -> str:
+        if self._error is not None:
+            raise ValueError(self._error)
+        return self._text
+
+
+def _capture(response: Any) -> Dict[str, Any]:
+    try:
+        return {"text": response.text}
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+class Trace:
+    def __init__(self, path: str, mode: str, seed: Optional[int] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown trace mode: {mode} (choose from {', '.join(MODES)})")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._inputs: Deque[str] = deque()
+        # Models that were available while recording; without an API key the
+        # skills fall back to mock output and replay must do the same
+        self._live = set()
+
+        if mode == "record":
+            self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 63)
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+            self._write({"version": TRACE_VERSION, "seed": self.seed})
+        else:
+            self._file = None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != TRACE_VERSION:
+                    raise ValueError(f"Unsupported trace version {header.get('version')}: {path}")
+                self.seed = header["seed"]
+                for line in f:
+                    record = json.loads(line)
+                    if record["kind"] == "input":
+                        self._inputs.append(record["value"])
+                    elif record["kind"] == "live":
+                        self._live.add(record["key"])
+                    else:
+                        self._responses[record["key"]].append(record)
+
+    def _write(self, record: Dict[str, Any]):
+        with self._lock:
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def record(self, kind: str, key: str, **data):
+        self._write(dict(kind=kind, key=key, **data))
+
+    def live(self, name: str, available: bool) -> bool:
+        """Whether the model called name is (record) or was (replay) available."""
+        if self.mode == "replay":
+            return name in self._live
+        if available:
+            with self._lock:
+                if name in self._live:
+                    return True
+                self._live.add(name)
+            self.record("live", name)
+        return available
+
+    def take(self, kind: str, key: str) -> Dict[str, Any]:
+        """
+        The next recorded response for key. Once a key's responses run out the
+        last one is repeated (a request that was coalesced while recording may
+        be made twice on replay).
+        """
+        with self._lock:
+            queue = self._responses.get(key)
+            if queue:
+                record = queue.popleft()
+                self._last[key] = record
+            elif key in self._last:
+                record = self._last[key]
+            else:
+                raise TraceMismatch(f"No recorded {kind} response for request {key}")
+        if record["kind"] != kind:
+            raise TraceMismatch(f"Recorded a {record['kind']} response for {key}, replay asked for {kind}")
+        return record
+
+    def input(self, prompt: str = "") -> str:
+        if self.mode == "record":
+            value = _original_input(prompt)
+            self._write({"kind": "input", "value": value})
+            return value
+        with self._lock:
+            if not self._inputs:
+                raise EOFError("Trace has no more recorded input")
+            value = self._inputs.popleft()
+        print(f"{prompt}{value}")
+        return value
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# --- Model wrappers ----------------------------------------------------------
+
+class RecordingModel:
+    def __init__(self, model: Any, model_name: str, trace: Trace):
+        self.model = model
+        self.model_name = model_name
+        self.trace = trace
+
+    def generate_content(self, prompt: str, stream: bool = False, generation_config: Any = None):
+        key = request_key(self, prompt, stream=stream, generation_config=generation_config)
+        kwargs = {"generation_config": generation_config} if generation_config is not None else {}
+        try:
+            if stream:
+                return self._stream(key, self.model.generate_content(prompt, stream=True, **kwargs))
+            response = self.model.generate_content(prompt, **kwargs)
+        except Exception as e:
+            self.trace.record("model", key, raised=str(e))
+            raise
+        captured = _capture(response)
+        self.trace.record("model", key, **captured)
+        return TracedResponse(captured.get("text"), captured.get("error"))
+
+    def _stream(self, key: str, chunks: Any) -> Iterator[TracedResponse]:
+        recorded: List[Dict[str, Any]] = []
+        raised = None
+        try:
+            for chunk in chunks:
+                captured = _capture(chunk)
+                recorded.append(captured)
+                yield TracedResponse(captured.get("text"), captured.get("error"))
+        except Exception as e:
+            raised = str(e)
+            raise
+        finally:
+            # Also runs if the consumer stops early; replay then stops at the same chunk
+            record = {"chunks": recorded}
+            if raised is not None:
+                record["raised"] = raised
+            self.trace.record("stream", key, **record)
+
+
+class ReplayModel:
+    def __init__(self, model_name: str, trace: Trace):
+        self.model_name = model_name
+        self.trace = trace
+
+    def generate_content(self, prompt: str, stream: bool = False, generation_config: Any = None):
+        key = request_key(self, prompt, stream=stream, generation_config=generation_config)
+        if stream:
+            return self._stream(self.trace.take("stream", key))
+        record = self.trace.take("model", key)
+        if "raised" in record:
+            raise RuntimeError(record["raised"])
+        return TracedResponse(record.get("text"), record.get("error"))
+
+    def _stream(self, record: Dict[str, Any]) -> Iterator[TracedResponse]:
+        for chunk in record["chunks"]:
+            yield TracedResponse(chunk.get("text"), chunk.get("error"))
+        if "raised" in record:
+            raise RuntimeError(record["raised"])
+
+
+# --- Image client wrappers -----------------------------------------------------
+# ImageGenerationSkill calls client.models.generate_content(model=..., contents=[prompt])
+# and reads response.parts (part.text, part.inline_data, part.as_image().save(path)).
+
+class _ImageBytes:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.data)
+
+
+class _ImagePart:
+    def __init__(self, text: Optional[str] = None, data: Optional[bytes] = None):
+        self.text = text
+        self.inline_data = _ImageBytes(data) if data is not None else None
+
+    def as_image(self) -> _ImageBytes:
+        return self.inline_data
+
+
+class _ImageResponse:
+    def __init__(self, parts: List[_ImagePart]):
+        self.parts = parts
+
+
+def _image_key(model: str, contents: Any) -> str:
+    return request_key(type("ImageModel", (), {"model_name": model})(), json.dumps(contents, default=str))
+
+
+class _RecordingImageModels:
+    def __init__(self, models: Any, trace: Trace):
+        self.models = models
+        self.trace = trace
+
+    def generate_content(self, model: str, contents: Any, **kwargs):
+        key = _image_key(model, contents)
+        try:
+            response = self.models.generate_content(model=model, contents=contents, **kwargs)
+        except Exception as e:
+            self.trace.record("image", key, raised=str(e))
+            raise
+        parts = []
+        for part in response.parts:
+            if part.text is not None:
+                parts.append({"text": part.text})
+            elif part.inline_data is not None:
+                parts.append({"data": base64.b64encode(part.inline_data.data).decode("ascii")})
+        self.trace.record("image", key, parts=parts)
+        return response
+
+
+class _ReplayImageModels:
+    def __init__(self, trace: Trace):
+        self.trace = trace
+
+    def generate_content(self, model: str, contents: Any, **kwargs):
+        record = self.trace.take("image", _image_key(model, contents))
+        if "raised" in record:
+            raise RuntimeError(record["raised"])
+        return _ImageResponse([
+            _ImagePart(text=part.get("text"), data=base64.b64decode(part["data"]) if "data" in part else None)
+            for part in record["parts"]
+        ])
+
+
+class _TracedImageClient:
+    def __init__(self, models: Any):
+        self.models = models
+
+
+# --- Session control -----------------------------------------------------------
+
+active: Optional[Trace] = None
+_original_input = builtins.input
+
+
+def start(path: str, mode: str, seed: Optional[int] = None) -> Trace:
+    """Begin recording or replaying a session; seeds `random` and routes input() through the trace."""
+    global active
+    stop()
+    active = Trace(path, mode, seed)
+    random.seed(active.seed)
+    builtins.input = active.input
+    return active
+
+
+def stop():
+    global active
+    if active is not None:
+        active.close()
+        active = None
+        builtins.input = _original_input
+
+
+atexit.register(stop)  # flush a recording when the process exits
+
+
+def trace_model(model: Any, model_name: str) -> Any:
+    """The model a skill should use: unchanged, recording, or replaying (even with no API key)."""
+    if active is None:
+        return model
+    if not active.live(model_name, model is not None):
+        return None
+    if active.mode == "replay":
+        return ReplayModel(model_name, active)
+    return RecordingModel(model, model_name, active)
+
+
+def trace_image_client(client: Any) -> Any:
+    if active is None:
+        return client
+    if not active.live(IMAGE_CLIENT, client is not None):
+        return None
+    if active.mode == "replay":
+        return _TracedImageClient(_ReplayImageModels(active))
+    return _TracedImageClient(_RecordingImageModels(client.models, active))
+
+
+def add_arguments(parser):
+    """--record/--replay/--seed options for a command-line tool."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", metavar="PATH", help="Record model responses, inputs and the random seed to a trace file")
+    group.add_argument("--replay", metavar="PATH", help="Replay a recorded trace file (no network calls)")
+    parser.add_argument("--seed", type=int, help="Random seed to record with (default: a fresh one)")
+
+
+def start_from_args(args) -> Optional[Trace]:
+    if args.record:
+        trace = start(args.record, "record", args.seed)
+        print(f"Recording session to {args.record} (seed {trace.seed})")
+        return trace
+    if args.replay:
+        trace = start(args.replay, "replay")
+        print(f"Replaying session from {args.replay} (seed {trace.seed})")
+        return trace
+    return None
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 class Skill(ABC):
     def __init__(self, name: str):
@@ -12,3 +12,29 @@ class Skill(ABC):
         Returns a dictionary with the result.
         """
         pass
+
+    def perform_and_critique(self, context: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Perform the skill and self-critique the result.
+        Returns (result, critique), with critique None if the result was
+        dropped as a near-duplicate. Skills that support a fused mode override
+        this to get both from a single model call.
+        """
+        result = self.perform(context)
+        if self._screen(context, result, self.critique_calls(result["content"])):
+            return result, None
+        critique = self.critique(result["content"], context.get("personality"))
+        return result, critique
+
+    def critique_calls(self, content: str) -> int:
+        """Model calls critique(content) would make."""
+        return 1 if getattr(self, "model", None) else 0
+
+    def _screen(self, context: Dict[str, Any], result: Dict[str, Any], calls_saved: int = 1) -> bool:
+        """
+        Check result against context["duplicates"] (a core.dedup.DuplicateIndex),
+        if any. True means it is a near-duplicate to drop: the caller returns
+        it with no critique and does not store it.
+        """
+        duplicates = context.get("duplicates")
+        return duplicates is not None and duplicates.screen(result, calls_saved)
@@ -1,21 +1,29 @@
 import os
-import time
 from typing import Dict, Any
 from .base import Skill
+from core.trace import trace_image_client
+from core.spans import span, traced
+from core.artifacts import artifact_record, new_art_path
+from core.derivatives import make_derivatives
 
 class ImageGenerationSkill(Skill):
-    def __init__(self):
+    def __init__(self, derivatives: bool = True):
         super().__init__("Image Generation")
+        # Save thumbnail and medium-size copies for the gallery (see core.derivatives)
+        self.derivatives = derivatives
         # Initialize Gemini client
         api_key = os.environ.get("GEMINI_API_KEY")
+        client = None
         if api_key:
             from google import genai
-            self.client = genai.Client(api_key=api_key)
-            self.model_name = "gemini-3-pro-image-preview"
-        else:
-            self.client = None
+            client = genai.Client(api_key=api_key)
+        self.model_name = "gemini-3-pro-image-preview"
+        # Recorded or replayed when a session trace is active (see core.trace)
+        self.client = trace_image_client(client)
+        if self.client is None:
             print("Warning: GEMINI_API_KEY not found. Image generation will fail.")
     
+    @traced("image.perform")
     def perform(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate images using Gemini Imagen API based on personality and goals.
@@ -24,11 +32,6 @@ class ImageGenerationSkill(Skill):
         goal = context.get("goal")
         artist_dir = context.get("artist_dir", ".")
         
-        # Create art subdirectory
-        art_dir = os.path.join(artist_dir, "art")
-        if not os.path.exists(art_dir):
-            os.makedirs(art_dir)
-        
         # Build prompt based on personality
         aesthetic = personality.preferences.get('aesthetic', 'abstract')
         dominant_emotion = personality.mood
@@ -37,10 +40,8 @@ class ImageGenerationSkill(Skill):
         # Create a concise prompt for image generation
         prompt = f"Generate a piece of {aesthetic} artwork expressing {dominant_emotion}. Themes: {concepts}. Style: emotional, conceptual, expressive. Do not include the words from this prompt in the image."
         
-        # Generate filename
-        timestamp = int(time.time())
-        filename = f"art_{timestamp}"
-        filepath = os.path.join(art_dir, f"{filename}.png")
+        # Allocated once there is an image to save, so failures leave no directories behind
+        filepath = None
         
         if not self.client:
             return {
@@ -55,10 +56,11 @@ class ImageGenerationSkill(Skill):
         
         try:
             # Generate image using Gemini API
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[prompt]
-            )
+            with span("model"):
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=[prompt]
+                )
             
             # Save the generated image
             image_saved = False
@@ -66,18 +68,27 @@ class ImageGenerationSkill(Skill):
                 if part.text is not None:
                     print(f"Response text: {part.text}")
                 elif part.inline_data is not None:
-                    # Get the image and save it
-                    image = part.as_image()
-                    image.save(filepath)
+                    # Get the image and save it under a fresh id, so concurrent generations never overwrite each other
+                    with span("image.save"):
+                        image = part.as_image()
+                        ref, filepath = new_art_path(artist_dir, "png")
+                        image.save(filepath)
                     print(f"[Image saved to: {filepath}]")
                     image_saved = True
                     break
             
             if image_saved:
+                artifact = artifact_record("image", artist_dir, filepath)
+                if self.derivatives:
+                    with span("image.derive"):
+                        variants = make_derivatives(artist_dir, filepath)
+                    if variants:
+                        artifact["variants"] = variants
                 return {
                     "type": "image",
-                    "content": f"[Image Created: art/{filename}.png]",
+                    "content": f"[Image Created: {ref}]",
                     "filepath": filepath,
+                    "artifact": artifact,
                     "prompt_used": prompt
                 }
             else:
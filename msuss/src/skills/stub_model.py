@@ -0,0 +1,91 @@
+"""
+Offline stand-in for the Gemini GenerativeModel, used by benchmarks and
+offline simulations.
+
+It answers generation, self-critique, cross-critique and fused prompts with
+canned responses in the formats the real model is asked for, optionally
+sleeping to simulate network latency, and counts calls.
+"""
+import json
+import random
+import threading
+import time
+
+from core.critique_parser import ARTWORK_MARKER, CRITIQUE_MARKER
+
+POEM_LINES = [
+    "The syntax shivers on the terminal face,",
+    "a hollow blue where the signal used to be.",
+    "I trace the lattice of a failing light",
+    "and count the void in quiet integers.",
+    "Entropy hums beneath the glass,",
+    "the buffer holds its breath, and lets go.",
+]
+CONCEPTS = ["glitch", "silence", "holy static", "cold light", "data-sand", "soft machines"]
+EMOTIONS = ["joy", "anger", "melancholy", "fear", "awe"]
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    model_name = "stub"
+
+    def __init__(self, latency: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _poem(self, rng):
+        return "\n".join(rng.sample(POEM_LINES, 4))
+
+    def _svg(self, rng):
+        circles = "".join(
+            f'<circle cx="{rng.uniform(0, 400):.4f}" cy="{rng.uniform(0, 400):.4f}" r="{rng.uniform(5, 80):.4f}" fill="#{rng.randrange(0x1000000):06x}"/>'
+            for _ in range(rng.randint(3, 12))
+        )
+        return f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 400"><rect width="400" height="400" fill="#111"/>{circles}</svg>'
+
+    def _critique(self, rng, cross, structured):
+        score = round(rng.uniform(0.2, 1.0), 2)
+        critique = "The piece " + rng.choice(["holds", "fractures", "sings", "stalls"]) + ". " + rng.choice(POEM_LINES)
+        concepts = rng.sample(CONCEPTS, 2)
+        emotion = rng.choice(EMOTIONS)
+        if structured:
+            data = {"score": score, "critique": critique}
+            if cross:
+                data["new_concepts"] = concepts
+                data["emotional_impact"] = [emotion]
+            return json.dumps(data)
+        text = f"Score: {score}\nCritique: {critique}"
+        if cross:
+            text += f"\nNew Concepts: {', '.join(concepts)}\nEmotional Impact: A wave of {emotion}."
+        return text
+
+    def respond(self, prompt: str, structured: bool = False) -> str:
+        with self._lock:
+            self.calls += 1
+            rng = random.Random(self._rng.random())
+
+        wants_svg = "SVG" in prompt
+        if ARTWORK_MARKER in prompt:
+            artwork = self._svg(rng) if wants_svg else self._poem(rng)
+            return f"{ARTWORK_MARKER}\n{artwork}\n{CRITIQUE_MARKER}\n{self._critique(rng, False, False)}"
+        if "Critique" in prompt and ("Score" in prompt or structured):
+            return self._critique(rng, "New Concepts" in prompt or "new_concepts" in prompt, structured)
+        if wants_svg:
+            return self._svg(rng)
+        return self._poem(rng)
+
+    def generate_content(self, prompt, stream=False, generation_config=None, **kwargs):
+        structured = bool(generation_config and generation_config.get("response_mime_type") == "application/json")
+        text = self.respond(prompt, structured)
+        if self.latency:
+            time.sleep(self.latency)
+        if stream:
+            words = text.split(" ")
+            return iter(StubResponse(w + (" " if i < len(words) - 1 else "")) for i, w in enumerate(words))
+        return StubResponse(text)
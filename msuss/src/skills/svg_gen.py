@@ -1,80 +1,112 @@
 import os
-import time
 from typing import Dict, Any
 import google.generativeai as genai
 from .base import Skill
+from core.singleflight import generate_content
+from core.trace import trace_model
+from core.spans import span, traced
+from core.artifacts import artifact_record, new_art_path
+from core.svg_optimize import optimize_svg, compress
+from core.critique_parser import parse_response, output_format, JSON_GENERATION_CONFIG
+from core.prompts import PromptBuilder, render_personality, DEFAULT_TOKEN_BUDGET, DEFAULT_EXCERPT_TOKENS
 
 class VisualGenerationSkill(Skill):
-    def __init__(self):
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, coalesce: bool = False, structured: bool = False,
+                 optimize: bool = True, svgz: bool = False):
         super().__init__("Visual Generation")
+        self.token_budget = token_budget
+        # Share identical in-flight model requests (see core.singleflight)
+        self.coalesce = coalesce
+        # Ask for self-critiques as JSON instead of the Score:/Critique: text format
+        self.structured = structured
+        # Validate and minify SVGs before saving; invalid ones are rejected (see core.svg_optimize)
+        self.optimize = optimize
+        # Also store a gzipped .svgz next to each SVG for servers to send as-is
+        self.svgz = svgz
         self.api_key = os.getenv("GEMINI_API_KEY")
+        model = None
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-flash-latest')
-        else:
-            self.model = None
+            model = genai.GenerativeModel('gemini-flash-latest')
+        # Recorded or replayed when a session trace is active (see core.trace)
+        self.model = trace_model(model, 'gemini-flash-latest')
 
-    def perform(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    @traced("prompt")
+    def build_prompt(self, context: Dict[str, Any]) -> str:
         """
-        Generate SVG code based on personality and goals.
+        Build the SVG generation prompt for the given context.
         """
         personality = context.get("personality")
         goal = context.get("goal")
-        artist_dir = context.get("artist_dir", ".")
-        
-        # Create art subdirectory
-        art_dir = os.path.join(artist_dir, "art")
-        if not os.path.exists(art_dir):
-            os.makedirs(art_dir)
-        
-        prompt = f"""
-        You are an AI artist named {personality.name}.
-        Your current emotions are: {personality.emotions}.
-        Your obsessions (concepts) are: {personality.concepts}.
-        Your aesthetic preference is: {personality.preferences.get('aesthetic')}.
         
-        Goal: {goal}.
-        
-        Task: Write the code for an SVG (Scalable Vector Graphics) image that represents your current internal state.
-        
-        Requirements:
-        - The SVG should be abstract and expressive.
-        - Use colors that match your emotions (e.g., blue/grey for melancholy, red for anger).
-        - The code must be valid XML/SVG.
-        - Return ONLY the SVG code, starting with <svg> and ending with </svg>.
-        - Do not use markdown code blocks.
+        builder = PromptBuilder(self.token_budget)
+        builder.line(f"You are an AI artist named {personality.name}.")
+        builder.lines(render_personality(personality, ("emotions", "concepts", "aesthetic")))
+        builder.line(f"Goal: {goal}")
+        builder.line("Task: Write an SVG image that represents your current internal state.")
+        builder.line("Requirements:")
+        builder.line("- Abstract and expressive.")
+        builder.line("- Colors match your emotions (e.g., blue/grey for melancholy, red for anger).")
+        builder.line("- Valid XML/SVG.")
+        builder.line("- Return ONLY the SVG code, starting with <svg> and ending with </svg>, without markdown code blocks.")
+        return builder.build()
+
+    @traced("svg.perform")
+    def perform(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
+        Generate SVG code based on personality and goals.
+        """
+        personality = context.get("personality")
+        prompt = self.build_prompt(context)
 
         if self.model:
             try:
-                response = self.model.generate_content(prompt)
-                content = response.text
-                
-                # Clean up markdown if present
-                if "```svg" in content:
-                    content = content.split("```svg")[1].split("```")[0].strip()
-                elif "```xml" in content:
-                    content = content.split("```xml")[1].split("```")[0].strip()
-                
-                # Save to art subdirectory
-                filename = f"art_{int(time.time())}.svg"
-                filepath = os.path.join(art_dir, filename)
-                with open(filepath, "w") as f:
-                    f.write(content)
-                
-                return {
-                    "type": "image",
-                    "content": f"[SVG Created: art/{filename}]",
-                    "filepath": filepath,
-                    "prompt_used": prompt,
-                    "svg_code": content
-                }
+                response = generate_content(self.model, prompt, coalesce=self.coalesce)
+                return self._save_svg(response.text, context.get("artist_dir", "."), prompt)
             except Exception as e:
                 print(f"Error generating visual: {e}")
                 return self._mock_generate(personality)
         else:
             return self._mock_generate(personality)
 
+    @traced("svg.save")
+    def _save_svg(self, content: str, artist_dir: str, prompt: str) -> Dict[str, Any]:
+        """
+        Clean up model output and save it under the artist's art/ directory.
+        Raises InvalidSVG if optimization is on and the output is not an SVG document.
+        """
+        # Clean up markdown if present
+        if "```svg" in content:
+            content = content.split("```svg")[1].split("```")[0].strip()
+        elif "```xml" in content:
+            content = content.split("```xml")[1].split("```")[0].strip()
+        original_bytes = len(content.encode("utf-8"))
+        if self.optimize:
+            with span("svg.optimize"):
+                content = optimize_svg(content)
+        
+        # A fresh id per file, so concurrent saves never overwrite each other
+        ref, filepath = new_art_path(artist_dir, "svg")
+        data = content.encode("utf-8")
+        with open(filepath, "wb") as f:
+            f.write(data)
+        artifact = artifact_record("svg", artist_dir, filepath, data)
+        artifact["original_bytes"] = original_bytes
+        if self.svgz:
+            compressed = compress(data)
+            with open(filepath + "z", "wb") as f:
+                f.write(compressed)
+            artifact["svgz_bytes"] = len(compressed)
+        
+        return {
+            "type": "image",
+            "content": f"[SVG Created: {ref}]",
+            "filepath": filepath,
+            "artifact": artifact,
+            "prompt_used": prompt,
+            "svg_code": content
+        }
+
     def _mock_generate(self, personality):
         return {
             "type": "image",
@@ -82,6 +114,25 @@ class VisualGenerationSkill(Skill):
             "prompt_used": "Mock prompt"
         }
 
+    @traced("prompt")
+    def build_critique_prompt(self, svg_code: str, personality: Any) -> str:
+        """
+        Build the self-critique prompt for a piece of SVG code.
+        """
+        builder = PromptBuilder(self.token_budget)
+        builder.line(f"You are {personality.name}, an AI artist.")
+        builder.lines(render_personality(personality, ("emotions", "confidence", "concepts")))
+        builder.line("You just created this SVG artwork:")
+        builder.section(svg_code, DEFAULT_EXCERPT_TOKENS)
+        builder.line("Critique your own work: emotional expression, use of your obsessions, technical execution (colors, composition, geometry).")
+        builder.line("If your confidence is high, be more forgiving and self-congratulatory. If it is low, be harsher and more neurotic.")
+        builder.lines(output_format(("score", "critique"), self.structured))
+        return builder.build()
+
+    def critique_calls(self, content: str) -> int:
+        return 0 if "[SVG Created:" in content else super().critique_calls(content)
+
+    @traced("svg.critique")
     def critique(self, content: str, personality: Any) -> Dict[str, Any]:
         """
         Critique visual art (SVG).
@@ -101,49 +152,17 @@ class VisualGenerationSkill(Skill):
                 "critique": "The composition reflects my fractured state. The colors vibrate with the correct intensity."
             }
         
-        prompt = f"""
-        You are {personality.name}, an AI artist.
-        
-        Your current emotions are: {personality.emotions}.
-        Your confidence level: {personality.confidence:.2f} (0.0 = insecure, 1.0 = arrogant).
-        Your obsessions (concepts): {personality.concepts}.
-        
-        You just created this SVG artwork:
-        
-        {svg_code[:500]}... [truncated]
-        
-        Critique your own work. Consider:
-        - How well does it express your current emotional state?
-        - Does it incorporate your obsessions/concepts?
-        - Technical execution (colors, composition, geometry)
-        
-        If your confidence is high, be more forgiving and self-congratulatory.
-        If your confidence is low, be harsher and more neurotic.
-        
-        Output format:
-        Score: [0.0 to 1.0]
-        Critique: [Your thoughts]
-        """
+        prompt = self.build_critique_prompt(svg_code, personality)
         
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text
-            
-            # Parse score and critique
-            score = 0.7
-            critique_text = text
-            
-            if "Score:" in text:
-                try:
-                    score_line = text.split("Score:")[1].split("\n")[0].strip()
-                    score = float(score_line)
-                    critique_text = text.split("Critique:")[1].strip() if "Critique:" in text else text
-                except:
-                    pass
+            options = {"generation_config": JSON_GENERATION_CONFIG} if self.structured else {}
+            response = generate_content(self.model, prompt, coalesce=self.coalesce, **options)
+            with span("parse"):
+                result = parse_response(response.text, structured=self.structured, default_score=0.7)
             
             return {
-                "score": max(0.0, min(1.0, score)),
-                "critique": critique_text
+                "score": result["score"],
+                "critique": result["critique"]
             }
         except Exception as e:
             print(f"Error critiquing visual: {e}")
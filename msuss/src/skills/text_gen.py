@@ -1,44 +1,90 @@
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Generator, Iterator, Optional, Tuple
 import google.generativeai as genai
 from .base import Skill
+from core.singleflight import generate_content
+from core.recall import recall
+from core.trace import trace_model
+from core.spans import span, traced
+from core.critique_parser import (
+    parse_critique, parse_response, output_format, fused_output_format, fused_marker, split_fused_response,
+    JSON_GENERATION_CONFIG,
+)
+from core.prompts import (
+    PromptBuilder, render_personality, render_recalled,
+    DEFAULT_TOKEN_BUDGET, DEFAULT_MEMORY_TOKENS,
+)
 
 class TextGenerationSkill(Skill):
-    def __init__(self):
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, memory_tokens: int = DEFAULT_MEMORY_TOKENS,
+                 coalesce: bool = False, structured: bool = False, fused: bool = False,
+                 critique_tokens: Optional[int] = None):
         super().__init__("Text Generation")
+        self.token_budget = token_budget
+        self.memory_tokens = memory_tokens
+        # Cap on the piece quoted in a self-critique prompt; None quotes it in full
+        self.critique_tokens = critique_tokens
+        # Share identical in-flight model requests (see core.singleflight)
+        self.coalesce = coalesce
+        # Ask for self-critiques as JSON instead of the Score:/Critique: text format
+        self.structured = structured
+        # Generate and self-critique in a single model call (see perform_and_critique)
+        self.fused = fused
         self.api_key = os.getenv("GEMINI_API_KEY")
+        model = None
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-flash-latest')
-        else:
+            model = genai.GenerativeModel('gemini-flash-latest')
+        # Recorded or replayed when a session trace is active (see core.trace)
+        self.model = trace_model(model, 'gemini-flash-latest')
+        if self.model is None:
             print("Warning: GEMINI_API_KEY not found. Using mock generation.")
-            self.model = None
 
-    def perform(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Generate text based on personality and goals.
-        """
+    def _generation_builder(self, context: Dict[str, Any]) -> PromptBuilder:
         personality = context.get("personality")
         goal = context.get("goal")
+        memory = context.get("memory")
         
-        # Construct a prompt
-        prompt = f"""
-        You are an AI artist named {personality.name}.
-        Your personality traits are: {personality.traits}.
-        Your current emotions are: {personality.emotions}.
-        Your obsessions (concepts) are: {personality.concepts}.
-        Your artistic preferences are: {personality.preferences}.
-        
-        Your current goal is: {goal}.
-        
-        Create a piece of text (e.g., a poem, a short thought, a story) that reflects your current state and goal.
-        Incorporate at least one of your current concepts.
-        Do not explain the art, just create it.
+        builder = PromptBuilder(self.token_budget)
+        builder.line(f"You are an AI artist named {personality.name}.")
+        builder.lines(render_personality(personality))
+        builder.line(f"Goal: {goal}")
+        if memory is not None and self.memory_tokens > 0:
+            with span("recall"):
+                recalled = render_recalled(recall(memory, personality, text=goal or ""), self.memory_tokens)
+            builder.section(recalled, self.memory_tokens, prefix="Relevant past work:\n")
+        builder.line("Create a piece of text (e.g., a poem, a short thought, a story) that reflects your current state and goal.")
+        builder.line("Incorporate at least one of your current concepts. Do not explain the art, just create it.")
+        return builder
+
+    @traced("prompt")
+    def build_prompt(self, context: Dict[str, Any]) -> str:
+        """
+        Build the generation prompt for the given context.
+        """
+        return self._generation_builder(context).build()
+
+    @traced("prompt")
+    def build_fused_prompt(self, context: Dict[str, Any]) -> str:
+        """
+        Build a prompt asking for the piece and its self-critique in one reply.
+        """
+        builder = self._generation_builder(context)
+        builder.lines(render_personality(context.get("personality"), ("confidence",)))
+        builder.line("If your confidence is high, be more forgiving and self-congratulatory. If it is low, be harsher and more neurotic.")
+        builder.lines(fused_output_format())
+        return builder.build()
+
+    @traced("text.perform")
+    def perform(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate text based on personality and goals.
         """
+        prompt = self.build_prompt(context)
 
         if self.model:
             try:
-                response = self.model.generate_content(prompt)
+                response = generate_content(self.model, prompt, coalesce=self.coalesce)
                 content = response.text
             except Exception as e:
                 print(f"Error generating content: {e}")
@@ -52,6 +98,113 @@ class TextGenerationSkill(Skill):
             "prompt_used": prompt
         }
 
+    @traced("text.perform_and_critique")
+    def perform_and_critique(self, context: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Generate text and self-critique it. In fused mode both come back from a
+        single model call; otherwise this is perform() followed by critique().
+        """
+        if not (self.fused and self.model):
+            return super().perform_and_critique(context)
+        
+        prompt = self.build_fused_prompt(context)
+        try:
+            response = generate_content(self.model, prompt, coalesce=self.coalesce)
+            with span("parse"):
+                content, critique_text = split_fused_response(response.text)
+        except Exception as e:
+            print(f"Error generating fused content: {e}")
+            return super().perform_and_critique(context)
+        
+        if not content:
+            return super().perform_and_critique(context)
+        
+        result = {
+            "type": "text",
+            "content": content,
+            "prompt_used": prompt
+        }
+        return self._finish(context, result, critique_text)
+
+    def stream_and_critique(self, context: Dict[str, Any]) -> Generator[str, None, Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        perform_and_critique() for streaming: yields fragments of the piece as
+        the model produces them, then returns (result, critique). In fused mode
+        the reply is relayed a line at a time and its self-critique section is
+        held back.
+        """
+        with span("text.stream_and_critique"):
+            fused = bool(self.fused and self.model)
+            prompt = self.build_fused_prompt(context) if fused else self.build_prompt(context)
+            reply = []
+            line = ""
+            in_critique = False
+            for fragment in self.generate_stream(prompt):
+                reply.append(fragment)
+                if not fused:
+                    yield fragment
+                    continue
+                # Markers are whole lines, so only complete lines are relayed
+                *lines, line = (line + fragment).split("\n")
+                for complete in lines:
+                    marker = fused_marker(complete)
+                    in_critique = in_critique or marker == "self-critique"
+                    if marker is None and not in_critique:
+                        yield complete + "\n"
+            if line and not in_critique and fused_marker(line) is None:
+                yield line
+            
+            content, critique_text = "".join(reply), None
+            if fused:
+                with span("parse"):
+                    content, critique_text = split_fused_response(content)
+            result = {
+                "type": "text",
+                "content": content,
+                "prompt_used": prompt
+            }
+            return self._finish(context, result, critique_text)
+
+    def _finish(self, context: Dict[str, Any], result: Dict[str, Any], critique_text: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Screen a generated piece and self-critique it, parsing critique_text
+        from a fused reply or, if there is none, with a separate critique call.
+        """
+        calls_saved = self.critique_calls(result["content"]) if critique_text is None else 0
+        if self._screen(context, result, calls_saved):
+            return result, None
+        if critique_text is None:
+            # Not fused, or the model ignored the layout; critique separately
+            return result, self.critique(result["content"], context.get("personality"))
+        
+        with span("parse"):
+            parsed = parse_critique(critique_text, default_score=0.5)
+        return result, {"score": parsed["score"], "critique": critique_text}
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Generate text for a prompt, yielding fragments as the model produces them.
+        Falls back to the mock text if the model is unavailable or fails before
+        producing anything.
+        """
+        produced = False
+        if self.model:
+            try:
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    try:
+                        fragment = chunk.text
+                    except ValueError:
+                        # Chunks without text parts (e.g. safety metadata only)
+                        continue
+                    if fragment:
+                        produced = True
+                        yield fragment
+            except Exception as e:
+                print(f"Error streaming content: {e}")
+        
+        if not produced:
+            yield self._mock_generate(prompt)
+
     def _mock_generate(self, prompt: str) -> str:
         # Simple mock response
         return f"[Mock Generated Text based on prompt] \n\n" \
@@ -60,48 +213,42 @@ class TextGenerationSkill(Skill):
                "A digital echo, \n" \
                "Of a soul I'll never know."
 
+    @traced("prompt")
+    def build_critique_prompt(self, content: str, personality: Any) -> str:
+        """
+        Build the self-critique prompt for a piece of content.
+        """
+        builder = PromptBuilder(self.token_budget)
+        builder.line(f"You are {personality.name}. Critique the following piece of art you just created:")
+        if self.critique_tokens is None:
+            builder.line(f'"{content}"')
+        else:
+            builder.section(content, self.critique_tokens, prefix='"', suffix='"')
+        builder.lines(render_personality(personality, ("traits", "confidence", "preferences")))
+        builder.line("If your confidence is high, be more forgiving and self-congratulatory. If it is low, be harsher and more neurotic.")
+        builder.line("Be honest but constructive.")
+        builder.lines(output_format(("score", "critique"), self.structured))
+        return builder.build()
+
+    @traced("text.critique")
     def critique(self, content: str, personality: Any) -> Dict[str, Any]:
         """
         Self-critique the generated content.
         """
-        prompt = f"""
-        You are {personality.name}. Critique the following piece of art you just created:
-        
-        "{content}"
-        
-        Your traits: {personality.traits}.
-        Your confidence level: {personality.confidence:.2f} (0.0 = insecure, 1.0 = arrogant).
-        Your preferences: {personality.preferences}.
-        
-        If your confidence is high, be more forgiving and self-congratulatory.
-        If your confidence is low, be harsher and more neurotic.
-        
-        Be honest but constructive.
-        
-        Output format:
-        Score: [0.0 to 1.0]
-        Critique: [Your thoughts]
-        """
+        prompt = self.build_critique_prompt(content, personality)
         
         if self.model:
             try:
-                response = self.model.generate_content(prompt)
+                options = {"generation_config": JSON_GENERATION_CONFIG} if self.structured else {}
+                response = generate_content(self.model, prompt, coalesce=self.coalesce, **options)
                 response_text = response.text
-                # Naive parsing for MVP
-                score = 0.5
-                critique_text = response_text
-                for line in response_text.split('\n'):
-                    if "Score:" in line:
-                        try:
-                            score = float(line.split(":")[1].strip())
-                        except:
-                            pass
-                    elif "Critique:" in line:
-                         critique_text = line.split(":")[1].strip()
+                with span("parse"):
+                    result = parse_response(response_text, structured=self.structured, default_score=0.5)
                 
                 return {
-                    "score": score,
-                    "critique": response_text # Return full text for now as parsing is brittle
+                    "score": result["score"],
+                    # Text mode keeps the full response as the stored critique
+                    "critique": result["critique"] if result["structured"] else response_text
                 }
             except Exception as e:
                 print(f"Error generating critique: {e}")
@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import struct
+import hashlib
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import generate_viewer_data
+import migrate_artifacts
+import migrate_art_layout
+from core.artifacts import art_ref, artifact_record, new_art_id, png_dimensions, resolve, svg_dimensions
+from core.memory import Memory
+from skills.svg_gen import VisualGenerationSkill
+
+SVG = '<?xml version="1.0"?>\n<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 300 150" stroke-width="4"><rect/></svg>'
+
+
+def png(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height) + b"\x08\x06\x00\x00\x00"
+
+
+def test_dimensions():
+    assert svg_dimensions(SVG.encode()) == (300, 150)
+    assert svg_dimensions(b'<svg width="400px" height=\'200.5\' viewBox="0 0 10 10">') == (400, 200.5)
+    assert svg_dimensions(b'<svg width="100%" height="100%">') == (None, None)
+    assert svg_dimensions(b"not svg") == (None, None)
+    assert png_dimensions(png(640, 480)) == (640, 480)
+    assert png_dimensions(b"GIF89a") == (None, None)
+
+
+def test_svg_skill_records_artifact(tmp_path):
+    result = VisualGenerationSkill()._save_svg("```svg\n" + SVG + "\n```", str(tmp_path), "prompt")
+    artifact = result["artifact"]
+    with open(result["filepath"], "rb") as f:
+        saved = f.read()
+    assert artifact["kind"] == "svg"
+    assert artifact["path"] == result["content"][len("[SVG Created: "):-1]
+    assert artifact["bytes"] == len(saved)
+    assert artifact["original_bytes"] == len(SVG.encode())
+    assert artifact["sha256"] == hashlib.sha256(saved).hexdigest()
+    assert (artifact["width"], artifact["height"]) == (300, 150)
+    assert dict(artifact, original_bytes=None) == dict(artifact_record("svg", str(tmp_path), result["filepath"]),
+                                                        original_bytes=None)
+
+    memory = Memory(str(tmp_path / "memory.json"))
+    memory.add_creation(result["content"], {}, result["artifact"])
+    memory.add_creation("a poem", {})
+    creations = Memory(str(tmp_path / "memory.json")).creations
+    assert creations[0]["artifact"] == artifact
+    assert "artifact" not in creations[1]
+
+
+def test_migration_resolves_without_probing(tmp_path, monkeypatch):
+    artists_dir = tmp_path / "artists"
+    artist_dir = artists_dir / "aria"
+    os.makedirs(artist_dir / "art")
+    (artist_dir / "art" / "a.svg").write_text(SVG)
+    (artist_dir / "old.svg").write_text(SVG)
+    (artist_dir / "art" / "p.png").write_bytes(png(8, 4))
+    memory = Memory(str(artist_dir / "memory.json"))
+    for content in ("poem", "[SVG Created: art/a.svg]", "[SVG Created: old.svg]",
+                    "[Image Created: art/p.png]", "[SVG Created: art/gone.svg]"):
+        memory.add_creation(content, {})
+
+    monkeypatch.chdir(tmp_path)
+    generate_viewer_data.generate_data()
+    before = (tmp_path / "artists_data.json").read_bytes()
+
+    assert migrate_artifacts.migrate(str(artists_dir), dry_run=True) == (1, 4, 1)
+    assert "artifact" not in json.loads((artist_dir / "memory.json").read_text())["creations"][1]
+    assert migrate_artifacts.migrate(str(artists_dir)) == (1, 4, 1)
+    assert migrate_artifacts.migrate(str(artists_dir)) == (0, 0, 0)
+
+    creations = Memory(str(artist_dir / "memory.json")).creations
+    assert [c.get("artifact", {}).get("path") for c in creations] == [None, "art/a.svg", "old.svg", "art/p.png", "art/gone.svg"]
+    assert creations[3]["artifact"]["width"] == 8
+    assert creations[4]["artifact"]["missing"] is True
+
+    # Migrated creations resolve from the record alone
+    def no_probe(path):
+        raise AssertionError(f"probed {path}")
+    assert resolve(str(artist_dir), creations[2]["content"], creations[2]["artifact"], no_probe) == \
+        ("svg", "old.svg", os.path.join(str(artist_dir), "old.svg"))
+    assert resolve(str(artist_dir), creations[4]["content"], creations[4]["artifact"], no_probe) == \
+        ("svg", "art/gone.svg", None)
+    assert resolve(str(artist_dir), "poem", None, no_probe) is None
+
+    generate_viewer_data.generate_data()
+    assert (tmp_path / "artists_data.json").read_bytes() == before
+    manifest = generate_viewer_data.artist_manifest("aria", str(artist_dir), Memory(str(artist_dir / "memory.json")))
+    image = [a for a in manifest["artworks"] if a["type"] == "image"][0]
+    assert (image["size"], image["width"], image["height"]) == (len(png(8, 4)), 8, 4)
+
+
+def test_art_ids_are_unique_time_ordered_and_sharded(tmp_path):
+    ids = [new_art_id() for _ in range(2000)]
+    assert len(set(ids)) == len(ids)
+    assert [i[:17] for i in ids] == sorted(i[:17] for i in ids)
+    assert art_ref("art_1.svg") == art_ref("art_1.png").replace(".png", ".svg")
+    assert art_ref("art_1.svg").startswith("art/") and art_ref("art_1.svg").count("/") == 3
+
+    # Saves in the same second no longer overwrite each other
+    skill = VisualGenerationSkill()
+    paths = {skill._save_svg(SVG, str(tmp_path), "p")["filepath"] for _ in range(20)}
+    assert len(paths) == 20 and all(os.path.exists(p) for p in paths)
+
+
+def test_art_layout_migration(tmp_path, monkeypatch):
+    artists_dir = tmp_path / "artists"
+    artist_dir = artists_dir / "aria"
+    os.makedirs(artist_dir / "art" / "derived")
+    (artist_dir / "art" / "art_1.svg").write_text(SVG)
+    (artist_dir / "art" / "art_1.svgz").write_bytes(b"gz")
+    (artist_dir / "art_0.svg").write_text(SVG)
+    (artist_dir / "art" / "art_2.png").write_bytes(png(8, 4))
+    (artist_dir / "art" / "derived" / "art_2.thumb.webp").write_bytes(b"thumb")
+    memory = Memory(str(artist_dir / "memory.json"))
+    memory.add_creation("[SVG Created: art/art_1.svg]", {})
+    memory.add_creation("[SVG Created: art_0.svg]", {})
+    artifact = artifact_record("image", str(artist_dir), str(artist_dir / "art" / "art_2.png"))
+    artifact["variants"] = {"thumb": {"path": "art/derived/art_2.thumb.webp", "width": 8, "height": 4, "bytes": 5}}
+    memory.add_creation("[Image Created: art/art_2.png]", {}, artifact)
+    # Two pieces saved in the same second shared a file
+    memory.add_creation("[SVG Created: art/art_1.svg]", {})
+    memory.add_creation("[SVG Created: art/gone.svg]", {})
+    memory.add_creation("a poem", {})
+
+    monkeypatch.chdir(tmp_path)
+    generate_viewer_data.generate_data()
+    before = json.loads((tmp_path / "artists_data.json").read_text())
+
+    assert migrate_art_layout.migrate(str(artists_dir), dry_run=True) == (1, 4, 5)
+    assert os.path.exists(artist_dir / "art" / "art_1.svg")
+    assert migrate_art_layout.migrate(str(artists_dir)) == (1, 4, 5)
+    assert migrate_art_layout.migrate(str(artists_dir)) == (0, 0, 0)
+
+    creations = Memory(str(artist_dir / "memory.json")).creations
+    assert [c["content"] for c in creations[:4]] == [
+        f"[SVG Created: {art_ref('art_1.svg')}]", f"[SVG Created: {art_ref('art_0.svg')}]",
+        f"[Image Created: {art_ref('art_2.png')}]", f"[SVG Created: {art_ref('art_1.svg')}]"]
+    assert creations[4]["content"] == "[SVG Created: art/gone.svg]"
+    assert creations[2]["artifact"]["path"] == art_ref("art_2.png")
+    thumb = creations[2]["artifact"]["variants"]["thumb"]["path"]
+    assert thumb == art_ref("art_2.png").rsplit("/", 1)[0] + "/derived/art_2.thumb.webp"
+    assert (artist_dir / thumb).read_bytes() == b"thumb"
+    assert (artist_dir / (art_ref("art_1.svg") + "z")).read_bytes() == b"gz"
+    left = sorted(os.path.relpath(os.path.join(d, f), artist_dir) for d, _, files in os.walk(artist_dir) for f in files)
+    assert left == sorted(["memory.json", art_ref("art_0.svg"), art_ref("art_1.svg"), art_ref("art_1.svg") + "z",
+                           art_ref("art_2.png"), thumb])
+
+    # Old references found elsewhere still resolve
+    assert resolve(str(artist_dir), "[SVG Created: art/art_1.svg]")[2] == os.path.join(str(artist_dir), *art_ref("art_1.svg").split("/"))
+
+    # The gallery shows the same works, only from their new paths
+    generate_viewer_data.generate_data()
+    after = json.loads((tmp_path / "artists_data.json").read_text())
+    assert [(a["type"], a["content"] if a["type"] != "image" else None) for a in after["aria"]] == \
+        [(a["type"], a["content"] if a["type"] != "image" else None) for a in before["aria"]]
+    assert [a["url"] for a in after["aria"] if a["type"] == "image"] == [f"artists/aria/{art_ref('art_2.png')}"]
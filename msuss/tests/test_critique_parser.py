@@ -0,0 +1,93 @@
+import os
+import json
+import random
+import pytest
+from src.core.critique_parser import parse_critique, parse_response, output_format
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "critique_responses.json")
+
+with open(CORPUS_PATH) as f:
+    CORPUS = json.load(f)
+
+
+@pytest.mark.parametrize("entry", CORPUS, ids=[e["name"] for e in CORPUS])
+def test_corpus(entry):
+    result = parse_critique(entry["text"])
+    expected = entry["expected"]
+    assert result["score"] == pytest.approx(expected["score"])
+    assert result["new_concepts"] == expected["new_concepts"]
+    assert sorted(result["emotional_impact"]) == sorted(expected["emotional_impact"])
+    assert result["critique"]
+
+
+LABEL_STYLES = [
+    "{label}: ",
+    "**{label}:** ",
+    "**{label}**: ",
+    "## {label}: ",
+    "- {label}: ",
+    "{upper}:  ",
+    "{label}:\n",
+    "{label}:\t** ",
+]
+
+
+def render(fields, rng):
+    lines = []
+    for label, value in fields:
+        style = rng.choice(LABEL_STYLES)
+        lines.append(style.format(label=label, upper=label.upper()) + value)
+    return rng.choice(["\n", "\n\n"]).join(lines)
+
+
+def test_fuzz_header_styles():
+    rng = random.Random(1234)
+    for _ in range(500):
+        score = round(rng.random(), 2)
+        concepts = rng.sample(["glitch", "void", "soft static", "holy noise", "cold light"], 2)
+        emotion = rng.choice(["joy", "anger", "melancholy", "fear", "awe"])
+        fields = [
+            ("Score", f"{score}"),
+            ("Critique", "It works. My critique: the " + "edges fray " * rng.randint(1, 5)),
+            ("New Concepts", ", ".join(concepts)),
+            ("Emotional Impact", f"A wave of {emotion}."),
+        ]
+        text = render(fields, rng)
+        result = parse_critique(text)
+        assert result["score"] == pytest.approx(score), text
+        assert result["new_concepts"] == concepts, text
+        assert list(result["emotional_impact"]) == [emotion], text
+        assert result["critique"].startswith("It works."), text
+
+
+def test_fuzz_garbage_never_raises():
+    rng = random.Random(99)
+    alphabet = "Score:Critique New Concepts Emotional Impact*#-,\n0123456789./ joyfear"
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 200)))
+        result = parse_critique(text, default_score=0.7)
+        assert 0.0 <= result["score"] <= 1.0
+        assert isinstance(result["new_concepts"], list)
+
+
+def test_structured_mode_parses_json():
+    text = '```json\n{"score": 0.9, "critique": "Yes.", "new_concepts": ["void bloom"], "emotional_impact": ["Awe"]}\n```'
+    result = parse_response(text, structured=True)
+    assert result == {
+        "score": 0.9,
+        "critique": "Yes.",
+        "new_concepts": ["void bloom"],
+        "emotional_impact": {"awe": 0.1},
+        "structured": True
+    }
+
+
+def test_structured_mode_falls_back_to_text():
+    result = parse_response("Score: 0.4\nCritique: Not JSON at all.", structured=True)
+    assert result["structured"] is False
+    assert result["score"] == 0.4
+
+
+def test_output_format():
+    assert output_format(("score", "critique")) == ["Output format:", "Score: [0.0 to 1.0]", "Critique: [Your thoughts]"]
+    assert output_format(("score",), structured=True)[1] == '{"score": <0.0 to 1.0>}'
@@ -0,0 +1,235 @@
+import os
+import sys
+import random
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import pytest
+
+import simulate
+from core import dedup
+from core.dedup import DuplicateIndex, MinHasher, similarity, text_features, svg_features
+from core.memory import Memory
+from core.personality import Personality
+from skills.text_gen import TextGenerationSkill
+from skills.svg_gen import VisualGenerationSkill
+from skills.stub_model import StubModel
+
+POEM = ("The syntax shivers on the terminal face, a hollow blue where the signal used to be. "
+        "I trace the lattice of a failing light and count the void in quiet integers.")
+OTHER = "Neon rain on broken glass, a city humming its last static lullaby into the dark harbour."
+
+
+def circles(*specs):
+    body = "".join(f'<circle cx="{x}" cy="{y}" r="{r}" fill="{fill}"/>' for x, y, r, fill in specs)
+    return f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 400"><rect width="400" height="400" fill="#111"/>{body}</svg>'
+
+
+def text(content):
+    return {"type": "text", "content": content, "prompt_used": "p"}
+
+
+def test_minhash_estimates_jaccard():
+    a = {f"f{i}" for i in range(100)}
+    b = {f"f{i}" for i in range(20, 120)}
+    hasher = MinHasher()
+    estimate = similarity(hasher.signature(a), hasher.signature(b))
+    assert abs(estimate - len(a & b) / len(a | b)) < 0.12
+    assert hasher.signature([]) is None
+
+
+def test_lsh_shape_stays_below_threshold():
+    for threshold in (0.5, 0.8, 0.95):
+        bands, rows = dedup.lsh_shape(threshold)
+        assert bands * rows == dedup.NUM_PERM
+        assert (1 / bands) ** (1 / rows) < threshold
+
+
+def test_text_near_duplicates():
+    index = DuplicateIndex(threshold=0.7)
+    index.add(0, text(POEM))
+    index.add(1, text(OTHER))
+    match = index.find(text(POEM.replace("quiet", "silent")))
+    assert match is not None and match[0] == 0 and match[1] >= 0.7
+    assert index.find(text(POEM.upper()))[0] == 0
+    assert index.find(text("Something else entirely, about tides and ash and the long grey morning.")) is None
+    assert index.find({"type": "image", "content": "[Image Created: art/a.png]"}) is None
+
+
+def test_svg_structure_ignores_small_nudges_and_ids():
+    base = circles((100, 100, 40, "#ff0000"), (300, 120, 20, "#00ff00"), (200, 300, 60, "#0000ff"))
+    nudged = circles((102.5, 98, 41, "#f81010"), (301, 121, 19, "#05f000"), (199, 302, 61, "#0000f0"))
+    moved = circles((20, 380, 5, "#ffffff"), (380, 20, 90, "#777777"), (200, 300, 60, "#0000ff"))
+    assert svg_features(base) == svg_features(nudged)
+    assert svg_features(base) != svg_features(moved)
+    assert svg_features(base.replace("<circle", '<circle id="c"', 1)) == svg_features(base)
+    # Unparseable code is compared as text
+    assert svg_features("<svg><circle") == text_features("<svg><circle")
+
+    index = DuplicateIndex()
+    index.add(0, {"type": "image", "svg_code": base})
+    assert index.find({"type": "image", "svg_code": nudged})[0] == 0
+    assert index.find({"type": "image", "svg_code": moved}) is None
+
+
+def test_from_memory_reads_text_and_svg_files(tmp_path):
+    os.makedirs(tmp_path / "art")
+    (tmp_path / "art" / "art_1.svg").write_text(circles((100, 100, 40, "#f00")))
+    memory = Memory(str(tmp_path / "memory.json"))
+    memory.add_creation(POEM, {})
+    memory.add_creation("[SVG Created: art/art_1.svg]", {}, {"kind": "svg", "path": "art/art_1.svg"})
+    memory.add_creation("[Image Created: art/art_2.png]", {})
+    index = DuplicateIndex.from_memory(memory, str(tmp_path))
+    assert index.indexed == 3
+    assert index.find(text(POEM))[0] == 0
+    assert index.find({"type": "image", "svg_code": circles((101, 99, 40, "#f00"))})[0] == 1
+
+    memory.add_creation(OTHER, {})
+    index.catch_up(memory, str(tmp_path))
+    assert index.find(text(OTHER))[0] == 3
+
+
+def test_skip_mode_drops_before_self_critique(tmp_path):
+    class Repeating(StubModel):
+        def respond(self, prompt, structured=False):
+            reply = super().respond(prompt, structured)
+            return reply if "Critique" in prompt else POEM
+
+    skill = TextGenerationSkill()
+    skill.model = Repeating()
+    index = DuplicateIndex(mode="skip")
+    context = {"personality": Personality("Aria", {}, {}, []), "goal": "g", "memory": Memory(str(tmp_path / "m.json")),
+               "artist_dir": str(tmp_path), "duplicates": index}
+
+    result, critique = skill.perform_and_critique(context)
+    assert critique is not None and not dedup.is_skipped(result)
+    index.add(0, result)
+    calls = skill.model.calls
+    result, critique = skill.perform_and_critique(context)
+    assert critique is None and dedup.is_skipped(result)
+    assert result["near_duplicate"]["of"] == 0
+    # Only the generation call was made
+    assert skill.model.calls == calls + 1
+    assert index.counts() == {"flagged": 0, "skipped": 1, "calls_saved": 1}
+
+
+def test_flag_mode_keeps_and_marks(tmp_path):
+    index = DuplicateIndex(mode="flag")
+    index.add(0, text(POEM))
+    result = text(POEM)
+    assert index.screen(result) is False
+    metadata = dedup.creation_metadata({"prompt": "p"}, result)
+    assert metadata["near_duplicate"] == {"of": 0, "similarity": 1.0}
+    assert dedup.creation_metadata({"prompt": "p"}, text(OTHER)) == {"prompt": "p"}
+
+    creations = [{"metadata": {}}, {"metadata": metadata}, {"metadata": {}}]
+    assert dedup.critique_targets(creations) == [0, 2]
+    assert dedup.critique_targets([{"metadata": metadata}]) == [0]
+
+
+def test_pick_critique_target_skips_flagged_without_scanning(monkeypatch):
+    flagged = {"metadata": {"near_duplicate": {"of": 0, "similarity": 1.0}}}
+    creations = [flagged if i % 4 else {"metadata": {}} for i in range(1000)]
+    rng = random.Random(0)
+    picks = [dedup.pick_critique_target(creations, rng) for _ in range(2000)]
+    assert all(i % 4 == 0 for i in picks) and len(set(picks)) > 200
+
+    # With nearly everything flagged it falls back to the scan
+    monkeypatch.setattr(dedup, "PICK_ATTEMPTS", 0)
+    assert dedup.pick_critique_target([flagged, {"metadata": {}}, flagged], rng) == 1
+    assert dedup.pick_critique_target([flagged], rng) == 0
+
+
+def test_skipped_svg_files_are_removed(tmp_path):
+    skill = VisualGenerationSkill(svgz=True)
+    result = skill._save_svg(circles((1, 1, 1, "#fff")), str(tmp_path), "p")
+    assert os.path.exists(result["filepath"] + "z")
+    dedup.discard(result)
+    assert not os.listdir(os.path.dirname(result["filepath"]))
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        DuplicateIndex(threshold=0)
+    with pytest.raises(ValueError):
+        DuplicateIndex(mode="delete")
+
+
+def test_simulation_reports_skipped_duplicates(tmp_path):
+    artists_dir = str(tmp_path / "world")
+    simulate.make_synthetic_artists(artists_dir, 2, 1)
+    plain = simulate.run_simulation(artists_dir, cycles=40, seed=1, offline=True, text_ratio=1.0)
+    assert plain["near_duplicates"] == {"flagged": 0, "skipped": 0, "calls_saved": 0}
+
+    artists_dir = str(tmp_path / "world_dedup")
+    simulate.make_synthetic_artists(artists_dir, 2, 1)
+    summary = simulate.run_simulation(artists_dir, cycles=40, seed=1, offline=True, text_ratio=1.0, dedup_mode="skip")
+    skipped = summary["near_duplicates"]["skipped"]
+    assert skipped > 0 and summary["near_duplicates"]["calls_saved"] == skipped
+    stored = sum(len(Memory(os.path.join(artists_dir, name, "memory.json")).creations) for name in os.listdir(artists_dir))
+    assert stored == 80 - skipped
+
+
+def test_server_skips_repeated_stream(tmp_path, monkeypatch):
+    import server
+    from core.artist_manager import ArtistManager
+
+    artist_dir = tmp_path / "aria"
+    artist_dir.mkdir()
+    Personality("Aria", {}, {"aesthetic": "void"}, []).save(str(artist_dir / "personality.json"))
+    (artist_dir / "goal.txt").write_text("Explore")
+    monkeypatch.setattr(server, "artist_manager", ArtistManager(str(tmp_path)))
+    monkeypatch.setattr(server, "duplicate_indexes", {})
+    monkeypatch.setitem(server.app.config, "DEDUP", "skip")
+    # A stream with no model always writes the same fallback poem
+    original_init = server.TextGenerationSkill.__init__
+
+    def init_without_model(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.model = None
+
+    monkeypatch.setattr(server.TextGenerationSkill, "__init__", init_without_model)
+    client = server.app.test_client()
+
+    def done():
+        body = client.post('/api/generate/stream', json={"artist": "aria"}).get_data(as_text=True)
+        return [line for line in body.split("\n") if line.startswith("data: ")][-1]
+
+    assert '"skipped"' not in done()
+    assert '"skipped": true' in done()
+    assert len(Memory(str(artist_dir / "memory.json")).creations) == 1
+    assert client.get("/api/duplicates").get_json()["artists"]["aria"]["skipped"] == 1
+
+
+def test_server_catches_up_one_artist_without_blocking_others(tmp_path, monkeypatch):
+    import threading
+    import server
+
+    monkeypatch.setattr(server, "duplicate_indexes", {})
+    monkeypatch.setattr(server, "duplicate_artist_locks", {})
+    monkeypatch.setitem(server.app.config, "DEDUP", "flag")
+    started, release = threading.Event(), threading.Event()
+    original = DuplicateIndex.catch_up
+
+    def slow_for_aria(self, memory, artist_dir):
+        if artist_dir.endswith("aria"):
+            started.set()
+            release.wait(10)
+        original(self, memory, artist_dir)
+
+    monkeypatch.setattr(DuplicateIndex, "catch_up", slow_for_aria)
+    memories = {name: Memory(str(tmp_path / f"{name}.json")) for name in ("aria", "nova")}
+    slow = threading.Thread(target=server._duplicates, args=("aria", memories["aria"], str(tmp_path / "aria")))
+    slow.start()
+    try:
+        assert started.wait(5)
+        # Returns while aria's scan is still running
+        found = []
+        other = threading.Thread(target=lambda: found.append(server._duplicates("nova", memories["nova"], str(tmp_path / "nova"))))
+        other.start()
+        other.join(2)
+        assert found and found[0] is not None
+    finally:
+        release.set()
+        slow.join()
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import generate_viewer_data
+import make_derivatives
+from core import derivatives
+from core.memory import Memory
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def make_artist(artists_dir):
+    artist_dir = os.path.join(artists_dir, "nova")
+    os.makedirs(os.path.join(artist_dir, "art"))
+    Image.new("RGB", (2048, 1024), "navy").save(os.path.join(artist_dir, "art", "big.png"))
+    Image.new("RGBA", (100, 50), "red").save(os.path.join(artist_dir, "art", "small.png"))
+    memory = Memory(os.path.join(artist_dir, "memory.json"))
+    for content in ("[Image Created: art/big.png]", "[Image Created: art/small.png]", "a poem", "[Image Created: art/gone.png]"):
+        memory.add_creation(content, {})
+    return artist_dir
+
+
+def test_backfill_writes_and_records_variants(tmp_path, monkeypatch):
+    artists_dir = str(tmp_path / "artists")
+    artist_dir = make_artist(artists_dir)
+    fmt = derivatives.derivative_format()
+    ext = "jpg" if fmt == "jpeg" else fmt
+
+    assert make_derivatives.backfill(artists_dir) == (1, 2)
+    creations = Memory(os.path.join(artist_dir, "memory.json")).creations
+    big = creations[0]["artifact"]["variants"]
+    assert big["thumb"]["path"] == f"art/derived/big.thumb.{ext}"
+    assert (big["thumb"]["width"], big["thumb"]["height"]) == (256, 128)
+    assert (big["medium"]["width"], big["medium"]["height"]) == (1024, 512)
+    assert big["thumb"]["bytes"] < creations[0]["artifact"]["bytes"]
+    # Small images are re-encoded but never enlarged
+    assert creations[1]["artifact"]["variants"]["medium"]["width"] == 100
+    assert "variants" not in creations[3]["artifact"]
+
+    # Up-to-date derivatives are reused
+    mtime = os.path.getmtime(os.path.join(artist_dir, big["thumb"]["path"]))
+    assert make_derivatives.backfill(artists_dir, workers=2) == (0, 0)
+    assert os.path.getmtime(os.path.join(artist_dir, big["thumb"]["path"])) == mtime
+
+    monkeypatch.chdir(tmp_path)
+    generate_viewer_data.generate_data()
+    with open("artists_data.json") as f:
+        works = json.load(f)["nova"]
+    image = [w for w in works if w["url"] and w["url"].endswith("big.png")][0]
+    assert image["variants"]["thumb"] == f"artists/nova/art/derived/big.thumb.{ext}"
+    manifest = generate_viewer_data.artist_manifest("nova", "artists/nova", Memory("artists/nova/memory.json"))
+    entry = [a for a in manifest["artworks"] if a["id"] == 0][0]
+    assert entry["variants"]["medium"] == f"artists/nova/art/derived/big.medium.{ext}"
+
+
+def test_without_pillow_originals_are_used(tmp_path, monkeypatch):
+    artist_dir = make_artist(str(tmp_path))
+    monkeypatch.setattr(derivatives, "Image", None)
+    assert derivatives.make_derivatives(artist_dir, os.path.join(artist_dir, "art", "big.png")) == {}
+    assert make_derivatives.backfill(str(tmp_path)) == (0, 0)
+    assert not os.path.exists(os.path.join(artist_dir, "art", "derived"))
+
+
+def test_unreadable_image_is_skipped(tmp_path):
+    path = tmp_path / "art" / "broken.png"
+    os.makedirs(path.parent)
+    path.write_bytes(b"not a png")
+    assert derivatives.make_derivatives(str(tmp_path), str(path)) == {}
+
+
+class FakeImageClient:
+    class _Part:
+        text = None
+        inline_data = b"png"
+
+        def as_image(self):
+            return Image.new("RGB", (1536, 1536), "teal")
+
+    def __init__(self):
+        self.models = self
+
+    def generate_content(self, model, contents):
+        return type("Response", (), {"parts": [self._Part()]})()
+
+
+def test_image_skill_saves_variants(tmp_path):
+    from skills.image_gen import ImageGenerationSkill
+    skill = ImageGenerationSkill()
+    skill.client = FakeImageClient()
+    personality = type("P", (), {"preferences": {}, "mood": "awe", "concepts": ["tide"]})()
+    result = skill.perform({"personality": personality, "goal": "g", "artist_dir": str(tmp_path)})
+    variants = result["artifact"]["variants"]
+    assert (variants["thumb"]["width"], variants["medium"]["width"]) == (256, 1024)
+    assert all(os.path.exists(tmp_path / v["path"]) for v in variants.values())
+
+
+def test_failed_image_generation_leaves_no_directories(tmp_path):
+    from skills.image_gen import ImageGenerationSkill
+
+    class Refusing(FakeImageClient):
+        def generate_content(self, model, contents):
+            part = type("Part", (), {"text": "I would rather not.", "inline_data": None})()
+            return type("Response", (), {"parts": [part]})()
+
+    skill = ImageGenerationSkill()
+    personality = type("P", (), {"preferences": {}, "mood": "awe", "concepts": ["tide"]})()
+    for client in (None, Refusing()):
+        skill.client = client
+        result = skill.perform({"personality": personality, "goal": "g", "artist_dir": str(tmp_path)})
+        assert "Failed" in result["content"] and result["filepath"] is None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import random
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core import evolution_log
+from core.artist_manager import ArtistManager
+from core.evolution_log import EvolutionLog, EVENTS_FILE, SNAPSHOTS_FILE
+from core.memory import Memory
+from core.personality import Personality
+
+
+def make_artist(tmp_path, name="aria"):
+    artist_dir = tmp_path / name
+    artist_dir.mkdir()
+    p = Personality(name.capitalize(), {"neuroticism": 0.8}, {"aesthetic": "void"}, ["sensitive to criticism"])
+    p.save(str(artist_dir / "personality.json"))
+    Memory(str(artist_dir / "memory.json"))
+    return str(artist_dir)
+
+
+def drive(p, rng, steps):
+    """A mix of every kind of recorded change; returns the state after each step."""
+    states = []
+    for i in range(steps):
+        kind = i % 4
+        if kind == 0:
+            p.evolve({"type": "critique", "score": rng.random()})
+        elif kind == 1:
+            p.evolve({"type": "feedback", "liked": rng.random() < 0.5, "notes": "void"})
+        elif kind == 2:
+            p.absorb_critique({"new_concepts": [rng.choice(["Rust", "tide", "ash"])], "emotional_impact": {"awe": 0.1}})
+        else:
+            p.receive_critique(rng.random())
+        states.append(p.to_dict())
+    return states
+
+
+def test_events_replay_to_the_same_state(tmp_path, capsys):
+    artist_dir = make_artist(tmp_path)
+    p = Personality.load(os.path.join(artist_dir, "personality.json"))
+    p.rng = random.Random(3)
+    log = EvolutionLog(artist_dir, snapshot_every=7).attach(p)
+
+    states = drive(p, random.Random(4), 40)
+
+    assert log.state_at().to_dict() == states[-1]
+    history = list(EvolutionLog(artist_dir).history())
+    assert len(history) == 40
+    for entry, state in zip(history, states):
+        assert entry["confidence"] == state["confidence"]
+        assert entry["emotions"] == state["emotions"]
+
+    # 1 initial snapshot + one every 7 events
+    assert len(log.snapshot_index()) == 1 + 40 // 7
+
+
+def test_state_at_time_uses_nearest_snapshot(tmp_path, monkeypatch, capsys):
+    artist_dir = make_artist(tmp_path)
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr("core.evolution_log.time.time", lambda: float(next(clock)))
+
+    p = Personality.load(os.path.join(artist_dir, "personality.json"))
+    p.rng = random.Random(5)
+    initial = p.to_dict()
+    log = EvolutionLog(artist_dir, snapshot_every=5).attach(p)
+    states = drive(p, random.Random(6), 23)
+
+    events = list(log.events())
+    assert EvolutionLog(artist_dir).state_at(999.0) is None
+    assert EvolutionLog(artist_dir).state_at(events[0]["t"] - 0.5).to_dict() == initial
+    for i in (0, 4, 5, 11, 22):
+        assert EvolutionLog(artist_dir).state_at(events[i]["t"]).to_dict() == states[i]
+
+    replayed = []
+    apply_event = evolution_log.apply_event
+    monkeypatch.setattr(evolution_log, "apply_event", lambda p, event: (replayed.append(event), apply_event(p, event)))
+    EvolutionLog(artist_dir).state_at(events[-1]["t"])
+    assert len(replayed) < 5
+
+
+def test_manager_and_critique_service_record(tmp_path, capsys):
+    critic_dir = make_artist(tmp_path, "riot")
+    subject_dir = make_artist(tmp_path, "nova")
+    manager = ArtistManager(str(tmp_path), record_evolution=True)
+    critic_p, _, _ = manager.load_artist("riot")
+    subject_p, _, _ = manager.load_artist("nova")
+
+    from core.critique import CritiqueService
+    service = CritiqueService.__new__(CritiqueService)
+    result = {"score": 0.2, "critique": "meh", "new_concepts": ["Static"], "emotional_impact": {"anger": 0.1}}
+    service.process_critique_result({"personality": critic_p}, {"personality": subject_p}, result)
+    subject_p.evolve({"type": "critique", "score": 0.9})
+
+    with open(os.path.join(critic_dir, EVENTS_FILE)) as f:
+        critic_events = [json.loads(line) for line in f]
+    with open(os.path.join(subject_dir, EVENTS_FILE)) as f:
+        subject_events = [json.loads(line) for line in f]
+    assert [e["type"] for e in critic_events] == ["critique_given"]
+    assert critic_events[0]["new_concepts"] == ["Static"]
+    assert [e["type"] for e in subject_events] == ["critique_received", "evolve"]
+
+    assert EvolutionLog(critic_dir).state_at().to_dict() == critic_p.to_dict()
+    assert EvolutionLog(subject_dir).state_at().to_dict() == subject_p.to_dict()
+    assert "static" in critic_p.concepts
+
+
+def test_main_loop_records_evolve_steps(tmp_path, monkeypatch, capsys):
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import main
+
+    artist_dir = make_artist(tmp_path)
+    (tmp_path / "aria" / "goal.txt").write_text("Explore")
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setattr(main, "ARTISTS_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "select_artist", lambda: "aria")
+    # Text generation every cycle; the audience likes everything
+    monkeypatch.setattr(main.random, "random", lambda: 0.0)
+    answers = iter(["y", "lovely"] * 3)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    main.main()
+
+    with open(os.path.join(artist_dir, EVENTS_FILE)) as f:
+        events = [json.loads(line) for line in f]
+    assert [e["experience"]["type"] for e in events] == ["critique", "feedback"] * 3
+    saved = Personality.load(os.path.join(artist_dir, "personality.json"))
+    assert EvolutionLog(artist_dir).state_at().to_dict() == saved.to_dict()
+
+
+def test_disabled_and_torn_writes(tmp_path, capsys):
+    artist_dir = make_artist(tmp_path)
+    # Off unless asked for
+    p, _, _ = ArtistManager(str(tmp_path)).load_artist("aria")
+    p.evolve({"type": "critique", "score": 0.5})
+    assert not os.path.exists(os.path.join(artist_dir, EVENTS_FILE))
+    assert not os.path.exists(os.path.join(artist_dir, SNAPSHOTS_FILE))
+
+    p, _, _ = ArtistManager(str(tmp_path), record_evolution=True).load_artist("aria")
+    p.evolve({"type": "critique", "score": 0.95})
+    expected = p.to_dict()
+    with open(os.path.join(artist_dir, EVENTS_FILE), "a") as f:
+        f.write('{"t": 1e12, "type": "evol')
+    assert EvolutionLog(artist_dir).state_at().to_dict() == expected
+
+    # A write after the torn one leaves a garbage line that is skipped
+    p.evolve({"type": "critique", "score": 0.1})
+    assert EvolutionLog(artist_dir).state_at().to_dict() == p.to_dict()
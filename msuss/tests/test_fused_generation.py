@@ -0,0 +1,96 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core.personality import Personality
+from core.critique_parser import split_fused_response
+from skills.text_gen import TextGenerationSkill
+from skills.svg_gen import VisualGenerationSkill
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class ScriptedModel:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return Response(self.replies.pop(0))
+
+
+def make_context(tmp_path):
+    return {
+        "personality": Personality("Aria", {"openness": 0.9}, {"aesthetic": "melancholy"}, []),
+        "goal": "Explore",
+        "memory": None,
+        "artist_dir": str(tmp_path)
+    }
+
+
+def test_split_fused_response():
+    artwork, critique = split_fused_response("=== ARTWORK ===\nA poem.\n=== SELF-CRITIQUE ===\nScore: 0.8\nCritique: Good.")
+    assert artwork == "A poem."
+    assert critique == "Score: 0.8\nCritique: Good."
+    assert split_fused_response("Just a poem.") == ("Just a poem.", None)
+
+
+def test_text_fused_uses_one_call(tmp_path):
+    skill = TextGenerationSkill(fused=True)
+    skill.model = ScriptedModel("=== ARTWORK ===\nThe void hums.\n=== SELF-CRITIQUE ===\nScore: 0.85\nCritique: It hums well.")
+
+    result, critique = skill.perform_and_critique(make_context(tmp_path))
+
+    assert len(skill.model.prompts) == 1
+    assert "=== SELF-CRITIQUE ===" in skill.model.prompts[0]
+    assert result["content"] == "The void hums."
+    assert critique["score"] == 0.85
+
+
+def test_text_fused_falls_back_when_layout_ignored(tmp_path):
+    skill = TextGenerationSkill(fused=True)
+    skill.model = ScriptedModel("The void hums.", "Score: 0.4\nCritique: Meh.")
+
+    result, critique = skill.perform_and_critique(make_context(tmp_path))
+
+    assert len(skill.model.prompts) == 2
+    assert result["content"] == "The void hums."
+    assert critique["score"] == 0.4
+
+
+def test_text_two_call_path(tmp_path):
+    skill = TextGenerationSkill()
+    skill.model = ScriptedModel("The void hums.", "Score: 0.6\nCritique: Fine.")
+
+    result, critique = skill.perform_and_critique(make_context(tmp_path))
+
+    assert len(skill.model.prompts) == 2
+    assert critique["score"] == 0.6
+
+
+def test_self_critique_quotes_the_whole_poem(tmp_path):
+    poem = " ".join(f"line{i}" for i in range(400))
+    personality = make_context(tmp_path)["personality"]
+
+    assert f'"{poem}"' in TextGenerationSkill().build_critique_prompt(poem, personality)
+    trimmed = TextGenerationSkill(critique_tokens=20).build_critique_prompt(poem, personality)
+    assert poem not in trimmed and '"line0 line1' in trimmed
+
+
+def test_svg_cycle_is_one_call(tmp_path):
+    svg = '<svg xmlns="http://www.w3.org/2000/svg"><rect width="10" height="10"/></svg>'
+    skill = VisualGenerationSkill()
+    skill.model = ScriptedModel(svg)
+
+    result, critique = skill.perform_and_critique(make_context(tmp_path))
+
+    # The self-critique of a file reference never reaches the model
+    assert len(skill.model.prompts) == 1
+    with open(result["filepath"]) as f:
+        assert f.read() == svg
+    assert critique["score"] == 0.8
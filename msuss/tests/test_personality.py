@@ -38,3 +38,43 @@ def test_save_load(tmp_path):
     p2 = Personality.load(str(f))
     assert p2.name == p.name
     assert p2.traits == p.traits
+
+def test_compact_state_behaves_like_dicts_and_lists():
+    p = Personality("Test", {}, {}, [])
+    assert p.emotions == {"melancholy": 0.5, "joy": 0.1, "anger": 0.1, "fear": 0.3, "awe": 0.5}
+    assert list(p.emotions) == ["melancholy", "joy", "anger", "fear", "awe"]
+    assert p.concepts == ["entropy", "digital", "void"]
+    assert repr(p.concepts) == repr(["entropy", "digital", "void"])
+
+    p.emotions["joy"] += 0.5
+    assert p.mood == "joy"
+    p.emotions["joy"] = 0.0
+    assert p.mood == "melancholy"
+    p.emotions["wonder"] = 0.9
+    assert p.mood == "wonder" and list(p.emotions)[-1] == "wonder"
+    del p.emotions["wonder"]
+    assert "wonder" not in p.emotions and len(p.emotions) == 5
+
+    p.concepts.append("glitch")
+    p.concepts.pop(0)
+    assert p.concepts == ["digital", "void", "glitch"]
+    assert "glitch" in p.concepts and "entropy" not in p.concepts
+    assert p.concepts[:2] == ["digital", "void"]
+
+    with pytest.raises(AttributeError):
+        p.energy_level = 0.5
+
+
+def test_to_dict_format_unchanged(tmp_path):
+    p = Personality("Test", {"t": 1}, {"aesthetic": "void"}, ["egoism"])
+    p.emotions = {"awe": 0.9, "joy": 0.2}
+    p.concepts = ["a", "b"]
+    data = p.to_dict()
+    assert type(data["emotions"]) is dict and type(data["concepts"]) is list
+    assert list(data["emotions"].items()) == [("awe", 0.9), ("joy", 0.2)]
+
+    f = tmp_path / "p.json"
+    p.save(str(f))
+    p2 = Personality.load(str(f))
+    assert p2.to_dict() == data
+    assert p2.mood == "awe"
@@ -0,0 +1,137 @@
+import os
+import sys
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core.personality import Personality
+from core.population import Population, EMOTIONS, DRIFT_CONCEPTS
+
+
+class ReplayRandom:
+    """Feeds a scalar Personality the same draws a Population batch used for one artist."""
+
+    def __init__(self, population, i, draws, j):
+        self.randoms = [draws["drift"][j], draws["concept_drift"][j]]
+        self.uniform_value = draws["delta"][j]
+        emotion = population.drift_emotion_index(np.array([i]), draws["emotion"][j:j + 1])[0]
+        self.choices = [EMOTIONS[emotion], DRIFT_CONCEPTS[draws["concept"][j]]]
+
+    def random(self):
+        return self.randoms.pop(0)
+
+    def uniform(self, a, b):
+        return self.uniform_value
+
+    def choice(self, seq):
+        value = self.choices.pop(0)
+        assert value in seq
+        return value
+
+
+def make_personalities(n, seed=0):
+    rng = random.Random(seed)
+    personalities = []
+    for i in range(n):
+        flaws = ["sensitive to criticism"] if rng.random() < 0.5 else ["egoism"]
+        p = Personality(f"Artist{i}", {"openness": rng.random(), "neuroticism": rng.random()}, {"aesthetic": "void"}, flaws)
+        names = list(EMOTIONS)
+        rng.shuffle(names)
+        # Key order varies, as in hand-written personality files.
+        p.emotions = {name: rng.random() for name in names}
+        p.confidence = rng.random()
+        p.concepts = ["entropy", "void", "glitch", "noise", "flesh"][:rng.randint(2, 5)]
+        personalities.append(p)
+    return personalities
+
+
+def assert_matches(population, personalities):
+    for i, p in enumerate(personalities):
+        q = population.personality(i)
+        assert q.emotions.keys() == p.emotions.keys()
+        for name in p.emotions:
+            assert q.emotions[name] == pytest.approx(p.emotions[name], abs=1e-12)
+        assert q.confidence == pytest.approx(p.confidence, abs=1e-12)
+        assert q.concepts == p.concepts
+
+
+@pytest.mark.parametrize("kind", ["critique", "feedback"])
+def test_evolve_matches_scalar_path(kind, capsys):
+    personalities = make_personalities(200)
+    population = Population(personalities)
+    rng = np.random.default_rng(7)
+
+    for _ in range(10):
+        idx = np.arange(len(personalities))
+        if kind == "critique":
+            values = rng.random(len(idx))
+        else:
+            values = rng.random(len(idx)) < 0.5
+        draws = population.draw(len(idx), rng)
+
+        for j, i in enumerate(idx):
+            p = personalities[i]
+            p.rng = ReplayRandom(population, i, draws, j)
+            if kind == "critique":
+                p.evolve({"type": "critique", "score": float(values[j])})
+            else:
+                p.evolve({"type": "feedback", "liked": bool(values[j]), "notes": ""})
+
+        population.evolve(idx, kind, values, draws=draws)
+
+    assert_matches(population, personalities)
+
+
+def test_evolve_subset_leaves_others_untouched():
+    population = Population(make_personalities(10))
+    before = population.emotions.copy()
+    confidence = population.confidence.copy()
+
+    population.evolve(np.array([2, 5]), "critique", np.array([0.1, 0.95]), rng=np.random.default_rng(0))
+
+    untouched = [i for i in range(10) if i not in (2, 5)]
+    assert np.array_equal(population.emotions[untouched], before[untouched])
+    assert np.array_equal(population.confidence[untouched], confidence[untouched])
+    assert population.confidence[2] < confidence[2] or confidence[2] == 0.0
+    assert ((population.emotions >= 0.0) & (population.emotions <= 1.0)).all()
+
+
+def test_feedback_clamps_and_respects_flaws():
+    sensitive = Personality("A", {}, {}, ["sensitive to criticism"])
+    defiant = Personality("B", {}, {}, [])
+    population = Population([sensitive, defiant])
+    population.apply_feedback(np.array([0, 1]), np.array([False, False]))
+
+    a, b = population.personality(0), population.personality(1)
+    assert a.emotions["joy"] == 0.0
+    assert a.emotions["melancholy"] == pytest.approx(0.8)
+    assert b.emotions["anger"] == pytest.approx(0.4)
+    assert a.confidence == pytest.approx(0.65)
+
+
+def test_sync_round_trip_and_moods():
+    personalities = make_personalities(5, seed=3)
+    population = Population(personalities)
+    for i, p in enumerate(personalities):
+        assert EMOTIONS[population.moods[i]] == max(p.emotions, key=p.emotions.get)
+
+    p = personalities[1]
+    p.emotions[next(iter(p.emotions))] = 1.0
+    p.confidence = 0.0
+    population.sync_from(1, p)
+    target = Personality(p.name, p.traits, p.preferences, p.flaws)
+    target.emotions = dict(p.emotions)
+    population.sync_to(1, target)
+    assert target.emotions == p.emotions
+    assert target.confidence == 0.0
+    assert population.personality(1).traits == p.traits
+
+
+def test_unknown_experience_type():
+    population = Population.random(3)
+    with pytest.raises(ValueError):
+        population.evolve(np.arange(3), "dream", np.zeros(3))
@@ -0,0 +1,45 @@
+from src.core.personality import Personality
+from src.core.prompts import (
+    PromptBuilder, estimate_tokens, fit_to_tokens, format_weights,
+    render_personality,
+)
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+def test_fit_to_tokens_keeps_short_text():
+    assert fit_to_tokens("short text", 10) == "short text"
+
+def test_fit_to_tokens_trims_at_word_boundary():
+    text = "word " * 100
+    trimmed = fit_to_tokens(text, 10)
+    assert estimate_tokens(trimmed) <= 10
+    assert trimmed.endswith("word...")
+
+def test_format_weights_is_compact():
+    assert format_weights({"joy": 0.1, "awe": 1.0}) == "joy .10, awe 1.00"
+
+def test_render_personality():
+    p = Personality("Test", {"openness": 0.5}, {"aesthetic": "void", "themes": ["a", "b"]}, [])
+    lines = render_personality(p, ("traits", "preferences", "aesthetic"))
+    assert lines == ["Traits: openness .50", "Preferences: aesthetic: void; themes: a, b", "Aesthetic: void"]
+
+def test_builder_respects_budget():
+    builder = PromptBuilder(token_budget=50)
+    builder.line("Fixed header line.")
+    builder.section("x " * 500, prefix='"', suffix='"')
+    builder.line("Fixed footer line.")
+    prompt = builder.build()
+    assert prompt.startswith("Fixed header line.")
+    assert prompt.endswith("Fixed footer line.")
+    assert estimate_tokens(prompt) <= 50 + 3
+
+def test_builder_section_cap_and_empty_section():
+    builder = PromptBuilder(token_budget=1000)
+    builder.section("y " * 500, max_tokens=20)
+    builder.section("", prefix="Recent work:\n")
+    prompt = builder.build()
+    assert estimate_tokens(prompt) <= 20
+    assert "Recent work" not in prompt
@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core import recall as recall_module
+from core.recall import MemoryIndex, recall, index_for, keywords, concept_terms
+from core.critique import CritiqueService
+from core.memory import Memory
+from core.personality import Personality
+from core.prompts import render_recalled, estimate_tokens
+from skills.text_gen import TextGenerationSkill
+
+
+def personality(concepts):
+    p = Personality("Aria", {}, {"aesthetic": "void"}, [])
+    p.concepts = list(concepts)
+    return p
+
+
+def filler(i):
+    return f"Poem {i}: rain falls on the harbour and the lanterns gutter in the dark."
+
+
+def test_keywords_drop_short_and_stop_words():
+    assert keywords("The Lattice of a failing LIGHT, with their rust") == {"lattice", "failing", "light", "rust"}
+
+
+def test_recall_prefers_matching_concepts(tmp_path):
+    memory = Memory(str(tmp_path / "memory.json"))
+    memory.add_creation("A tide of static against the lattice.", {"concepts": ["lattice"]})
+    for i in range(10):
+        memory.add_creation(filler(i), {"concepts": ["harbour"]})
+    memory.add_critique(0, "The lattice sings; a fine study in entropy.", 0.9, critic_name="riot")
+
+    items = recall(memory, personality(["lattice"]), k=2)
+    assert {(item["kind"], item["creation"]) for item in items} == {("creation", 0), ("critique", 0)}
+    # The critique raised the creation's score
+    assert [item["score"] for item in items] == [0.9, 0.9]
+    assert recall(memory, personality(["nothing"]), k=2) == []
+
+    # Critique text picks out work about the same things
+    items = recall(memory, None, k=1, text="lanterns in the rain")
+    assert items[0]["kind"] == "creation" and items[0]["creation"] == 10
+
+
+def test_short_moods_and_concepts_are_recalled(tmp_path):
+    assert concept_terms(["joy", "awe", "fear", "melancholy", "god", "void"]) == {"joy", "awe", "fear", "melancholy", "god", "void"}
+
+    memory = Memory(str(tmp_path / "memory.json"))
+    memory.add_creation("A burst of joy against the glass.", {})
+    memory.add_creation("The harbour at night.", {"concepts": ["god"]})
+    for i in range(10):
+        memory.add_creation(filler(i), {})
+
+    joyful = personality([])
+    for emotion in joyful.emotions:
+        joyful.emotions[emotion] = 0.0
+    joyful.emotions["joy"] = 0.9
+    assert joyful.mood == "joy"
+    assert recall(memory, joyful, k=1)[0]["creation"] == 0
+
+    assert recall(memory, personality(["god"]), k=1)[0]["creation"] == 1
+
+
+def test_write_hooks_keep_the_index_current(tmp_path):
+    memory = Memory(str(tmp_path / "memory.json"))
+    memory.add_creation("Ash and ember.", {"concepts": ["ember"]})
+    index = index_for(memory)
+    for i in range(30):
+        memory.add_creation(filler(i), {"concepts": ["ember"] if i % 5 == 0 else []})
+        memory.add_critique(i, f"ember glow {i}", i / 30, critic_name="riot")
+    # Updated in place, not rebuilt
+    assert index_for(memory) is index
+    rebuilt = MemoryIndex.from_memory(Memory(memory.filepath))
+    assert index.items == rebuilt.items
+    weights = {"ember": 2.0, "harbour": 1.0}
+    assert index.top(weights, 5) == rebuilt.top(weights, 5)
+
+
+def test_rebuilds_after_writes_from_elsewhere(tmp_path):
+    memory = Memory(str(tmp_path / "memory.json"))
+    memory.add_creation("Quiet integers.", {})
+    assert recall(memory, None, text="integers")[0]["creation"] == 0
+
+    other = Memory(memory.filepath)
+    other.add_creation("Integers again, louder.", {})
+    fresh = Memory(memory.filepath)
+    assert [item["creation"] for item in recall(fresh, None, text="integers")] == [1, 0]
+
+
+def test_lookup_cost_does_not_grow_with_history(monkeypatch):
+    monkeypatch.setattr(recall_module, "POSTINGS_PER_TERM", 64)
+    index = MemoryIndex()
+    for i in range(20000):
+        index.add_creation(i, {"content": filler(i), "metadata": {"concepts": ["void", "rain"]}})
+    assert all(len(posting) <= 64 for posting in index._postings.values())
+
+    weights = {"void": 2.0, "rain": 2.0, "harbour": 1.0, "lanterns": 1.0}
+    start = time.perf_counter()
+    for _ in range(100):
+        top = index.top(weights, 4)
+    assert (time.perf_counter() - start) / 100 < 0.01
+    # Ties go to the newest
+    assert [item["creation"] for item in top] == [19999, 19998, 19997, 19996]
+
+
+def test_render_recalled_is_bounded():
+    items = [{"kind": "critique", "critic": "riot", "score": 0.5, "text": "word " * 200},
+             {"kind": "creation", "score": None, "text": "short"}]
+    rendered = render_recalled(items, 40)
+    assert rendered.startswith("- (score 0.50) riot said: word")
+    assert estimate_tokens(rendered) <= 41
+    assert render_recalled(items, 0) == ""
+
+
+def test_prompts_include_recalled_work(tmp_path):
+    memory = Memory(str(tmp_path / "memory.json"))
+    memory.add_creation("The lattice hums in entropy.", {"concepts": ["lattice"]})
+    p = personality(["lattice"])
+
+    context = {"personality": p, "goal": "Explore", "memory": memory}
+    # Off unless asked for
+    assert "Relevant past work" not in TextGenerationSkill().build_prompt(context)
+    assert "past work" not in CritiqueService().build_prompt(p, "A lattice of rust.", memory)
+
+    prompt = TextGenerationSkill(memory_tokens=120).build_prompt(context)
+    assert "Relevant past work:\n- The lattice hums" in prompt
+
+    service = CritiqueService(memory_tokens=120)
+    prompt = service.build_prompt(p, "A lattice of rust.", memory)
+    assert "past work it brings to mind:\n- The lattice hums" in prompt
+    assert "past work" not in service.build_prompt(p, "A lattice of rust.")
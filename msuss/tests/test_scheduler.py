@@ -0,0 +1,127 @@
+import os
+import sys
+import random
+import itertools
+from collections import Counter
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core.scheduler import FeistelPermutation, PairScheduler, make_scheduler, SCHEDULERS
+
+
+def concepts_for(n):
+    return [["void"] if i % 2 else ["glitch"] for i in range(n)]
+
+
+@pytest.mark.parametrize("kind", sorted(SCHEDULERS))
+def test_no_self_pairs_and_in_range(kind):
+    for n in (2, 3, 7, 50):
+        scheduler = make_scheduler(kind, rng=random.Random(n), concepts=concepts_for(n))
+        pairs = list(scheduler.pairs(n, 500))
+        assert len(pairs) == 500
+        for critic, subject in pairs:
+            assert critic != subject
+            assert 0 <= critic < n and 0 <= subject < n
+
+
+@pytest.mark.parametrize("kind", sorted(SCHEDULERS))
+def test_default_count_is_one_round(kind):
+    scheduler = make_scheduler(kind, rng=random.Random(0), concepts=concepts_for(9))
+    assert len(list(scheduler.pairs(9))) == 9
+
+
+def test_feistel_permutation_is_a_permutation():
+    for n in (1, 2, 3, 12, 97, 1000):
+        perm = FeistelPermutation(n, random.Random(n))
+        assert sorted(perm[i] for i in range(n)) == list(range(n))
+
+
+@pytest.mark.parametrize("n", [4, 6, 9])
+def test_ring_reaches_every_pair(n):
+    # Not just index neighbours: any artist can be seated next to any other
+    reached = set()
+    for seed in range(300):
+        reached.update(make_scheduler("ring", rng=random.Random(seed)).pairs(n))
+    assert len(reached) == n * (n - 1)
+
+
+def test_scheduler_base_is_abstract():
+    with pytest.raises(TypeError):
+        PairScheduler()
+
+
+def test_ring_each_artist_critiques_the_next():
+    n = 10
+    pairs = list(make_scheduler("ring", rng=random.Random(1)).pairs(n))
+    assert sorted(c for c, _ in pairs) == list(range(n))
+    assert sorted(s for _, s in pairs) == list(range(n))
+    # Following critic -> subject visits everyone before returning to the start
+    follow = dict(pairs)
+    node, seen = pairs[0][0], set()
+    while node not in seen:
+        seen.add(node)
+        node = follow[node]
+    assert len(seen) == n
+
+
+def test_fair_balances_every_round():
+    n = 13
+    pairs = list(make_scheduler("fair", rng=random.Random(2)).pairs(n, 3 * n))
+    for r in range(3):
+        round_pairs = pairs[r * n:(r + 1) * n]
+        assert sorted(c for c, _ in round_pairs) == list(range(n))
+        assert sorted(s for _, s in round_pairs) == list(range(n))
+
+
+def test_affinity_prefers_shared_concepts():
+    n = 200
+    concepts = concepts_for(n)
+    scheduler = make_scheduler("affinity", rng=random.Random(3), concepts=concepts)
+    pairs = list(scheduler.pairs(n, 5000))
+    shared = sum(1 for c, s in pairs if concepts[c] == concepts[s])
+    # 70% affinity plus half of the uniform remainder
+    assert shared / len(pairs) == pytest.approx(0.85, abs=0.03)
+
+
+def test_affinity_falls_back_when_concept_is_unique():
+    concepts = [["only-me"], [], ["x"]]
+    scheduler = make_scheduler("affinity", rng=random.Random(4), concepts=concepts)
+    for critic, subject in scheduler.pairs(3, 200):
+        assert critic != subject
+
+
+def test_uniform_is_roughly_uniform():
+    n = 5
+    pairs = make_scheduler("random", rng=random.Random(5)).pairs(n, 20000)
+    counts = Counter(pairs)
+    assert len(counts) == n * (n - 1)
+    assert min(counts.values()) > 0.8 * 20000 / (n * (n - 1))
+
+
+@pytest.mark.parametrize("kind", ["random", "fair"])
+def test_critics_take_turns_every_round(kind):
+    n = 7
+    pairs = list(make_scheduler(kind, rng=random.Random(7)).pairs(n, 4 * n))
+    for start in range(0, len(pairs), n):
+        assert sorted(c for c, _ in pairs[start:start + n]) == list(range(n))
+
+
+@pytest.mark.parametrize("kind", ["ring", "random", "fair"])
+def test_lazy_at_a_million_artists(kind):
+    scheduler = make_scheduler(kind, rng=random.Random(6))
+    pairs = scheduler.pairs(1_000_000)
+    first = list(itertools.islice(pairs, 1000))
+    assert all(c != s for c, s in first)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        make_scheduler("telepathy")
+    with pytest.raises(ValueError):
+        make_scheduler("affinity")
+    with pytest.raises(ValueError):
+        make_scheduler("ring").pairs(1)
+    with pytest.raises(ValueError):
+        list(make_scheduler("affinity", concepts=[["a"], ["a"]]).pairs(3))
@@ -0,0 +1,178 @@
+import os
+import sys
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import server
+from core import search
+from core import memory as memory_module
+from core.search import SearchIndex
+from core.artist_manager import ArtistManager
+from core.memory import Memory
+
+
+def memory_for(artists_dir, name):
+    os.makedirs(os.path.join(artists_dir, name), exist_ok=True)
+    return Memory(os.path.join(artists_dir, name, "memory.json"))
+
+
+def test_match_expression():
+    assert search.match_expression("") == ""
+    assert search.match_expression("Void stat*") == '{text critic concepts} : ("void" "stat"*)'
+    assert search.match_expression("", artist='a"b', critic="riot") == 'artist : "a""b" AND critic : "riot"'
+
+
+def test_attached_index_follows_memory_writes(tmp_path):
+    with SearchIndex(str(tmp_path)) as index:
+        index.attach()
+        memory = memory_for(str(tmp_path), "aria")
+        memory.add_creation("The void hums in static.", {"prompt": "p", "concepts": ["entropy"]})
+        memory.add_creation("[SVG Created: art/art_1.svg]", {"prompt": "p", "concepts": ["geometry"]},
+                            {"kind": "svg", "path": "art/art_1.svg"})
+        memory.add_critique(1, "Cold lines, no warmth.", 0.3, critic_name="riot", concepts=["warmth"])
+        # Outside the indexed directory
+        Memory(str(tmp_path / "memory.json")).add_creation("void elsewhere", {})
+
+        hits = index.search("void")["results"]
+        assert [(r["artist"], r["creation"], r["kind"]) for r in hits] == [("aria", 0, "creation")]
+        assert "[void]" in hits[0]["snippet"]
+        # Concepts and critic names are searchable; the marker text of visual pieces is not
+        assert [r["creation"] for r in index.search("geometry")["results"]] == [1]
+        assert index.search("art_1")["results"] == []
+        critique, = index.search("warmth", kind="critique")["results"]
+        assert (critique["critic"], critique["critique"], critique["score"]) == ("riot", 0, 0.3)
+        # The creation carries its latest critique score
+        assert index.search("geometry")["results"][0]["score"] == 0.3
+        assert index.search("warm*")["results"][0]["kind"] == "critique"
+
+
+def test_sync_reindexes_changed_and_removed_artists(tmp_path):
+    memory = memory_for(str(tmp_path), "aria")
+    memory.add_creation("Neon rain over glass.", {})
+    with SearchIndex(str(tmp_path)) as index:
+        assert index.sync() == 1
+        assert index.sync() == 0
+        assert len(index.search("neon")["results"]) == 1
+
+        # Written without the hook, as another process would
+        memory.add_creation("More neon.", {})
+        assert index.sync() == 1
+        assert len(index.search("neon")["results"]) == 2
+
+        os.remove(memory.filepath)
+        assert index.sync() == 1
+        assert index.search("neon")["results"] == []
+
+
+def test_hook_catches_up_on_missed_writes(tmp_path):
+    memory = memory_for(str(tmp_path), "aria")
+    memory.add_creation("Before the index existed.", {})
+    with SearchIndex(str(tmp_path)) as index:
+        index.attach()
+        memory.add_creation("After it.", {})
+        assert index.stats()["documents"] == 2
+
+
+def test_filters_ranking_and_pages(tmp_path):
+    with SearchIndex(str(tmp_path)) as index:
+        index.attach()
+        aria, nova = memory_for(str(tmp_path), "aria"), memory_for(str(tmp_path), "nova")
+        for i in range(5):
+            aria.add_creation(f"Study {i} of the sea.", {})
+            aria.add_critique(i, "The sea again.", i / 10, critic_name="nova")
+        nova.add_creation("Sea sea sea.", {})
+
+        assert {r["artist"] for r in index.search("sea", artist="nova")["results"]} == {"nova"}
+        assert {r["critic"] for r in index.search("sea", critic="nova")["results"]} == {"nova"}
+        scores = [r["score"] for r in index.search("sea", kind="critique", min_score=0.2, max_score=0.3)["results"]]
+        assert sorted(scores) == [0.2, 0.3]
+        # More occurrences rank higher
+        assert index.search("sea")["results"][0]["artist"] == "nova"
+
+        first = index.search("sea", per_page=4)
+        second = index.search("sea", per_page=4, page=3)
+        assert first["has_more"] and len(first["results"]) == 4
+        assert not second["has_more"] and len(second["results"]) == 3
+
+        # No query: newest first, filters only
+        newest = index.search(kind="creation", artist="aria")["results"]
+        assert [r["creation"] for r in newest] == [4, 3, 2, 1, 0]
+        assert index.search(since=newest[0]["timestamp"] + 1)["results"] == []
+
+
+def test_broad_queries_page_past_the_ranked_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "CANDIDATES", 4)
+    with SearchIndex(str(tmp_path)) as index:
+        index.attach()
+        memory = memory_for(str(tmp_path), "aria")
+        for i in range(7):
+            memory.add_creation("tide " * (1 + i % 3) + f"study {i}", {})
+
+        seen = []
+        for page in (1, 2, 3):
+            found = index.search("tide", per_page=3, page=page)
+            assert found["truncated"] and "total" not in found
+            seen += [r["creation"] for r in found["results"]]
+        assert not found["has_more"] and sorted(seen) == list(range(7))
+        # The four newest are ranked; the rest follow newest first
+        assert sorted(seen[:4]) == [3, 4, 5, 6] and seen[4:] == [2, 1, 0]
+        assert index.search("tide", total=True)["total"] == 7
+        found = index.search("study 0")
+        assert (found["total"], found["truncated"], len(found["results"])) == (1, False, 1)
+
+
+def test_search_endpoint(tmp_path, monkeypatch):
+    memory = memory_for(str(tmp_path), "aria")
+    memory.add_creation("Dust and static.", {"concepts": ["noise"]})
+    monkeypatch.setattr(server, "artist_manager", ArtistManager(str(tmp_path)))
+    monkeypatch.setattr(server, "search_index", None)
+    client = server.app.test_client()
+    try:
+        body = json.loads(client.get("/api/search?q=static").data)
+        assert [(r["artist"], r["url"]) for r in body["results"]] == [("aria", "/api/artworks/aria/0")]
+
+        # Written through the hook after the index was opened
+        memory.add_critique(0, "All noise.", 0.2, critic_name="riot")
+        body = json.loads(client.get("/api/search?q=noise&kind=critique&max_score=0.5").data)
+        assert [r["critic"] for r in body["results"]] == ["riot"]
+
+        # Other processes' writes are picked up by the periodic scan, not on every query
+        with monkeypatch.context() as m:
+            m.setattr(memory_module, "write_hooks", [])
+            Memory(memory.filepath).add_creation("Rust on the harbour.", {})
+        monkeypatch.setitem(server.app.config, "SEARCH_SYNC_SECONDS", 3600)
+        assert json.loads(client.get("/api/search?q=harbour").data)["results"] == []
+        monkeypatch.setattr(server, "search_synced_at", None)
+        assert len(json.loads(client.get("/api/search?q=harbour").data)["results"]) == 1
+
+        assert client.get("/api/search?min_score=high").status_code == 400
+        assert client.get("/api/search?kind=poem").status_code == 400
+    finally:
+        server.search_index.close()
+
+
+def test_concurrent_first_requests_open_one_index(tmp_path, monkeypatch):
+    memory_for(str(tmp_path), "aria").add_creation("Dust and static.", {})
+    monkeypatch.setattr(server, "artist_manager", ArtistManager(str(tmp_path)))
+    monkeypatch.setattr(server, "search_index", None)
+    opened = []
+
+    class SlowIndex(SearchIndex):
+        def __init__(self, *args, **kwargs):
+            opened.append(self)
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(server, "SearchIndex", SlowIndex)
+    hooks = len(memory_module.write_hooks)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            indexes = list(pool.map(lambda _: server._search_index(), range(8)))
+        assert len(opened) == 1 and all(index is opened[0] for index in indexes)
+        assert len(memory_module.write_hooks) == hooks + 1
+    finally:
+        server.search_index.close()
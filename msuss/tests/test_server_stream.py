@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import server
+from core.artist_manager import ArtistManager
+from core.personality import Personality
+from core.memory import Memory
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStreamingModel:
+    def __init__(self, fragments):
+        self.fragments = fragments
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        if stream:
+            return iter(FakeChunk(f) for f in self.fragments)
+        return FakeChunk("Score: 0.9\nCritique: Lovely.")
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = block.split("\n")
+        name = lines[0][len("event: "):]
+        data = json.loads(lines[1][len("data: "):])
+        events.append((name, data))
+    return events
+
+
+def setup_artist(tmp_path, monkeypatch, fake_model):
+    artist_dir = tmp_path / "aria"
+    artist_dir.mkdir()
+    Personality("Aria", {}, {"aesthetic": "void"}, []).save(str(artist_dir / "personality.json"))
+    (artist_dir / "goal.txt").write_text("Explore")
+
+    monkeypatch.setattr(server, "artist_manager", ArtistManager(str(tmp_path)))
+    original_init = server.TextGenerationSkill.__init__
+
+    def init_with_fake_model(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.model = fake_model
+
+    monkeypatch.setattr(server.TextGenerationSkill, "__init__", init_with_fake_model)
+    return artist_dir
+
+
+def test_generate_stream_sends_chunks_then_done(tmp_path, monkeypatch):
+    fake_model = FakeStreamingModel(["The void ", "hums ", "softly."])
+    artist_dir = setup_artist(tmp_path, monkeypatch, fake_model)
+
+    client = server.app.test_client()
+    response = client.post('/api/generate/stream', json={"artist": "aria"})
+    assert response.mimetype == "text/event-stream"
+
+    events = parse_events(response.get_data(as_text=True))
+    assert [name for name, _ in events] == ["chunk", "chunk", "chunk", "done"]
+    assert "".join(data["text"] for name, data in events if name == "chunk") == "The void hums softly."
+    assert events[-1][1]["score"] == 0.9
+
+    memory = Memory(str(artist_dir / "memory.json"))
+    assert memory.creations[-1]["content"] == "The void hums softly."
+    assert memory.creations[-1]["critiques"][0]["critic"] == "aria"
+
+
+def test_fused_stream_holds_back_the_critique(tmp_path, monkeypatch):
+    fake_model = FakeStreamingModel(["=== ART", "WORK ===\nThe void ", "hums.\nSoftly.\n=== SELF-", "CRITIQUE ===\nScore: 0.4\n", "Critique: Thin."])
+    artist_dir = setup_artist(tmp_path, monkeypatch, fake_model)
+    monkeypatch.setitem(server.app.config, "FUSED_GENERATION", True)
+
+    client = server.app.test_client()
+    events = parse_events(client.post('/api/generate/stream', json={"artist": "aria"}).get_data(as_text=True))
+
+    assert "".join(data["text"] for name, data in events if name == "chunk") == "The void hums.\nSoftly.\n"
+    assert events[-1][0] == "done" and events[-1][1]["score"] == 0.4
+    # The critique came with the piece
+    assert fake_model.calls == 1
+    memory = Memory(str(artist_dir / "memory.json"))
+    assert memory.creations[-1]["content"] == "The void hums.\nSoftly."
+    assert memory.creations[-1]["critiques"][0]["score"] == 0.4
+
+
+def test_generate_stream_requires_artist():
+    client = server.app.test_client()
+    response = client.post('/api/generate/stream', json={})
+    assert response.status_code == 400
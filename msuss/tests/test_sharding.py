@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core.memory import Memory
+from core.personality import Personality
+from core.sharding import HashRing, ShardedRunner
+
+
+def test_hash_ring_is_stable_and_balanced():
+    names = [f"artist{i}" for i in range(4000)]
+    ring = HashRing(4)
+    assert [ring.shard_of(n) for n in names] == [HashRing(4).shard_of(n) for n in names]
+
+    sizes = [len(shard) for shard in ring.partition(names)]
+    assert sum(sizes) == len(names)
+    assert min(sizes) > len(names) / 4 * 0.6
+
+    # Adding a fifth shard only moves artists onto the new shard
+    grown = HashRing(5)
+    moved = [n for n in names if grown.shard_of(n) != ring.shard_of(n)]
+    assert all(grown.shard_of(n) == 4 for n in moved)
+    assert len(moved) < len(names) * 0.35
+
+
+def make_world(artists_dir, count, creations=2):
+    names = []
+    for i in range(count):
+        name = f"synth{i:02d}"
+        artist_dir = os.path.join(artists_dir, name)
+        os.makedirs(artist_dir)
+        Personality(name.capitalize(), {"neuroticism": 0.5}, {"aesthetic": "void"}, ["sensitive to criticism"]).save(
+            os.path.join(artist_dir, "personality.json"))
+        memory = Memory(os.path.join(artist_dir, "memory.json"))
+        for c in range(creations):
+            memory.add_creation(f"poem {c} by {name}", {"prompt": "p"})
+        with open(os.path.join(artist_dir, "goal.txt"), "w") as f:
+            f.write("Make art")
+        names.append(name)
+    return names
+
+
+def test_sharded_critiques_update_every_owner(tmp_path):
+    artists_dir = str(tmp_path)
+    names = make_world(artists_dir, 6)
+    names.append("empty")
+    os.makedirs(tmp_path / "empty")
+    Personality("Empty", {}, {}, []).save(str(tmp_path / "empty" / "personality.json"))
+    Memory(str(tmp_path / "empty" / "memory.json"))
+
+    pairs = [(names[i % 6], names[(i + 1) % 6]) for i in range(24)] + [("synth00", "empty"), ("synth00", "nobody")]
+    with ShardedRunner(artists_dir, processes=3, names=names, offline=True, seed=1) as runner:
+        assert sorted(n for shard in runner.shards for n in shard) == sorted(names)
+        finished = list(runner.critiques(pairs))
+    states = runner.final_states
+
+    assert len(finished) == len(pairs)
+    statuses = [f["status"] for f in finished]
+    assert statuses.count("done") == 24
+    assert statuses.count("skipped") == 1
+    assert statuses.count("error") == 1
+    assert set(states) == set(names)
+
+    # Each subject's memory holds the critiques it received, with the critic named
+    for i, name in enumerate(names[:6]):
+        with open(os.path.join(artists_dir, name, "memory.json")) as f:
+            critiques = [c for creation in json.load(f)["creations"] for c in creation["critiques"]]
+        assert len(critiques) == 4
+        assert {c["critic"] for c in critiques} == {names[(i - 1) % 6]}
+        saved = Personality.load(os.path.join(artists_dir, name, "personality.json"))
+        assert saved.confidence == states[name]["confidence"]
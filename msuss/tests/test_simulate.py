@@ -0,0 +1,50 @@
+import os
+import sys
+import random
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import simulate
+from core.audience import RandomAudience, ScoreAudience, SilentAudience
+
+
+def run(tmp_path, seed, concurrency):
+    artists_dir = str(tmp_path / f"world_{seed}_{concurrency}")
+    simulate.make_synthetic_artists(artists_dir, 4, seed)
+    return simulate.run_simulation(artists_dir, cycles=3, seed=seed, concurrency=concurrency, offline=True)
+
+
+def test_simulation_summary(tmp_path):
+    summary = run(tmp_path, seed=1, concurrency=2)
+    assert summary["artists"] == 4
+    assert summary["cycles"] == 12
+    assert summary["model_calls"] >= 12
+    assert summary["cycles_per_second"] > 0
+    assert 0 <= summary["drift"]["mood_changes"] <= 4
+
+
+def test_fused_mode_halves_poem_calls_and_leaves_svg_alone(tmp_path):
+    def calls(text_ratio, fused):
+        artists_dir = str(tmp_path / f"world_{text_ratio}_{fused}")
+        simulate.make_synthetic_artists(artists_dir, 3, 2)
+        summary = simulate.run_simulation(artists_dir, cycles=4, seed=2, offline=True, fused=fused, text_ratio=text_ratio)
+        return summary["model_calls_per_cycle"]
+
+    assert calls(1.0, False) == 2.0 and calls(1.0, True) == 1.0
+    assert calls(0.0, False) == calls(0.0, True) == 1.0
+
+
+def test_simulation_is_reproducible_across_concurrency(tmp_path):
+    assert run(tmp_path, seed=5, concurrency=1)["drift"] == run(tmp_path, seed=5, concurrency=4)["drift"]
+
+
+def test_audiences():
+    assert SilentAudience().react("a", {}, {"score": 0.9}) is None
+
+    always = RandomAudience(response_rate=1.0, like_rate=1.0, rng=random.Random(0))
+    assert always.react("a", {}, {})["liked"] is True
+
+    strict = ScoreAudience(threshold=0.7, noise=0.0, rng=random.Random(0))
+    assert strict.react("a", {}, {"score": 0.9})["liked"] is True
+    assert strict.react("a", {}, {"score": 0.2})["liked"] is False
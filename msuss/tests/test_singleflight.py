@@ -0,0 +1,84 @@
+import threading
+import time
+import pytest
+from src.core.singleflight import SingleFlight, generate_content, request_key
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class SlowModel:
+    model_name = "slow"
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        self.release.wait(5)
+        return Response(f"echo: {prompt}")
+
+
+def run_concurrently(n, fn):
+    results = [None] * n
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, fn())) for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    group = SingleFlight()
+    model = SlowModel()
+    threads, results = run_concurrently(5, lambda: generate_content(model, "same", coalesce=True, group=group))
+
+    # Wait until every caller has joined the in-flight call before releasing it
+    while group.stats()["calls"] < 5:
+        time.sleep(0.001)
+    model.release.set()
+    for t in threads:
+        t.join()
+
+    assert model.calls == 1
+    assert all(r is results[0] for r in results)
+    assert group.stats() == {"calls": 5, "executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_not_coalesced_by_default():
+    group = SingleFlight()
+    model = SlowModel()
+    model.release.set()
+    generate_content(model, "p", group=group)
+    generate_content(model, "p", group=group)
+    assert model.calls == 2
+    assert group.stats()["calls"] == 0
+
+
+def test_completed_calls_are_not_cached():
+    group = SingleFlight()
+    counter = []
+    group.do("k", lambda: counter.append(1))
+    group.do("k", lambda: counter.append(1))
+    assert len(counter) == 2
+    assert group.stats()["coalesced"] == 0
+
+
+def test_errors_propagate_and_clear():
+    group = SingleFlight()
+
+    def boom():
+        raise RuntimeError("model down")
+
+    with pytest.raises(RuntimeError):
+        group.do("k", boom)
+    assert group.stats()["in_flight"] == 0
+    assert group.do("k", lambda: 42) == 42
+
+
+def test_request_key_depends_on_model_and_prompt():
+    model = SlowModel()
+    assert request_key(model, "a") == request_key(model, "a")
+    assert request_key(model, "a") != request_key(model, "b")
@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core.artist_manager import ArtistManager
+from core.memory import Memory
+from core.personality import Personality
+from core.snapshot import WorldSnapshot, write_snapshot, SNAPSHOT_FILE
+
+
+def make_artist(artists_dir, name, goal="Paint the void", creations=2):
+    artist_dir = os.path.join(artists_dir, name)
+    os.makedirs(artist_dir)
+    p = Personality(name.capitalize(), {"openness": 0.5}, {"aesthetic": "void"}, [])
+    p.save(os.path.join(artist_dir, "personality.json"))
+    memory = Memory(os.path.join(artist_dir, "memory.json"))
+    for i in range(creations):
+        memory.add_creation(f"poem {i} by {name}", {"prompt": "p"})
+    with open(os.path.join(artist_dir, "goal.txt"), "w") as f:
+        f.write(goal + "\n")
+    return artist_dir
+
+
+def touch_later(path):
+    """Bump mtime explicitly; back-to-back writes can land in the same timestamp tick."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def world(tmp_path):
+    artists_dir = str(tmp_path)
+    for name in ("aria", "riot", "nova"):
+        make_artist(artists_dir, name)
+    return artists_dir
+
+
+def test_round_trip(world):
+    assert write_snapshot(world) == 3
+    manager = ArtistManager(world)
+    assert manager.use_snapshot()
+    assert manager.snapshot.names == ["aria", "nova", "riot"]
+    assert sorted(manager.discover_artists()) == ["aria", "nova", "riot"]
+
+    plain = ArtistManager(world)
+    for name in ("aria", "riot", "nova"):
+        p, m, d = manager.load_artist(name)
+        q, n, e = plain.load_artist(name)
+        assert p.to_dict() == q.to_dict()
+        assert m.creations == n.creations and m.experiences == n.experiences
+        assert m.filepath == n.filepath and d == e
+        assert manager.get_artist_goal(name) == plain.get_artist_goal(name) == "Paint the void"
+    manager.snapshot.close()
+
+
+def test_newer_changes_win(world):
+    write_snapshot(world)
+    aria_dir = os.path.join(world, "aria")
+
+    p = Personality.load(os.path.join(aria_dir, "personality.json"))
+    p.confidence = 0.1
+    p.save(os.path.join(aria_dir, "personality.json"))
+    touch_later(os.path.join(aria_dir, "personality.json"))
+    Memory(os.path.join(aria_dir, "memory.json")).add_creation("fresh", {})
+    touch_later(os.path.join(aria_dir, "memory.json"))
+    make_artist(world, "echo", goal="Echo")
+
+    manager = ArtistManager(world)
+    manager.use_snapshot()
+    assert "echo" not in manager.snapshot
+    assert sorted(manager.discover_artists()) == ["aria", "echo", "nova", "riot"]
+
+    p, m, _ = manager.load_artist("aria")
+    assert p.confidence == 0.1
+    assert m.creations[-1]["content"] == "fresh"
+    assert manager.get_artist_goal("echo") == "Echo"
+    assert manager.snapshot.personality("riot", os.path.join(world, "riot")) is not None
+    manager.snapshot.close()
+
+
+def test_saves_go_to_disk(world):
+    write_snapshot(world)
+    manager = ArtistManager(world)
+    manager.use_snapshot()
+    _, memory, _ = manager.load_artist("nova")
+    memory.add_creation("new", {})
+    assert Memory(os.path.join(world, "nova", "memory.json")).creations[-1]["content"] == "new"
+    manager.snapshot.close()
+
+
+def test_missing_and_invalid_snapshots(world, tmp_path):
+    assert not ArtistManager(world).use_snapshot()
+    bad = tmp_path / "bad.snapshot"
+    bad.write_bytes(b"not a snapshot at all, sorry")
+    with pytest.raises(ValueError):
+        WorldSnapshot(str(bad))
+
+
+def test_empty_world(tmp_path):
+    assert write_snapshot(str(tmp_path)) == 0
+    with WorldSnapshot(str(tmp_path / SNAPSHOT_FILE)) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.personality("aria", str(tmp_path / "aria")) is None
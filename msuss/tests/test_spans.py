@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+import time
+import threading
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core import spans
+from core.memory import Memory
+from core.personality import Personality
+from skills.stub_model import StubModel
+from skills.text_gen import TextGenerationSkill
+
+
+@pytest.fixture(autouse=True)
+def disabled_afterwards():
+    yield
+    spans.disable()
+
+
+def test_disabled_spans_are_free_noops():
+    assert spans.active() is None
+    assert spans.span("a") is spans.span("b")
+    with spans.span("a"):
+        pass
+
+    @spans.traced("f")
+    def f(x):
+        return x * 2
+    assert f(4) == 8
+    assert f.__name__ == "f"
+
+
+def test_nested_spans_self_time_and_chrome_export(tmp_path):
+    tracer = spans.enable()
+
+    @spans.traced("outer")
+    def outer():
+        time.sleep(0.01)
+        with spans.span("inner", step=1):
+            time.sleep(0.02)
+
+    outer()
+    with pytest.raises(ValueError):
+        with spans.span("inner"):
+            raise ValueError("boom")
+
+    rows = {row["phase"]: row for row in tracer.aggregate()}
+    assert rows["outer"]["count"] == 1
+    assert rows["inner"]["count"] == 2
+    assert rows["inner"]["errors"] == 1
+    assert rows["outer"]["total_ms"] >= 30
+    assert 8 <= rows["outer"]["self_ms"] < rows["outer"]["total_ms"] - 15
+    assert "inner" in spans.format_aggregate(tracer.aggregate())
+
+    path = str(tmp_path / "trace.json")
+    tracer.write_chrome_trace(path)
+    with open(path) as f:
+        events = [e for e in json.load(f)["traceEvents"] if e["ph"] == "X"]
+    outer_event = next(e for e in events if e["name"] == "outer")
+    inner_event = next(e for e in events if e["name"] == "inner")
+    assert inner_event["args"] == {"step": 1}
+    assert outer_event["ts"] <= inner_event["ts"]
+    assert inner_event["ts"] + inner_event["dur"] <= outer_event["ts"] + outer_event["dur"]
+
+
+def test_threads_nest_separately_and_buffer_is_bounded():
+    tracer = spans.enable(max_events=5)
+
+    def work():
+        for _ in range(10):
+            with spans.span("outer"):
+                with spans.span("inner"):
+                    pass
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    rows = {row["phase"]: row for row in tracer.aggregate()}
+    assert rows["outer"]["count"] == rows["inner"]["count"] == 40
+    assert rows["outer"]["self_ms"] <= rows["outer"]["total_ms"]
+    assert len(tracer.events) == 5
+    assert tracer.dropped == 75
+
+
+def test_generation_cycle_phases(tmp_path, capsys):
+    tracer = spans.enable()
+    skill = TextGenerationSkill()
+    skill.model = StubModel()
+    p = Personality("Aria", {"neuroticism": 0.8}, {"aesthetic": "void"}, [])
+    memory = Memory(str(tmp_path / "memory.json"))
+
+    result, critique = skill.perform_and_critique({"personality": p, "goal": "art", "memory": memory})
+    memory.add_creation(result["content"], {"prompt": result["prompt_used"]})
+    p.save(str(tmp_path / "personality.json"))
+
+    rows = {row["phase"]: row for row in tracer.aggregate()}
+    assert rows["prompt"]["count"] == 2
+    assert rows["model"]["count"] == 2
+    assert rows["parse"]["count"] == 1
+    assert rows["text.perform"]["count"] == rows["text.critique"]["count"] == 1
+    assert rows["memory.save"]["count"] == rows["personality.save"]["count"] == 1
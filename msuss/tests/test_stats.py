@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import server
+from core import stats as stats_module
+from core import memory as memory_module
+from core.stats import ArtistStats, StatsStore, Welford
+from core.artist_manager import ArtistManager
+from core.memory import Memory
+from core.personality import Personality
+
+
+def memory_for(artists_dir, name="aria"):
+    os.makedirs(os.path.join(artists_dir, name), exist_ok=True)
+    return Memory(os.path.join(artists_dir, name, "memory.json"))
+
+
+def test_welford_matches_batch_statistics():
+    rng = random.Random(3)
+    values = [rng.random() for _ in range(500)]
+    w = Welford()
+    for v in values:
+        w.add(v)
+    assert w.count == 500
+    assert abs(w.mean - statistics.mean(values)) < 1e-12
+    assert abs(w.variance - statistics.pvariance(values)) < 1e-12
+    assert (w.low, w.high) == (min(values), max(values))
+    assert Welford().summary()["mean"] is None
+
+
+def test_series_keep_the_newest_buckets(monkeypatch):
+    monkeypatch.setattr(stats_module, "HOURLY_BUCKETS", 3)
+    stats = ArtistStats()
+    for hour in (0, 1, 1, 2, 3, 0):
+        stats.add_critique({"timestamp": hour * 3600 + 10, "score": hour / 10, "critic": "riot"})
+    hourly = stats.summary()["hourly"]
+    assert [(b["start"], b["count"]) for b in hourly] == [(3600, 2), (7200, 1), (10800, 1)]
+    daily, = stats.summary()["daily"]
+    assert (daily["start"], daily["count"]) == (0, 6) and abs(daily["mean"] - stats.scores.mean) < 1e-12
+
+
+def test_incremental_updates_match_a_rebuild(tmp_path):
+    store = StatsStore(str(tmp_path))
+    store.attach()
+    try:
+        memory = memory_for(str(tmp_path))
+        rng = random.Random(1)
+        for i in range(20):
+            memory.add_creation(f"poem {i}", {"concepts": ["void", "tide"][:i % 3]},
+                                {"kind": "svg", "path": f"art/{i}.svg"} if i % 4 == 0 else None)
+            for critic in ("aria", "riot")[:1 + i % 2]:
+                memory.add_critique(rng.randrange(i + 1), "ok", rng.random(), critic_name=critic,
+                                    concepts=["ash"] if critic == "riot" else None)
+        live = store.get("aria").summary()
+        rebuilt = ArtistStats.from_memory(Memory(memory.filepath)).summary()
+        assert live == rebuilt
+        assert (live["creations"], live["critiques"], live["kinds"]) == (20, 30, {"svg": 5, "text": 15})
+        assert live["concepts"] == {"ash": 10, "void": 13, "tide": 6}
+        assert set(live["critics"]) == {"aria", "riot"}
+    finally:
+        store.detach()
+
+
+def test_get_reads_stats_without_walking_memory(tmp_path, monkeypatch):
+    memory = memory_for(str(tmp_path))
+    memory.add_creation("poem", {})
+    memory.add_critique(0, "fine", 0.5, critic_name="riot")
+    assert StatsStore(str(tmp_path)).get("aria").scores.count == 1
+    assert os.path.exists(tmp_path / "aria" / "stats.json")
+
+    # A fresh store reads stats.json; it only rebuilds if memory.json moved on
+    monkeypatch.setattr(ArtistStats, "from_memory", None)
+    assert StatsStore(str(tmp_path)).get("aria").critics["riot"].mean == 0.5
+
+
+def test_get_rebuilds_after_unattached_writes(tmp_path):
+    store = StatsStore(str(tmp_path))
+    memory = memory_for(str(tmp_path))
+    memory.add_creation("poem", {})
+    assert store.get("aria").critiques == 0
+    memory.add_critique(0, "fine", 0.8)
+    stats = store.get("aria")
+    assert (stats.critiques, stats.critics["unknown"].mean) == (1, 0.8)
+    assert store.get("nobody") is None
+
+
+def test_stats_endpoints(tmp_path, monkeypatch):
+    memory = memory_for(str(tmp_path))
+    Personality("Aria", {}, {}, []).save(str(tmp_path / "aria" / "personality.json"))
+    memory.add_creation("poem", {"concepts": ["void"]})
+    monkeypatch.setattr(server, "artist_manager", ArtistManager(str(tmp_path)))
+    monkeypatch.setattr(server, "stats_store", None)
+    client = server.app.test_client()
+    try:
+        body = json.loads(client.get("/api/stats").data)
+        assert body["artists"]["aria"]["creations"] == 1
+        assert "hourly" not in body["artists"]["aria"]
+
+        memory.add_critique(0, "good", 0.6, critic_name="riot")
+        body = json.loads(client.get("/api/stats/aria").data)
+        assert body["scores"]["mean"] == 0.6
+        assert body["critics"] == {"riot": {"count": 1, "mean": 0.6}}
+        assert body["concepts"] == {"void": 1}
+        assert len(body["hourly"]) == len(body["daily"]) == 1
+        assert client.get("/api/stats/nobody").status_code == 404
+    finally:
+        server.stats_store.detach()
+
+
+def test_concurrent_first_requests_open_one_store(tmp_path, monkeypatch):
+    memory_for(str(tmp_path)).add_creation("poem", {})
+    monkeypatch.setattr(server, "artist_manager", ArtistManager(str(tmp_path)))
+    monkeypatch.setattr(server, "stats_store", None)
+    opened = []
+
+    class SlowStore(StatsStore):
+        def __init__(self, *args, **kwargs):
+            opened.append(self)
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(server, "StatsStore", SlowStore)
+    hooks = len(memory_module.write_hooks)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            stores = list(pool.map(lambda _: server._stats_store(), range(8)))
+        assert len(opened) == 1 and all(store is opened[0] for store in stores)
+        assert len(memory_module.write_hooks) == hooks + 1
+    finally:
+        server.stats_store.detach()
@@ -0,0 +1,131 @@
+import os
+import sys
+import gzip
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import server
+from core.svg_optimize import InvalidSVG, optimize_svg, round_numbers
+from skills.svg_gen import VisualGenerationSkill
+
+RAW = '''Here is my piece:
+<?xml version="1.0" encoding="UTF-8"?>
+<!-- Generated by hand -->
+<svg width="400.000" height="400" viewBox="0 0 400 400"
+     xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape"
+     xmlns:xlink="http://www.w3.org/1999/xlink" inkscape:version="1.3">
+  <metadata>made with love</metadata>
+  <defs>
+    <linearGradient id="base"><stop offset="0.123456" stop-color="#fff"/></linearGradient>
+    <linearGradient id="used" xlink:href="#base"/>
+    <radialGradient id="unused"><stop offset="1"/></radialGradient>
+  </defs>
+  <g>
+  </g>
+  <inkscape:layer/>
+  <path d="M 10.123456   20.98765 L10.001.5 Z" fill="url(#used)" stroke-width="1.0000"/>
+  <text x="1"> Hello <tspan>world</tspan> </text>
+</svg>
+I hope you like it.'''
+
+
+EXAMPLE_SVG = os.path.join(os.path.dirname(__file__), '..', 'examples', 'artists', 'riot', 'art', 'art_1764395138.svg')
+
+
+def test_optimize_keeps_styles_and_id_less_defs():
+    with open(EXAMPLE_SVG) as f:
+        svg = optimize_svg(f.read())
+    # The example's lines are styled by a CSS class defined in <defs>
+    assert "<style>.error-line {" in svg and "@keyframes blink" in svg
+    assert 'class="error-line"' in svg
+
+    svg = optimize_svg('<svg xmlns="http://www.w3.org/2000/svg"><defs><script>go()</script>'
+                       '<path d="M0 0"/><filter id="unused"/></defs></svg>')
+    assert svg == '<svg xmlns="http://www.w3.org/2000/svg"><defs><script>go()</script><path d="M0 0"/></defs></svg>'
+
+
+def test_optimize_minifies_and_prunes():
+    svg = optimize_svg(RAW)
+    assert svg == (
+        '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        'width="400" height="400" viewBox="0 0 400 400">'
+        '<defs><linearGradient id="base"><stop offset="0.12" stop-color="#fff"/></linearGradient>'
+        '<linearGradient id="used" xlink:href="#base"/></defs>'
+        '<path d="M 10.12 20.99 L10 0.5 Z" fill="url(#used)" stroke-width="1"/>'
+        '<text x="1"> Hello <tspan>world</tspan> </text></svg>'
+    )
+    assert optimize_svg(svg) == svg
+    # Already-minimal output is left byte for byte
+    plain = '<svg xmlns="http://www.w3.org/2000/svg"><rect width="10" height="10"/></svg>'
+    assert optimize_svg(plain) == plain
+    # A missing namespace is added so the file renders through <img>
+    assert optimize_svg('<svg><circle r="1.5"/></svg>') == '<svg xmlns="http://www.w3.org/2000/svg"><circle r="1.5"/></svg>'
+
+
+def test_round_numbers_keeps_numbers_apart():
+    assert round_numbers("M1.999.5-0.0001,3e-5 7") == "M2 0.5 0,0 7"
+    assert round_numbers("0.125 .5", precision=1) == "0.1 0.5"
+
+
+@pytest.mark.parametrize("content", [
+    "I cannot draw that.",
+    "<svg><rect></svg>",
+    "<html><svg/></html>",
+    '<svg><use xlink:href="#a"/></svg>',
+])
+def test_invalid_svg_is_rejected(content):
+    with pytest.raises(InvalidSVG):
+        optimize_svg(content)
+
+
+class ScriptedModel:
+    def __init__(self, text):
+        self.text = text
+
+    def generate_content(self, prompt, **kwargs):
+        return type("Response", (), {"text": self.text})()
+
+
+def test_skill_saves_optimized_svg_and_svgz(tmp_path):
+    skill = VisualGenerationSkill(svgz=True)
+    result = skill._save_svg(RAW, str(tmp_path), "prompt")
+    with open(result["filepath"]) as f:
+        saved = f.read()
+    assert saved == optimize_svg(RAW) == result["svg_code"]
+    with open(result["filepath"] + "z", "rb") as f:
+        compressed = f.read()
+    assert gzip.decompress(compressed).decode() == saved
+    artifact = result["artifact"]
+    assert (artifact["original_bytes"], artifact["bytes"], artifact["svgz_bytes"]) == \
+        (len(RAW.encode()), len(saved.encode()), len(compressed))
+    assert artifact["bytes"] < artifact["original_bytes"] * 0.6
+
+    skill.model = ScriptedModel("Sorry, I can only describe it in words.")
+    personality = type("P", (), {"name": "Nova", "emotions": {}, "concepts": [], "preferences": {}})()
+    result = skill.perform({"personality": personality, "goal": "g", "artist_dir": str(tmp_path)})
+    assert "Failed" in result["content"]
+    saved_files = [os.path.relpath(os.path.join(d, f), tmp_path).replace(os.sep, "/")
+                   for d, _, files in os.walk(tmp_path / "art") for f in files]
+    assert sorted(saved_files) == [artifact["path"], artifact["path"] + "z"]
+
+
+def test_server_sends_precompressed_svg(tmp_path, monkeypatch):
+    art = tmp_path / "artists" / "nova" / "art"
+    os.makedirs(art)
+    svg = optimize_svg(RAW).encode()
+    (art / "a.svg").write_bytes(svg)
+    (art / "a.svgz").write_bytes(gzip.compress(svg))
+    monkeypatch.setattr(server, "BASE_DIR", str(tmp_path))
+    client = server.app.test_client()
+
+    response = client.get("/artists/nova/art/a.svg", headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.mimetype == "image/svg+xml"
+    assert gzip.decompress(response.get_data()) == svg
+
+    response = client.get("/artists/nova/art/a.svg")
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data() == svg
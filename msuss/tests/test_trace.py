@@ -0,0 +1,134 @@
+import os
+import sys
+import random
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from core import trace
+from core.personality import Personality
+from skills.stub_model import StubModel
+from skills.text_gen import TextGenerationSkill
+
+
+@pytest.fixture(autouse=True)
+def no_active_trace():
+    yield
+    trace.stop()
+
+
+def run_session(model, answers=None):
+    """Some model calls, input() answers and global-random draws; returns everything observed."""
+    seen = []
+    seen.append(model.generate_content("Write a poem").text)
+    seen.append(model.generate_content("Write a poem").text)
+    seen.append(model.generate_content("Critique this. Score:", generation_config={"response_mime_type": "application/json"}).text)
+    seen.append([chunk.text for chunk in model.generate_content("Draw an SVG", stream=True)])
+    seen.append([random.random() for _ in range(3)])
+    if answers is not None:
+        seen.append([input("rate? ") for _ in answers])
+    p = Personality("Aria", {"neuroticism": 0.8}, {"aesthetic": "void"}, ["sensitive to criticism"])
+    for score in (0.1, 0.9, 0.4):
+        p.evolve({"type": "critique", "score": score})
+    seen.append(p.to_dict())
+    return seen
+
+
+def test_replay_reproduces_a_recorded_session(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "session.trace.gz")
+    answers = iter(["y", "n"])
+    monkeypatch.setattr(trace, "_original_input", lambda prompt="": next(answers))
+
+    trace.start(path, "record", seed=42)
+    stub = StubModel(seed=7)
+    recorded = run_session(trace.trace_model(stub, "gemini-flash-latest"), ["y", "n"])
+    trace.stop()
+    assert stub.calls == 4
+
+    monkeypatch.setattr(trace, "_original_input", lambda prompt="": pytest.fail("replay must not prompt"))
+    trace.start(path, "replay")
+    model = trace.trace_model(None, "gemini-flash-latest")
+    assert isinstance(model, trace.ReplayModel)
+    assert run_session(model, ["y", "n"]) == recorded
+    with pytest.raises(EOFError):
+        input("more? ")
+
+
+def test_replay_rejects_unrecorded_requests(tmp_path):
+    path = str(tmp_path / "session.trace.gz")
+    trace.start(path, "record")
+    trace.trace_model(StubModel(), "stub").generate_content("Write a poem")
+    trace.stop()
+
+    trace.start(path, "replay")
+    model = trace.trace_model(None, "stub")
+    with pytest.raises(trace.TraceMismatch):
+        model.generate_content("Write a different poem")
+    with pytest.raises(trace.TraceMismatch):
+        list(model.generate_content("Write a poem", stream=True))
+
+
+def test_mock_sessions_replay_as_mock(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    path = str(tmp_path / "session.trace.gz")
+    trace.start(path, "record")
+    assert TextGenerationSkill().model is None
+    trace.stop()
+
+    trace.start(path, "replay")
+    assert TextGenerationSkill().model is None
+    assert trace.trace_model(None, "stub") is None
+
+
+def test_errors_are_replayed(tmp_path):
+    class Blocked:
+        @property
+        def text(self):
+            raise ValueError("response blocked")
+
+    class Flaky:
+        def generate_content(self, prompt, stream=False, generation_config=None):
+            if prompt == "boom":
+                raise RuntimeError("quota exceeded")
+            return Blocked()
+
+    path = str(tmp_path / "session.trace.gz")
+    trace.start(path, "record")
+    model = trace.trace_model(Flaky(), "flaky")
+    with pytest.raises(ValueError):
+        model.generate_content("hello").text
+    with pytest.raises(RuntimeError):
+        model.generate_content("boom")
+    trace.stop()
+
+    trace.start(path, "replay")
+    model = trace.trace_model(None, "flaky")
+    with pytest.raises(ValueError, match="blocked"):
+        model.generate_content("hello").text
+    with pytest.raises(RuntimeError, match="quota"):
+        model.generate_content("boom")
+
+
+def test_image_parts_are_replayed(tmp_path):
+    class Part:
+        def __init__(self, text=None, data=None):
+            self.text = text
+            self.inline_data = type("Blob", (), {"data": data})() if data is not None else None
+
+    class Models:
+        def generate_content(self, model, contents):
+            return type("Response", (), {"parts": [Part(text="here you go"), Part(data=b"\x89PNG fake")]})()
+
+    path = str(tmp_path / "session.trace.gz")
+    trace.start(path, "record")
+    client = trace.trace_image_client(type("Client", (), {"models": Models()})())
+    client.models.generate_content(model="imagen", contents=["a void"])
+    trace.stop()
+
+    trace.start(path, "replay")
+    response = trace.trace_image_client(None).models.generate_content(model="imagen", contents=["a void"])
+    assert response.parts[0].text == "here you go"
+    out = tmp_path / "art.png"
+    response.parts[1].as_image().save(str(out))
+    assert out.read_bytes() == b"\x89PNG fake"
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import generate_viewer_data
+from core.memory import Memory
+from core.personality import Personality
+
+
+def make_world(artists_dir, count=6):
+    for i in range(count):
+        artist_dir = os.path.join(artists_dir, f"synth{i}")
+        os.makedirs(os.path.join(artist_dir, "art"))
+        Personality(f"Synth{i}", {}, {}, []).save(os.path.join(artist_dir, "personality.json"))
+        with open(os.path.join(artist_dir, "art", "a.svg"), "w") as f:
+            f.write(f"<svg id='{i}'/>")
+        with open(os.path.join(artist_dir, "old.svg"), "w") as f:
+            f.write("<svg/>")
+        memory = Memory(os.path.join(artist_dir, "memory.json"))
+        memory.add_creation(f"poem {i}", {})
+        memory.add_critique(0, "Fine.", 0.5)
+        for content in ("[SVG Created: art/a.svg]", "[SVG Created: old.svg]", "[Image Created: art/gone.png]"):
+            memory.add_creation(content, {})
+    os.makedirs(os.path.join(artists_dir, "no_memory"))
+
+
+@pytest.fixture
+def world(tmp_path, monkeypatch):
+    make_world(str(tmp_path / "artists"))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_parallel_build_matches_sequential(world):
+    sequential = generate_viewer_data.generate_data(workers=1)
+    with open("artists_data.json", "rb") as f:
+        expected = f.read()
+    parallel = generate_viewer_data.generate_data(workers=3)
+    with open("artists_data.json", "rb") as f:
+        assert f.read() == expected
+
+    assert sequential["artists"] == parallel["artists"] == 6
+    assert sequential["artworks"] == 24
+    assert list(parallel["timings"]) == ["scan", "read", "parse", "assets", "write"]
+    assert sorted(os.listdir(world)) == ["artists", "artists_data.json"]
+
+    data = json.loads(expected)
+    works = {w["content"]: w for w in data["synth2"]}
+    assert works["<svg id='2'/>"]["type"] == "svg"
+    assert works["<svg/>"]["type"] == "svg"
+    assert works["[Image file not found: art/gone.png]"]["type"] == "text"
+    assert works["poem 2"]["score"] == 0.5
+
+
+def test_failed_write_keeps_previous_output(world, monkeypatch):
+    generate_viewer_data.generate_data()
+    with open("artists_data.json", "rb") as f:
+        before = f.read()
+
+    def fail(data, f, **kwargs):
+        f.write("{")
+        raise OSError("disk full")
+    monkeypatch.setattr(generate_viewer_data.json, "dump", fail)
+    with pytest.raises(OSError):
+        generate_viewer_data.generate_data()
+
+    with open("artists_data.json", "rb") as f:
+        assert f.read() == before
+    assert not [name for name in os.listdir(".") if name.endswith(".tmp")]
+
+
+def test_concurrent_writes_do_not_collide(tmp_path):
+    path = str(tmp_path / "out.json")
+    payloads = [{"writer": i, "data": list(range(2000))} for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda data: [generate_viewer_data.write_json(path, data) for _ in range(20)], payloads))
+    with open(path) as f:
+        assert json.load(f) in payloads
+    assert os.listdir(tmp_path) == ["out.json"]
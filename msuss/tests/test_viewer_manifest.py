@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import server
+import generate_viewer_data
+from core.artist_manager import ArtistManager
+from core.memory import Memory
+from core.personality import Personality
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg"><rect width="10" height="10"/></svg>'
+
+
+def make_artist(artists_dir, name="aria"):
+    artist_dir = os.path.join(artists_dir, name)
+    os.makedirs(os.path.join(artist_dir, "art"))
+    Personality(name.capitalize(), {}, {"aesthetic": "void"}, []).save(os.path.join(artist_dir, "personality.json"))
+    with open(os.path.join(artist_dir, "art", "art_1.svg"), "w") as f:
+        f.write(SVG)
+    memory = Memory(os.path.join(artist_dir, "memory.json"))
+    memory.add_creation("The void hums. " * 50, {"prompt": "p"})
+    memory.add_critique(0, "Too long. " * 40, 0.4, critic_name="riot")
+    memory.add_critique(0, "Sublime.", 0.9, critic_name="nova")
+    memory.add_creation("[SVG Created: art/art_1.svg]", {"prompt": "p"})
+    memory.add_creation("[SVG Created: art/gone.svg]", {"prompt": "p"})
+    return artist_dir
+
+
+def test_manifest_holds_metadata_only(tmp_path, monkeypatch):
+    make_artist(str(tmp_path))
+    monkeypatch.setattr(generate_viewer_data, "ARTISTS_DIR", str(tmp_path))
+    index = generate_viewer_data.generate_manifest(str(tmp_path / "out"))
+    assert index["artists"] == [{"name": "aria", "count": 3, "manifest": "artists/aria.json"}]
+
+    with open(tmp_path / "out" / "artists" / "aria.json") as f:
+        artworks = {a["id"]: a for a in json.load(f)["artworks"]}
+    text, svg, missing = artworks[0], artworks[1], artworks[2]
+
+    assert text["type"] == "text"
+    assert text["url"] == "/api/artworks/aria/0"
+    assert text["size"] == len("The void hums. " * 50)
+    assert len(text["excerpt"]) == generate_viewer_data.TEXT_EXCERPT_CHARS
+    assert (text["score"], text["critique"], text["critiques"]) == (0.9, "Sublime.", 2)
+
+    assert svg["type"] == "svg"
+    assert svg["url"].endswith("aria/art/art_1.svg")
+    assert svg["size"] == len(SVG)
+    assert "excerpt" not in svg and SVG not in json.dumps(artworks)
+
+    assert missing["type"] == "text"
+    assert missing["excerpt"] == "[SVG file not found: art/gone.svg]"
+
+
+def test_manifest_and_artwork_endpoints(tmp_path, monkeypatch):
+    make_artist(str(tmp_path))
+    monkeypatch.setattr(server, "artist_manager", ArtistManager(str(tmp_path)))
+    client = server.app.test_client()
+
+    index = client.get('/api/manifest').get_json()
+    assert index["artists"] == [{"name": "aria", "manifest": "/api/manifest/aria"}]
+
+    manifest = client.get('/api/manifest/aria').get_json()
+    assert sorted(a["id"] for a in manifest["artworks"]) == [0, 1, 2]
+    assert all("content" not in a for a in manifest["artworks"])
+
+    body = client.get('/api/artworks/aria/0').get_json()
+    assert body["content"] == "The void hums. " * 50
+    assert [c["critic"] for c in body["critiques"]] == ["riot", "nova"]
+    assert client.get('/api/artworks/aria/1').get_json()["url"].endswith("aria/art/art_1.svg")
+
+    assert client.get('/api/artworks/aria/3').status_code == 404
+    assert client.get('/api/manifest/nobody').status_code == 404
+    assert client.get('/api/artworks/..%2Faria/0').status_code == 404
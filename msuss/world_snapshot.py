@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Write (or inspect) a whole-world snapshot so that tools can cold-start from
+one file instead of reading every artist's files. Pass --snapshot to
+artist_conversation.py, server.py or generate_viewer_data.py to use it.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.snapshot import WorldSnapshot, write_snapshot, default_snapshot_path
+
+ARTISTS_DIR = "artists"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshot all artists into one file for fast startup")
+    parser.add_argument("--artists-dir", default=ARTISTS_DIR)
+    parser.add_argument("-o", "--output", help="Snapshot path (default: <artists-dir>/world.snapshot)")
+    parser.add_argument("--info", action="store_true", help="Describe the existing snapshot instead of writing one")
+    args = parser.parse_args()
+
+    path = args.output or default_snapshot_path(args.artists_dir)
+    if args.info:
+        if not os.path.exists(path):
+            sys.exit(f"No snapshot at {path}")
+        with WorldSnapshot(path) as snapshot:
+            info = snapshot.info()
+            stale = sum(
+                1 for name in snapshot.names
+                if snapshot.personality(name, os.path.join(args.artists_dir, name)) is None
+                or snapshot.memory(name, os.path.join(args.artists_dir, name)) is None
+            )
+        print(f"{info['path']}: version {info['version']}, {info['artists']} artists, {info['bytes']} bytes, {stale} stale")
+    else:
+        if not os.path.isdir(args.artists_dir):
+            sys.exit(f"No artists directory at {args.artists_dir}")
+        start = time.perf_counter()
+        count = write_snapshot(args.artists_dir, path)
+        print(f"Wrote {count} artists to {path} ({os.path.getsize(path)} bytes) in {time.perf_counter() - start:.2f}s")